@@ -0,0 +1,90 @@
+# benchmarks/bench_concurrency.py
+"""
+Reader/writer throughput on one database file, rollback journal vs. WAL.
+
+N reader threads run the long history/list queries while M writer threads
+log mechanic hours and update notes, all through DBManager. Each journal
+mode gets its own copy of the database.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrency [--readers 4] [--writers 2] [--seconds 5]
+"""
+import argparse
+import random
+import shutil
+import threading
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+from model.db_manager import DBManager
+
+
+def _reader(db_path, stop, counts, idx, customers):
+    db = DBManager(db_path)
+    rnd = random.Random(idx)
+    while not stop.is_set():
+        db.get_history_by_customer(rnd.randint(1, customers))
+        db.get_work_orders_by_status("In Progress")
+        counts[idx] += 1
+
+
+def _writer(db_path, stop, counts, errors, idx, orders):
+    db = DBManager(db_path)
+    rnd = random.Random(1000 + idx)
+    while not stop.is_set():
+        wo_id = rnd.randint(1, orders)
+        try:
+            db.add_mechanic_hours(wo_id, "Bench", 0.5, "2024-01-01")
+            db.update_work_order_notes(wo_id, f"bench note {rnd.random()}")
+            counts[idx] += 1
+        except Exception as e:  # "database is locked" once busy timeout expires
+            errors.append(str(e))
+
+
+def run(db_path, readers, writers, seconds, orders, customers):
+    stop = threading.Event()
+    read_counts = [0] * readers
+    write_counts = [0] * writers
+    errors = []
+    threads = [
+        threading.Thread(target=_reader, args=(db_path, stop, read_counts, i, customers))
+        for i in range(readers)
+    ] + [
+        threading.Thread(target=_writer, args=(db_path, stop, write_counts, errors, i, orders))
+        for i in range(writers)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(read_counts) / seconds, sum(write_counts) / seconds, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    template = temp_db_path("template.db")
+    print(f"Building {args.orders:,} work orders ...")
+    build_database(template, work_orders=args.orders, pragmas={"journal_mode": "delete"})
+    customers = max(1, args.orders // 20)
+
+    print(f"\n{args.readers} readers / {args.writers} writers for {args.seconds:g}s each")
+    print(f"{'journal_mode':<14}{'reads/s':>12}{'writes/s':>12}{'lock errors':>14}")
+    for mode in ("delete", "wal"):
+        db_path = temp_db_path(f"{mode}.db")
+        shutil.copy(template, db_path)
+        # The first DBManager for a file fixes its pool's pragmas.
+        DBManager(db_path, pragmas={"journal_mode": mode})
+        reads, writes, errors = run(db_path, args.readers, args.writers, args.seconds, args.orders, customers)
+        print(f"{mode:<14}{reads:>12.1f}{writes:>12.1f}{errors:>14}")
+
+
+if __name__ == "__main__":
+    main()
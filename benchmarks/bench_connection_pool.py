@@ -0,0 +1,90 @@
+# benchmarks/bench_connection_pool.py
+"""
+Per-call sqlite3.connect() vs. the pooled DBManager connection.
+
+Run from the repository root:
+    python -m benchmarks.bench_connection_pool [--orders 100000] [--calls 20000]
+"""
+import argparse
+import random
+import sqlite3
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+
+NOTES_SQL = "SELECT notes FROM work_orders WHERE id = ?"
+PARTS_SQL = """
+    SELECT id, part_name, quantity, unit_price, cost, added_at
+    FROM work_order_parts
+    WHERE work_order_id = ?
+"""
+
+
+def per_call_connect(db_path, ids):
+    # What every DBManager method did before the pool: connect, query, close.
+    for wo_id in ids:
+        conn = sqlite3.connect(db_path)
+        conn.execute(NOTES_SQL, (wo_id,)).fetchone()
+        conn.close()
+
+
+def pooled(db, ids):
+    for wo_id in ids:
+        db.get_notes_for_work_order(wo_id)
+
+
+def refresh_screen_per_call(db_path, ids):
+    # InProgressWorkOrderFrame.refresh_data: notes, parts, hours, rate.
+    for wo_id in ids:
+        for sql in (NOTES_SQL, PARTS_SQL,
+                    "SELECT id, mechanic, hours, date FROM mechanic_hours WHERE work_order_id = ?",
+                    "SELECT rate FROM work_orders WHERE id = ?"):
+            conn = sqlite3.connect(db_path)
+            conn.execute(sql, (wo_id,)).fetchall()
+            conn.close()
+
+
+def refresh_screen_pooled(db, ids):
+    for wo_id in ids:
+        db.get_notes_for_work_order(wo_id)
+        db.get_parts_for_work_order(wo_id)
+        db.get_mechanic_hours(wo_id)
+        db.get_work_order_rate(wo_id)
+
+
+def _time(label, fn, *args, calls):
+    started = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms   {elapsed / calls * 1e6:8.1f} us/call")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    print(f"Building {args.orders:,} work orders in {db_path} ...")
+    # Lookups by id only touch work_orders, so skip the child rows to keep setup fast.
+    db = build_database(db_path, work_orders=args.orders, parts_per_order=1, hours_per_order=1)
+
+    rnd = random.Random(1)
+    ids = [rnd.randint(1, args.orders) for _ in range(args.calls)]
+
+    print(f"\nget_notes_for_work_order x {args.calls:,}")
+    slow = _time("per-call connect", per_call_connect, db_path, ids, calls=args.calls)
+    fast = _time("pooled connection", pooled, db, ids, calls=args.calls)
+    print(f"speedup: {slow / fast:.1f}x")
+
+    screens = max(1, args.calls // 4)
+    print(f"\nInProgressWorkOrderFrame.refresh_data queries x {screens:,}")
+    slow = _time("per-call connect", refresh_screen_per_call, db_path, ids[:screens], calls=screens)
+    fast = _time("pooled connection", refresh_screen_pooled, db, ids[:screens], calls=screens)
+    print(f"speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_export.py
+"""
+Peak Python memory of the parts CSV export as the row count grows.
+
+  streamed      helpers.csv_export.write_csv over DBManager.export_work_order_parts,
+                one page of EXPORT_PAGE_SIZE rows at a time
+  materialized  the same query fetchall()'d into a list, then written
+
+The work-order date range picks how many rows go out. Peak memory is the
+tracemalloc high-water mark; SQLite's own page cache is bounded separately
+by its cache_size. With the defaults the largest export is 1,000,000 parts.
+
+Run from the repository root:
+    python -m benchmarks.bench_export [--orders 500000] [--skip-materialized]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.fixtures import build_database, temp_db_path
+from helpers.csv_export import EXPORTS, write_csv
+
+HEADER = EXPORTS["parts"][2]
+
+
+def _materialized(db, path, end):
+    rows = list(db.export_work_order_parts(end=end, page_size=10**9))
+    return write_csv(path, HEADER, rows)
+
+
+def _streamed(db, path, end):
+    return write_csv(path, HEADER, db.export_work_order_parts(end=end))
+
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=500_000, help="work orders (two parts each)")
+    parser.add_argument("--skip-materialized", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Building {args.orders:,} work orders ({args.orders * 2:,} parts) ...")
+    db_path = temp_db_path()
+    db = build_database(db_path, work_orders=args.orders)
+    out = os.path.join(os.path.dirname(db_path), "parts.csv")
+
+    # The fixture opens one order every ~15 minutes from 2020-01-01.
+    first = datetime(2020, 1, 1)
+    ends = [(first + timedelta(minutes=15 * n)).date().isoformat() for n in (args.orders // 100, args.orders // 10)]
+    ends.append(None)
+
+    print(f"{'rows':>12}{'streamed MiB':>15}{'s':>7}{'materialized MiB':>19}{'s':>7}")
+    for end in ends:
+        rows, streamed_s, streamed_mib = _measure(_streamed, db, out, end)
+        line = f"{rows:>12,}{streamed_mib:>15.1f}{streamed_s:>7.1f}"
+        if not args.skip_materialized:
+            _, full_s, full_mib = _measure(_materialized, db, out, end)
+            line += f"{full_mib:>19.1f}{full_s:>7.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_invoices.py
+"""
+Invoice rendering throughput (helpers/invoice_pdf):
+
+  rebuilt    a new InvoiceTemplate for every invoice
+  cached     the process's template, laid out once
+  serial     render_invoices(processes=1) for a whole batch
+  pool       render_invoices() across a process pool
+
+Batches are a day's completed orders plus larger synthetic days. Loading
+the invoice data from SQLite is timed separately.
+
+Run from the repository root:
+    python -m benchmarks.bench_invoices [--orders 20000] [--batch 40 200 1000]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+from helpers.invoice_pdf import InvoiceTemplate, get_template, load_invoice, render_invoices
+
+
+def _seconds(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[40, 200, 1_000])
+    args = parser.parse_args()
+
+    print(f"Building {args.orders:,} work orders ...")
+    db_path = temp_db_path()
+    db = build_database(db_path, work_orders=args.orders)
+    folder = os.path.join(os.path.dirname(db_path), "invoices")
+
+    day = db.get_work_orders_completed_between("2020-01-05 00:00:00", "2020-01-06 00:00:00")
+    load_s = _seconds(lambda: [load_invoice(db, wo_id) for wo_id in day])
+    print(f"{len(day)} orders completed on 2020-01-05; loading their invoice data: {load_s * 1000:.1f} ms")
+
+    invoices = [load_invoice(db, wo_id) for wo_id in range(1, max(args.batch) + 1)]
+    sample = invoices[:200]
+    rebuilt = _seconds(lambda: [InvoiceTemplate().render(inv) for inv in sample]) / len(sample)
+    cached = _seconds(lambda: [get_template().render(inv) for inv in sample]) / len(sample)
+    print(f"per invoice: rebuilt template {rebuilt * 1000:.2f} ms, cached template {cached * 1000:.2f} ms")
+
+    print(f"\n{'invoices':>10}{'serial s':>11}{'pool s':>9}{'pool/s':>9}   ({os.cpu_count()} CPUs)")
+    for n in args.batch:
+        batch = invoices[:n]
+        serial = _seconds(lambda: render_invoices(batch, folder, processes=1))
+        pooled = _seconds(lambda: render_invoices(batch, folder))
+        print(f"{n:>10,}{serial:>11.2f}{pooled:>9.2f}{n / pooled:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_list_seek.py
+"""
+Jumping to the end of a long list: walking every keyset page vs. seeking the
+page's boundary with an OFFSET over ids only, and the same jump again after
+the list is invalidated by a write, as a refresh after any change does.
+
+Also checks that both ways return exactly the rows of a straight listing,
+for work orders, vehicles (NULL years included) and customers, and that a
+list invalidated after a write near its visible rows shows no row twice or
+skips none.
+
+Run from the repository root:
+    python -m benchmarks.bench_list_seek [--orders 100000]
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+from view.virtual_tree import KeysetRowProvider
+
+
+def _jump_to_end(provider, visible=30):
+    start = time.perf_counter()
+    total = provider.count()
+    rows = provider.rows(total - visible, total)
+    return time.perf_counter() - start, rows
+
+
+def _providers(db):
+    lists = {
+        "work orders": (db.get_work_orders_page, db.count_work_orders, None, db.get_work_order_key_at),
+        "vehicles": (db.get_vehicles_page, db.count_vehicles, lambda v: (v[4], v[0]), db.get_vehicle_key_at),
+        "customers": (db.get_customers_page, db.count_customers, lambda c: (c[2], c[0]), db.get_customer_key_at),
+    }
+    full = {
+        "work orders": [row for page in db.iter_work_orders() for row in page],
+        "vehicles": [row for page in db.iter_vehicles() for row in page],
+        "customers": [row for page in db.iter_customers() for row in page],
+    }
+    return lists, full
+
+
+def _check(failures, name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    db = build_database(temp_db_path(), work_orders=args.orders)
+    with db.transaction() as conn:
+        conn.execute("UPDATE vehicles SET year = NULL WHERE id % 7 = 0")
+    failures = []
+
+    print(f"jump to the end of {db.count_work_orders():,} work orders (seconds):")
+    print(f"{'':>8}  {'first':>9}  {'repeat':>9}  {'after invalidate':>16}")
+    for name, key_at in (("walk", None), ("seek", db.get_work_order_key_at)):
+        provider = KeysetRowProvider(db.get_work_orders_page, db.count_work_orders, key_at=key_at)
+        first, _ = _jump_to_end(provider)
+        repeat, _ = _jump_to_end(provider)
+        provider.invalidate()
+        again, _ = _jump_to_end(provider)
+        print(f"{name:>8}  {first:9.4f}  {repeat:9.4f}  {again:16.4f}")
+
+    lists, full = _providers(db)
+    rnd = random.Random(1)
+    for name, (get_page, count, page_key, key_at) in lists.items():
+        rows = full[name]
+        for label, seek in (("walk", None), ("seek", key_at)):
+            provider = KeysetRowProvider(get_page, count, page_key=page_key, key_at=seek)
+            starts = [len(rows) - 25] + [rnd.randrange(len(rows)) for _ in range(20)]
+            bad = [start for start in starts if provider.rows(start, start + 25) != rows[start:start + 25]]
+            _check(failures, f"{name}, {label}: rows match a full listing", not bad, bad[:3])
+
+    # A write inside the visible rows, then the refresh's invalidate().
+    provider = KeysetRowProvider(db.get_work_orders_page, db.count_work_orders, key_at=db.get_work_order_key_at)
+    middle = provider.page_size * 40 - 10  # the view spans two pages
+    visible = provider.rows(middle, middle + 20)
+    db.delete_work_order(visible[5][0])
+    provider.invalidate()
+    after_delete = provider.rows(middle, middle + 20)
+    ids = [row[0] for row in after_delete]
+    _check(failures, "after a delete: no duplicate or skipped row",
+           len(set(ids)) == len(ids) and ids == sorted(ids, reverse=True) and visible[5][0] not in ids
+           and [row[0] for row in visible if row[0] != visible[5][0]] == ids[:19], ids)
+
+    if failures:
+        print(f"List seek check FAILED ({len(failures)}).")
+        return 1
+    print("List seek check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
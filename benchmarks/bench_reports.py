@@ -0,0 +1,68 @@
+# benchmarks/bench_reports.py
+"""
+Report query times (helpers/reports) over a synthetic shop history.
+
+Each DBManager.report_* query is timed on its own for a week, a month, a
+year and the whole history, then build_report() as the reports screen runs
+it: uncached, and again from the ReportCache.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports [--years 5] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from benchmarks.fixtures import build_database, temp_db_path
+from helpers.reports import ReportCache, build_report
+from model.db_manager import utc_bounds
+
+ORDERS_PER_DAY = 96  # the fixture opens one order every 15 minutes
+
+
+def _ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orders = args.years * 365 * ORDERS_PER_DAY
+    print(f"Building {orders:,} work orders ({args.years} years) ...")
+    db = build_database(temp_db_path(), work_orders=orders)
+
+    first = date(2020, 1, 1)
+    ranges = {
+        "week": (date(2022, 3, 7), date(2022, 3, 13)),
+        "month": (date(2022, 3, 1), date(2022, 3, 31)),
+        "year": (date(2022, 1, 1), date(2022, 12, 31)),
+        "all": (first, first + timedelta(days=args.years * 365)),
+    }
+
+    print(f"\n{'ms (best of %d)' % args.repeat:<16}{'revenue':>9}{'summary':>9}{'hours':>9}{'parts':>9}"
+          f"{'report':>9}{'cached':>9}")
+    for label, (lo, hi) in ranges.items():
+        start, end = utc_bounds(lo, hi)
+        cache = ReportCache(db)
+        cache.get(lo, hi)
+        times = [
+            _ms(lambda: db.report_revenue_by_day(start, end), args.repeat),
+            _ms(lambda: db.report_ticket_summary(start, end), args.repeat),
+            _ms(lambda: db.report_mechanic_hours(lo.isoformat(), hi.isoformat()), args.repeat),
+            _ms(lambda: db.report_top_parts(start, end), args.repeat),
+            _ms(lambda: build_report(lo, hi, db), args.repeat),
+            _ms(lambda: cache.get(lo, hi), args.repeat),
+        ]
+        print(f"{label:<16}" + "".join(f"{t:>9.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_search.py
+"""
+Search-bar latency: the old load-everything-and-filter-in-Python approach
+vs. the FTS5 index behind DBManager.search_work_orders / search_vehicles.
+
+Run from the repository root:
+    python -m benchmarks.bench_search [--orders 100000] [--repeat 5]
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+
+QUERIES = ["honda", "civic 2019", "smith", "ga", "issue 42", "f-150 taylor"]
+
+
+def _python_filter_orders(db, text):
+    words = text.lower().split()
+    return [
+        row for page in db.iter_work_orders() for row in page
+        if all(any(w in str(field).lower() for field in row[1:4]) for w in words)
+    ]
+
+
+def _python_filter_vehicles(db, text):
+    words = text.lower().split()
+    return [
+        row for page in db.iter_vehicles() for row in page
+        if all(any(w in str(field).lower() for field in row) for w in words)
+    ]
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Building {args.orders:,} work orders ...")
+    db = build_database(temp_db_path(), work_orders=args.orders)
+
+    for label, python_filter, search in (
+        ("work orders", _python_filter_orders, db.search_work_orders),
+        ("vehicles", _python_filter_vehicles, db.search_vehicles),
+    ):
+        print(f"\n{label}")
+        print(f"{'query':<16}{'python ms':>12}{'fts5 ms':>10}{'matches':>10}{'shown':>8}")
+        for text in QUERIES:
+            slow, matches = _best_ms(lambda: python_filter(db, text), max(1, args.repeat // 2))
+            fast, shown = _best_ms(lambda: search(text), args.repeat)
+            print(f"{text:<16}{slow:>12.1f}{fast:>10.2f}{matches:>10,}{shown:>8,}")
+
+
+if __name__ == "__main__":
+    main()
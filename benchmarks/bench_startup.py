@@ -0,0 +1,134 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the app, for tracking over time.
+
+  imports      `python -X importtime -c "import main"`: milliseconds per
+               top-level package, beyond what the bare interpreter loads
+  deferred     heavy packages that must NOT be imported before the first
+               screen is up (they load when their screen is opened)
+  first paint  wall time from launching a fresh interpreter until the
+               first frame (login, or dashboard with a saved session) has
+               been drawn; needs a display
+
+Each run starts in a temporary directory, so the first run creates and
+migrates a new rtf_auto.db and the rest open an up-to-date one. Exits 1 if
+a deferred package was imported or the median warm start is over budget.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED = ("tkcalendar", "dateutil", "requests", "googleapiclient", "google_auth_oauthlib", "urllib.request")
+
+_FIRST_PAINT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.DBManager(pragmas=main.db_pragmas())
+migrated = time.perf_counter()
+app = main.RTFApp()
+app.update()
+painted = time.perf_counter()
+print(json.dumps({
+    "import": imported - start, "db": migrated - imported, "ui": painted - migrated,
+    "frame": type(app.controller.current_frame).__name__,
+}), flush=True)
+app.destroy()
+"""
+
+
+def _env():
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _importtime(code):
+    """{module: (self us, top-level package)} from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def import_profile(top):
+    baseline = _importtime("pass")
+    loaded = _importtime("import main")
+    ours = {name: us for name, us in loaded.items() if name not in baseline}
+    by_package = Counter()
+    for name, us in ours.items():
+        by_package[name.split(".", 1)[0]] += us
+    print(f"import main: {sum(ours.values()) / 1000:.1f} ms in {len(ours)} modules beyond the bare interpreter")
+    for package, us in by_package.most_common(top):
+        print(f"  {package:<28}{us / 1000:>8.1f} ms")
+    early = [name for name in DEFERRED if name in ours]
+    print(f"deferred packages imported at startup: {', '.join(early) or 'none'}")
+    return early
+
+
+def first_paint(runs):
+    """[(wall seconds, child timings)] per run, or None without a display."""
+    workdir = tempfile.mkdtemp(prefix="rtf_startup_")
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        child = subprocess.Popen(
+            [sys.executable, "-c", _FIRST_PAINT], cwd=workdir, env=_env(),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        line = child.stdout.readline()
+        wall = time.perf_counter() - start
+        _, err = child.communicate()
+        if not line:
+            if "TclError" in err:
+                return None
+            raise RuntimeError(err)
+        results.append((wall, json.loads(line)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=12, help="packages to list in the import profile")
+    args = parser.parse_args()
+
+    early = import_profile(args.top)
+
+    runs = first_paint(args.runs)
+    if runs is None:
+        print("\nfirst paint: skipped (no display)")
+        return 1 if early else 0
+
+    print(f"\n{'run':<6}{'wall ms':>9}{'import':>9}{'db':>9}{'ui':>9}   frame")
+    for i, (wall, t) in enumerate(runs, 1):
+        label = "cold" if i == 1 else str(i)
+        print(f"{label:<6}{wall * 1000:>9.0f}{t['import'] * 1000:>9.0f}{t['db'] * 1000:>9.0f}"
+              f"{t['ui'] * 1000:>9.0f}   {t['frame']}")
+    warm = statistics.median(wall for wall, _ in runs[1:] or runs) * 1000
+    verdict = "ok" if warm <= args.budget_ms else "OVER BUDGET"
+    print(f"first paint (median warm): {warm:.0f} ms, budget {args.budget_ms:.0f} ms: {verdict}")
+    return 1 if early or warm > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
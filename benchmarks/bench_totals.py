@@ -0,0 +1,59 @@
+# benchmarks/bench_totals.py
+"""
+Subtotals for a screenful of work orders, three ways:
+
+  n+1          parts + hours + rate fetched per order and summed in Python
+               (what InProgressWorkOrderFrame used to do for one order)
+  aggregate    DBManager.get_work_order_totals_batch, one SQL aggregate
+  materialized the subtotal column get_work_orders_page reads from the
+               trigger-maintained work_order_totals table
+
+Run from the repository root:
+    python -m benchmarks.bench_totals [--orders 100000] [--rows 200 2000]
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+
+
+def _n_plus_one(db, ids):
+    totals = {}
+    for wo_id in ids:
+        parts = db.get_parts_for_work_order(wo_id)
+        hours = db.get_mechanic_hours(wo_id)
+        rate = db.get_work_order_rate(wo_id)
+        totals[wo_id] = sum(float(p[4]) for p in parts) + sum(float(h[2]) for h in hours) * rate
+    return totals
+
+
+def _best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 2_000])
+    args = parser.parse_args()
+
+    print(f"Building {args.orders:,} work orders ...")
+    db = build_database(temp_db_path(), work_orders=args.orders)
+
+    print(f"{'rows':>8}{'n+1 ms':>12}{'aggregate ms':>15}{'materialized ms':>18}")
+    for n in args.rows:
+        page = db.get_work_orders_page(limit=n)
+        ids = [row[0] for row in page]
+        slow = _best_ms(lambda: _n_plus_one(db, ids))
+        batch = _best_ms(lambda: db.get_work_order_totals_batch(ids))
+        stored = _best_ms(lambda: db.get_work_orders_page(limit=n))
+        print(f"{n:>8,}{slow:>12.1f}{batch:>15.1f}{stored:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
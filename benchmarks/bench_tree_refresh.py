@@ -0,0 +1,76 @@
+# benchmarks/bench_tree_refresh.py
+"""
+Treeview refresh cost: delete-all/reinsert vs. TreeSync.
+
+For each row count the tree is filled once, then refreshed with the same
+rows except one edited value (the typical "saved one part" case). Needs a
+display, since it drives a real ttk.Treeview.
+
+Run from the repository root:
+    python -m benchmarks.bench_tree_refresh [--sizes 50 500 5000] [--repeat 20]
+"""
+import argparse
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from view.tree_sync import TreeSync
+
+COLUMNS = ("ID", "Part", "Qty", "Unit $", "Total $")
+
+
+def _rows(n, edited=None):
+    rows = [(i, f"Part {i}", 1 + i % 5, f"${i % 90 + 9.99:.2f}", f"${(1 + i % 5) * (i % 90 + 9.99):.2f}")
+            for i in range(1, n + 1)]
+    if edited is not None:
+        row = rows[edited]
+        rows[edited] = row[:2] + (row[2] + 1,) + row[3:]
+    return rows
+
+
+def _rebuild(tree, rows):
+    tree.delete(*tree.get_children())
+    for row in rows:
+        tree.insert("", "end", values=row)
+
+
+def _time(root, refresh, before, after, repeat):
+    best = float("inf")
+    for r in range(repeat):
+        rows = after if r % 2 == 0 else before
+        start = time.perf_counter()
+        refresh(rows)
+        root.update_idletasks()  # include Tk's own redraw bookkeeping
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    print(f"{'rows':>8}{'rebuild ms':>14}{'TreeSync ms':>14}{'speedup':>10}")
+    for n in args.sizes:
+        before, after = _rows(n), _rows(n, edited=n // 2)
+
+        tree = ttk.Treeview(root, columns=COLUMNS, show="headings")
+        _rebuild(tree, before)
+        rebuild = _time(root, lambda rows: _rebuild(tree, rows), before, after, args.repeat)
+        tree.destroy()
+
+        tree = ttk.Treeview(root, columns=COLUMNS, show="headings")
+        sync = TreeSync(tree)
+        sync.update(before)
+        synced = _time(root, sync.update, before, after, args.repeat)
+        tree.destroy()
+
+        print(f"{n:>8,}{rebuild * 1000:>14.2f}{synced * 1000:>14.2f}{rebuild / synced:>9.1f}x")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# benchmarks/check_calendar_sync.py
+"""
+Checks helpers/calendar_cache.CalendarCache against an in-memory fake of the
+Google Calendar service: full sync across pages, incremental deltas with a
+sync token, cancelled events, 410 Gone forcing a resync, full syncs limited
+to the last FULL_SYNC_DAYS with older ranges fetched directly, and offline
+reads after a failed sync. Exits non-zero if any check fails.
+
+Run from the repository root:
+    python -m benchmarks.check_calendar_sync
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fixtures import temp_db_path
+from helpers.calendar_cache import CalendarCache, to_utc
+from model.db_manager import DBManager
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class FakeCalendarService:
+    """Enough of service.events().list(...).execute() for sync tokens."""
+
+    def __init__(self):
+        self.stored = {}     # id -> (version, event)
+        self.version = 0
+        self.expired_before = 0
+        self.offline = False
+        self.calls = []
+
+    # —— test controls ——
+    def put(self, event_id, start, hours=1, summary="Service", all_day=False):
+        self.version += 1
+        if all_day:
+            when = {"date": start.date().isoformat()}, {"date": (start + timedelta(days=1)).date().isoformat()}
+        else:
+            when = {"dateTime": start.isoformat()}, {"dateTime": (start + timedelta(hours=hours)).isoformat()}
+        self.stored[event_id] = (self.version, {
+            "id": event_id, "status": "confirmed", "summary": summary,
+            "start": when[0], "end": when[1], "htmlLink": f"https://calendar.example/{event_id}",
+        })
+
+    def cancel(self, event_id):
+        self.version += 1
+        self.stored[event_id] = (self.version, {"id": event_id, "status": "cancelled"})
+
+    # —— service API ——
+    def events(self):
+        return self
+
+    def list(self, calendarId, singleEvents=False, maxResults=250, syncToken=None, pageToken=None,
+             timeMin=None, timeMax=None, orderBy=None):
+        self.calls.append({"syncToken": syncToken, "pageToken": pageToken, "timeMin": timeMin, "timeMax": timeMax})
+        service = self
+
+        class _Request:
+            def execute(self):
+                return service._list(maxResults, syncToken, pageToken, timeMin, timeMax, orderBy)
+        return _Request()
+
+    def _list(self, page_size, sync_token, page_token, time_min, time_max=None, order_by=None):
+        if self.offline:
+            raise OSError("network unreachable")
+        if sync_token and (time_min or time_max or order_by):
+            raise FakeHttpError(400)  # as Google does
+        since = int(sync_token or 0)
+        if sync_token and since < self.expired_before:
+            raise FakeHttpError(410)
+        matching = sorted(
+            (v, e) for v, e in self.stored.values()
+            if v > since and (sync_token or e["status"] != "cancelled")
+            and (not time_min or to_utc(e["end"].get("dateTime") or e["end"]["date"]) > time_min)
+            and (not time_max or to_utc(e["start"].get("dateTime") or e["start"]["date"]) < time_max)
+        )
+        if order_by == "startTime":
+            matching.sort(key=lambda item: to_utc(item[1]["start"].get("dateTime") or item[1]["start"]["date"]))
+        offset = int(page_token or 0)
+        page = matching[offset:offset + page_size]
+        result = {"items": [e for _, e in page]}
+        if offset + page_size < len(matching):
+            result["nextPageToken"] = str(offset + page_size)
+        else:
+            result["nextSyncToken"] = str(self.version)
+        return result
+
+
+def _check(failures, name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    failures = []
+    service = FakeCalendarService()
+    cache = CalendarCache(service, DBManager(temp_db_path("calendar.db")))
+    base = datetime.now(timezone.utc).replace(hour=16, minute=0, second=0, microsecond=0) - timedelta(days=30)
+    service.put("old", base - timedelta(days=CalendarCache.FULL_SYNC_DAYS))
+    for i in range(600):
+        service.put(f"e{i}", base + timedelta(hours=6 * i))
+    week = (base - timedelta(hours=1), base + timedelta(days=7))
+
+    changed = cache.sync()
+    _check(failures, "full sync pulls every page", changed == 600 and len(service.calls) == 3, changed)
+    _check(failures, "full sync skips events before the window",
+           all(call["timeMin"] for call in service.calls)
+           and not cache.events_between(base - timedelta(days=365), base - timedelta(days=31)), service.calls[0])
+    _check(failures, "week served from cache", len(cache.events_between(*week)) == 28,
+           len(cache.events_between(*week)))
+
+    service.calls.clear()
+    service.put("e1", base + timedelta(hours=6), summary="Moved")
+    service.cancel("e2")
+    service.put("new", base + timedelta(minutes=30), summary="Walk-in")
+    service.put("allday", base, all_day=True)
+    changed = cache.sync()
+    week_events = cache.events_between(*week)
+    summaries = {e["id"]: e.get("summary") for e in week_events}
+    _check(failures, "incremental sync fetches only the delta",
+           changed == 4 and len(service.calls) == 1 and service.calls[0]["syncToken"], (changed, service.calls))
+    _check(failures, "cancelled event removed", "e2" not in summaries)
+    _check(failures, "changed and added events applied",
+           summaries.get("e1") == "Moved" and summaries.get("new") == "Walk-in" and "allday" in summaries)
+    starts = [to_utc(e["start"].get("dateTime") or e["start"]["date"]) for e in week_events]
+    _check(failures, "results ordered by start", starts == sorted(starts), starts[:3])
+
+    service.calls.clear()
+    _check(failures, "no changes means nothing to apply", cache.sync() == 0 and len(service.calls) == 1)
+
+    service.expired_before = service.version + 1
+    service.put("late", base + timedelta(hours=2))
+    service.calls.clear()
+    changed = cache.sync()
+    live = sum(1 for _, e in service.stored.values() if e["status"] != "cancelled" and e["id"] != "old")
+    _check(failures, "410 Gone falls back to a full resync",
+           changed == live and service.calls[0]["syncToken"] and service.calls[1]["syncToken"] is None,
+           (changed, live, service.calls[:2]))
+
+    old = base - timedelta(days=CalendarCache.FULL_SYNC_DAYS)
+    old_range = (old - timedelta(days=1), old + timedelta(days=1))
+    fetched = cache.fetch_between(*old_range)
+    _check(failures, "older ranges are not covered, and fetched from Google directly",
+           cache.covers(week[0]) and not cache.covers(old_range[0]) and [e["id"] for e in fetched] == ["old"]
+           and not cache.events_between(*old_range), fetched)
+
+    before = cache.events_between(*week)
+    service.offline = True
+    try:
+        cache.sync()
+        _check(failures, "offline sync raises", False)
+    except OSError:
+        _check(failures, "offline sync raises", True)
+    _check(failures, "offline reads keep last-synced data", cache.events_between(*week) == before)
+
+    if failures:
+        print(f"Calendar sync check FAILED ({len(failures)}).")
+        return 1
+    print("Calendar sync check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
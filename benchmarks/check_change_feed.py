@@ -0,0 +1,154 @@
+# benchmarks/check_change_feed.py
+"""
+Checks helpers/change_feed.ChangeFeed with a second process writing to the
+same database file, as another terminal would: its writes reach this
+process's change bus with the same keys and parents as local ones, this
+process's own writes are not published twice, an idle poll reads no table,
+trimming keeps rows a running terminal has not read but empties a log gone
+stale, and a terminal that fell behind the trimmed log refreshes everything.
+Prints the cost of an idle poll and of a poll with work to do. Exits
+non-zero if any check fails.
+
+Run from the repository root:
+    python -m benchmarks.check_change_feed
+"""
+import multiprocessing
+import sys
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+from helpers.change_feed import ChangeFeed
+from model import change_bus
+from model.change_bus import Change
+from model.migrations import CHANGE_LOG_TABLES
+
+
+class _ManualTimers:
+    """Stands in for the Tk root; the check calls poll() itself."""
+
+    def after(self, ms, callback):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def _terminal(db_path, calls):
+    # Runs in a separate process: its own pool, connections and change bus.
+    from model.db_manager import DBManager
+
+    db = DBManager(db_path)
+    for name, args in calls:
+        getattr(db, name)(*args)
+
+
+def _other_terminal(db_path, *calls):
+    process = multiprocessing.get_context("spawn").Process(target=_terminal, args=(db_path, calls))
+    process.start()
+    process.join()
+    return process.exitcode == 0
+
+
+def _check(failures, name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failures.append(name)
+
+
+def _time_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    failures = []
+    db_path = temp_db_path("feed.db")
+    db = build_database(db_path, work_orders=2_000)
+    feed = ChangeFeed(_ManualTimers(), db)
+    received = []
+    change_bus.subscribe(CHANGE_LOG_TABLES, received.extend)
+
+    _check(failures, "nothing to publish at startup", feed.poll() == [] and not received)
+
+    ok = _other_terminal(
+        db_path,
+        ("update_work_order_notes", (7, "Customer called back")),
+        ("add_mechanic_hours", (7, "Dave", 1.5, "2024-01-02")),
+        ("update_work_order_status", (8, "Complete")),
+        ("add_customer", ("Ann", "Lee", "555", "ann@example.com")),
+    )
+    changes = feed.poll()
+    hours = [c for c in changes if c.table == "mechanic_hours"]
+    _check(failures, "other terminal's writes published", ok and received == changes and len(changes) == 4, changes)
+    _check(failures, "keys and ops as for local writes",
+           Change("work_orders", 7, "update") in changes and Change("work_orders", 8, "update") in changes
+           and any(c.op == "insert" for c in changes if c.table == "customers"), changes)
+    _check(failures, "detail rows carry their work order", len(hours) == 1 and hours[0].parent == 7, hours)
+
+    received.clear()
+    db.add_part_to_work_order(9, "Oil filter", 1, 9.99, 9.99)
+    db.update_work_order_notes(9, "local edit")
+    local = list(received)
+    received.clear()
+    _check(failures, "own writes not published twice", len(local) == 2 and feed.poll() == [] and not received, received)
+    _check(failures, "own rows still advance the feed", feed.last_seq == db.get_change_log_seq())
+
+    statements = []
+    reader = db.get_read_connection()
+    reader.set_trace_callback(statements.append)
+    feed.poll()
+    reader.set_trace_callback(None)
+    _check(failures, "idle poll reads no table", statements == ["PRAGMA data_version"], statements)
+
+    # A terminal starting up trims by age: rows this one has not read yet are
+    # recent, so they stay.
+    ok = _other_terminal(db_path, ("update_work_order_notes", (10, "unread")),
+                         ("trim_change_log", (ChangeFeed.KEEP_DAYS,)))
+    changes = feed.poll()
+    _check(failures, "trim keeps rows a running terminal has not read",
+           ok and Change("work_orders", 10, "update") in changes and all(c.key is not None for c in changes), changes)
+
+    # This terminal "sleeps" past KEEP_DAYS while the other one writes and trims the log.
+    behind = feed.last_seq
+    ok = _other_terminal(db_path, *[("update_work_order_notes", (10, f"note {i}")) for i in range(20)])
+    with db.transaction() as conn:
+        conn.execute("UPDATE change_log SET changed_at = datetime('now', '-30 days') WHERE seq <= ?",
+                     (behind + 5,))
+    ok = ok and _other_terminal(db_path, ("trim_change_log", (ChangeFeed.KEEP_DAYS,)),
+                                ("update_work_order_notes", (11, "after trim")))
+    changes = feed.poll()
+    resync = {c.table for c in changes if c.key is None}
+    _check(failures, "trimmed past our seq: every table refreshed",
+           ok and feed.last_seq > behind and resync == set(CHANGE_LOG_TABLES), changes)
+
+    # After a quiet spell no row is inside the window; the whole log goes, and
+    # a terminal that had read it all sees no gap in the next write.
+    with db.transaction() as conn:
+        conn.execute("UPDATE change_log SET changed_at = datetime('now', '-30 days')")
+    db.trim_change_log(ChangeFeed.KEEP_DAYS)
+    emptied = db.get_read_connection().execute("SELECT COUNT(*) FROM change_log").fetchone()[0] == 0
+    ok = _other_terminal(db_path, ("update_work_order_notes", (11, "after a quiet spell")))
+    changes = feed.poll()
+    _check(failures, "quiet spell: stale log trimmed, no gap for a caught-up terminal",
+           ok and emptied and changes == [Change("work_orders", 11, "update")], changes)
+
+    idle = _time_us(feed.poll, 10_000)
+    rows = 200
+    _other_terminal(db_path, *[("update_work_order_notes", (12 + i % 50, f"n{i}")) for i in range(rows)])
+    start = time.perf_counter()
+    busy = feed.poll()
+    busy_ms = (time.perf_counter() - start) * 1000
+    _check(failures, "deduplicated per row", len(busy) == 50, len(busy))
+    print(f"idle poll: {idle:.1f} µs; poll after {rows} remote writes: {busy_ms:.2f} ms ({len(busy)} changes)")
+
+    if failures:
+        print(f"Change feed check FAILED ({len(failures)}).")
+        return 1
+    print("Change feed check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
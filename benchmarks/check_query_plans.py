@@ -0,0 +1,207 @@
+# benchmarks/check_query_plans.py
+"""
+Query-plan regression check for DBManager.
+
+Calls every public DBManager method against a small synthetic database,
+captures each SQL statement it runs, and EXPLAINs it. Exits non-zero if any
+statement falls back to a full table scan, or if a public method has no
+entry in CALLS (so new queries cannot skip the check).
+
+Run from the repository root:
+    python -m benchmarks.check_query_plans [-v]
+"""
+import argparse
+import re
+import sys
+
+from benchmarks.fixtures import build_database, temp_db_path
+from model.db_manager import DBManager
+
+# method name -> positional args. Writes run inside a transaction that is
+# rolled back, so the order here does not matter.
+CALLS = {
+    "get_notes_for_work_order": (1,),
+    "update_work_order_notes": (1, "notes"),
+    "get_work_order_rate": (1,),
+    "get_work_order_status": (1,),
+    "get_work_order_totals": (1,),
+    "get_work_order_totals_batch": (list(range(1, 1200, 3)),),  # spans two batches
+    "get_work_orders_by_status": ("In Progress",),
+    "get_all_work_orders": (),
+    "get_work_orders_page": (1500, 50, "In Progress"),
+    "iter_work_orders": (500,),
+    "count_work_orders": ("Complete",),
+    "get_work_order_key_at": (1000,),
+    "get_vehicle_key_at": (150,),
+    "get_customer_key_at": (50,),
+    "count_vehicles": (),
+    "count_customers": (),
+    "search_work_orders": ("hon civ", "Complete"),
+    "search_vehicles": ("ford 20",),
+    "iter_search_work_orders": ("smith",),  # broad: takes the newest-first path
+    "iter_search_vehicles": ("hon",),
+    "get_vehicles_page": (("2010", 5), 5000),  # runs into the NULL-year run too
+    "iter_vehicles": (),
+    "get_customers_page": ((None, 5), 50),
+    "iter_customers": (),
+    "add_part_to_work_order": (1, "Oil filter", 1, 9.99, 9.99),
+    "get_parts_for_work_order": (1,),
+    "update_work_order_part": (1, "Oil filter", 2, 9.99, 19.98),
+    "delete_work_order_part": (1,),
+    "get_mechanic_hours": (1,),
+    "add_mechanic_hours": (1, "Dave", 1.5, "2024-01-01"),
+    "update_mechanic_hours_entry": (1, "Dave", 2.0, "2024-01-01"),
+    "delete_mechanic_hours_entry": (1,),
+    "delete_work_order": (1,),
+    "update_work_order_status": (1, "Complete"),
+    "add_work_order": (1, "issue", "notes", "Scheduled", 65.0),
+    "update_work_order": (1, 1, "notes", "Scheduled"),
+    "add_customer": ("Ann", "Lee", "555", "ann@example.com"),
+    "update_customer": (1, "Ann", "Lee", "555", "ann@example.com"),
+    "get_all_customers": (),
+    "get_customer_list": (),
+    "get_all_vehicles": (),
+    "add_vehicle": (1, "Honda", "Civic", "2019", "1HGBH41JXMN109186", 1000),
+    "add_work_order_service": (1, "Oil change"),
+    "get_services_for_work_order": (1,),
+    "delete_services_for_work_order": (1,),
+    "validate_user": ("admin", "secret"),
+    "update_vehicle": (1, 1, "Honda", "Civic", "2019", "1HGBH41JXMN109186", 1000),
+    "get_cached_vin": ("1HGBH41JXMN109186",),
+    "cache_vin": ("1HGBH41JXMN109186", "Honda", "Civic", "2019"),
+    "get_cached_vins": (["1HGBH41JXMN109186", "2T1BURHE0JC034461"],),
+    "cache_vins": ([("1HGBH41JXMN109186", "Honda", "Civic", "2019")],),
+    "get_calendar_events": ("primary", "2024-01-01T00:00:00Z", "2024-01-08T00:00:00Z"),
+    "get_calendar_sync_state": ("primary",),
+    "save_calendar_sync": (
+        "primary", [("evt1", "2024-01-01T09:00:00Z", "2024-01-01T10:00:00Z", "{}")], ["evt2"], "token", True,
+    ),
+    "get_work_order_detail": (1,),
+    "get_work_orders_completed_between": ("2020-01-05 07:00:00", "2020-01-06 07:00:00"),
+    "report_revenue_by_day": ("2020-01-01 00:00:00", "2020-02-01 00:00:00"),
+    "report_ticket_summary": ("2020-01-01 00:00:00", "2020-02-01 00:00:00"),
+    "report_mechanic_hours": ("2020-01-01", "2020-01-31"),
+    "report_top_parts": ("2020-01-01 00:00:00", "2020-02-01 00:00:00"),
+    "export_work_orders": ("Complete", "2020-01-01", "2020-03-31"),
+    "export_work_order_parts": (None, "2020-01-01", "2020-01-31"),
+    "export_mechanic_hours": ("In Progress",),
+    "export_customers": (),
+    "export_vehicles": (),
+    "get_history_by_vehicle": (1,),
+    "get_history_by_customer": (1,),
+    "get_change_log_seq": (),
+    "get_changes_since": (100, 50),
+    "trim_change_log": (7,),
+}
+
+# Methods that are not queries.
+SKIP = {"get_connection", "get_read_connection", "transaction", "get_data_version"}
+
+# method name -> reason a full scan is intended.
+ALLOWED_SCANS = {
+    "get_all_work_orders": "lists every work order",
+    # The first page walks the rowid b-tree backwards and stops at LIMIT.
+    "iter_work_orders": "first page reads LIMIT rows in rowid order",
+    "get_work_order_key_at": "OFFSET steps through ids in rowid order, without the page's joins",
+    "trim_change_log": "walks the oldest rows in seq order up to the first one to keep",
+    # Exports stream every (matching) row once, in rowid order.
+    "export_work_orders": "exports the whole table",
+    "export_work_order_parts": "exports the whole table",
+    "export_mechanic_hours": "exports the whole table",
+    "export_customers": "exports the whole table",
+    "export_vehicles": "exports the whole table",
+}
+
+_INDEXED = ("USING INDEX", "USING COVERING INDEX", "USING INTEGER PRIMARY KEY", "USING PRIMARY KEY")
+# An FTS5 lookup driven by MATCH shows up as "SCAN f VIRTUAL TABLE INDEX n:M...".
+_FTS_MATCH = re.compile(r"VIRTUAL TABLE INDEX \d+:M")
+# Window functions and subqueries read back their own (already filtered) rows
+# as "SCAN (subquery-n)"; that is not a table scan.
+_SUBQUERY = re.compile(r"^SCAN \(subquery-\d+\)$")
+_QUERY_VERBS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+class _Rollback(Exception):
+    pass
+
+
+def full_scans(conn, sql):
+    """Plan lines for sql that scan a whole table without an index."""
+    plan = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    return [
+        detail for *_, detail in plan
+        if detail.startswith("SCAN ") and not any(tag in detail for tag in _INDEXED)
+        and not detail.startswith("SCAN CONSTANT ROW") and not _FTS_MATCH.search(detail)
+        and not _SUBQUERY.match(detail)
+    ]
+
+
+def capture_statements(db, name, args):
+    """Run db.<name>(*args) and return the SQL statements it executed."""
+    conn = db.get_connection()
+    statements = []
+
+    def _trace(sql):
+        if sql.lstrip().upper().startswith(_QUERY_VERBS):
+            statements.append(sql)
+
+    conn.set_trace_callback(_trace)
+    try:
+        with db.transaction():
+            result = getattr(db, name)(*args)
+            if hasattr(result, "__next__"):  # generators run lazily
+                for _ in result:
+                    pass
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        conn.set_trace_callback(None)
+    return statements
+
+
+def public_methods():
+    return sorted(
+        name for name in dir(DBManager)
+        if not name.startswith("_") and callable(getattr(DBManager, name)) and name not in SKIP
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2_000)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    db = build_database(temp_db_path(), work_orders=args.orders)
+    conn = db.get_connection()
+    failures = []
+
+    missing = [name for name in public_methods() if name not in CALLS]
+    for name in missing:
+        failures.append(f"{name}: no entry in CALLS")
+
+    for name, call_args in CALLS.items():
+        statements = capture_statements(db, name, call_args)
+        if not statements:
+            failures.append(f"{name}: ran no SQL")
+        for sql in statements:
+            scans = full_scans(conn, sql)
+            if args.verbose:
+                print(f"{name}: {' '.join(sql.split())[:100]}")
+                for *_, detail in conn.execute("EXPLAIN QUERY PLAN " + sql):
+                    print(f"    {detail}")
+            if scans and name not in ALLOWED_SCANS:
+                failures.append(f"{name}: {'; '.join(scans)}\n    {' '.join(sql.split())}")
+
+    if failures:
+        print("Query plan check FAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print(f"Query plan check passed ({len(CALLS)} methods).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
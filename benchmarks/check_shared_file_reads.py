@@ -0,0 +1,74 @@
+# benchmarks/check_shared_file_reads.py
+"""
+Checks that no paged read holds the database between pages under the
+rollback journal the app uses by default (SHARED_FILE_PRAGMAS): with each
+generator paused after its first page, another thread's write must go
+through at once instead of waiting out the busy timeout with "database is
+locked". Exits non-zero if any check fails.
+
+Run from the repository root:
+    python -m benchmarks.check_shared_file_reads
+"""
+import sys
+import threading
+import time
+
+from benchmarks.fixtures import build_database, temp_db_path
+from model.connection_pool import SHARED_FILE_PRAGMAS
+
+
+def _write_from_other_thread(db):
+    result = {}
+
+    def write():
+        start = time.perf_counter()
+        try:
+            db.update_work_order_notes(1, "written while a read was paused")
+            result["error"] = None
+        except Exception as e:
+            result["error"] = e
+        result["ms"] = (time.perf_counter() - start) * 1000
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    thread.join()
+    return result
+
+
+def _check(failures, name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    failures = []
+    db = build_database(temp_db_path("shared.db"), work_orders=5_000, pragmas=SHARED_FILE_PRAGMAS)
+    readers = {
+        "export_work_orders": lambda: db.export_work_orders(page_size=100),
+        "export_work_order_parts": lambda: db.export_work_order_parts(page_size=100),
+        "export_mechanic_hours": lambda: db.export_mechanic_hours(page_size=100),
+        "export_customers": lambda: db.export_customers(page_size=10),
+        "export_vehicles": lambda: db.export_vehicles(page_size=10),
+        "iter_work_orders": lambda: db.iter_work_orders(page_size=100),
+        "iter_search_work_orders": lambda: db.iter_search_work_orders("issue", page_size=10),
+        "iter_search_vehicles": lambda: db.iter_search_vehicles("honda", page_size=10),
+    }
+    for name, open_reader in readers.items():
+        pages = open_reader()
+        first = next(pages, None)
+        result = _write_from_other_thread(db)
+        second = next(pages, None)
+        pages.close()
+        _check(failures, f"{name}: write goes through between pages",
+               first and second and result["error"] is None and result["ms"] < 1000, result)
+
+    if failures:
+        print(f"Shared-file read check FAILED ({len(failures)}).")
+        return 1
+    print("Shared-file read check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
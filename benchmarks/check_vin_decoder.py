@@ -0,0 +1,212 @@
+# benchmarks/check_vin_decoder.py
+"""
+Checks helpers/vin_decoder.VinDecoder against a local HTTP stub of vPIC's
+DecodeVINValuesBatch endpoint:
+  - cached VINs never reach the network
+  - misses go out in chunks of at most CHUNK_SIZE
+  - answers are written back to vin_cache
+  - unknown VINs are cached as blanks, for NEGATIVE_TTL
+  - a failed chunk keeps the chunks before it
+  - the in-memory LRU, TTL expiry and stale fallback of VinCache
+  - pre-warming from a VIN list file
+  - offline decoding (helpers/vin_offline) with and without vPIC, and when
+    vPIC answers with something other than its JSON
+
+It also times a 200-vehicle fleet decoded one VIN per request vs. in
+batches, with LATENCY_MS added to every stub response. Exits non-zero if
+any check fails.
+
+Run from the repository root:
+    python -m benchmarks.check_vin_decoder
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from benchmarks.fixtures import temp_db_path
+from helpers import vin_offline
+from helpers.vin_decoder import VinCache, VinDecoder
+from model.db_manager import DBManager
+
+LATENCY_MS = 30
+MAKES = ["Toyota", "Honda", "Ford", "Chevrolet", "Subaru"]
+
+
+class VpicStub(BaseHTTPRequestHandler):
+    batches = []       # VIN count of each request received
+    fail_after = None  # answer 500 once this many requests have succeeded
+    html_error = False  # answer 200 with an HTML page instead of JSON
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        vins = form["data"][0].split(";")
+        time.sleep(LATENCY_MS / 1000)
+        if self.fail_after is not None and len(self.batches) >= self.fail_after:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.html_error:
+            body = b"<html><body>Service Unavailable</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        type(self).batches.append(len(vins))
+        results = []
+        for vin in vins:
+            # VINs starting with "X" are unknown to the stub, like a typo'd VIN.
+            known = not vin.startswith("X")
+            results.append({
+                "VIN": vin,
+                "Make": MAKES[len(vin) % len(MAKES)] if known else "",
+                "Model": f"Model {vin[-3:]}" if known else "",
+                "ModelYear": str(2000 + sum(map(ord, vin)) % 25) if known else "",
+                "ErrorCode": "0" if known else "1",
+            })
+        body = json.dumps({"Count": len(results), "Results": results}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _vins(n, prefix="1"):
+    return [f"{prefix}{i:016d}" for i in range(n)]
+
+
+def _check(failures, name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        failures.append(name)
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), VpicStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/vehicles/DecodeVINValuesBatch/"
+    failures = []
+
+    db = DBManager(temp_db_path("vin.db"))
+    decoder = VinDecoder(db=db, url=url)
+    fleet = _vins(120)
+    db.cache_vins([(vin, "Cached", "Car", "1999") for vin in fleet[:10]])
+
+    results = decoder.decode(fleet + [fleet[20].lower(), " " + fleet[21] + " ", "", "X0000000000000001"])
+    _check(failures, "misses sent in chunks of 50", VpicStub.batches == [50, 50, 11], VpicStub.batches)
+    _check(failures, "every VIN answered", len(results) == 121, len(results))
+    _check(failures, "cached VINs served from vin_cache",
+           all(results[vin] == ("Cached", "Car", "1999", True) for vin in fleet[:10]))
+    _check(failures, "decoded VINs marked uncached", results[fleet[50]][3] is False and results[fleet[50]][0])
+    _check(failures, "decoded VINs written back", len(db.get_cached_vins(fleet)) == 120)
+    _check(failures, "unknown VIN decodes blank and is cached as such",
+           results["X0000000000000001"] == ("", "", "", False)
+           and db.get_cached_vins(["X0000000000000001"])["X0000000000000001"][:3] == ("", "", ""))
+
+    VpicStub.batches.clear()
+    decoder.cache.stats.clear()
+    again = decoder.decode(fleet + ["X0000000000000001"])
+    _check(failures, "second pass needs no requests", not VpicStub.batches and all(r[3] for r in again.values()))
+    _check(failures, "second pass served from memory",
+           decoder.cache.stats == {"memory_hits": 121}, dict(decoder.cache.stats))
+
+    cold = VinDecoder(url=url, cache=VinCache(db, size=50))
+    cold.decode(fleet)
+    _check(failures, "new process reads through to vin_cache",
+           cold.cache.stats == {"db_hits": 120} and not VpicStub.batches, dict(cold.cache.stats))
+    _check(failures, "LRU holds at most size entries", len(cold.cache._entries) == 50)
+
+    negative = VinDecoder(url=url, cache=VinCache(db, negative_ttl=timedelta(0)))
+    negative.decode(fleet + ["X0000000000000001"])
+    _check(failures, "negative entries expire on their own TTL",
+           VpicStub.batches == [1] and negative.cache.stats["expired"] == 1, VpicStub.batches)
+
+    expired = VinDecoder(url=url, cache=VinCache(db, ttl=timedelta(0)))
+    VpicStub.batches.clear()
+    expired.decode(fleet[:10])
+    _check(failures, "expired entries are decoded again", VpicStub.batches == [10], VpicStub.batches)
+    expired = VinDecoder(url=url, cache=VinCache(db, ttl=timedelta(0)))
+    VpicStub.fail_after = 0
+    stale = expired.decode(fleet[:10])
+    VpicStub.fail_after = None
+    _check(failures, "stale answers used when vPIC is unreachable",
+           len(stale) == 10 and all(r[0] and r[3] for r in stale.values()))
+
+    more = _vins(120, prefix="2")
+    VpicStub.batches.clear()
+    VpicStub.fail_after = 1
+    try:
+        decoder.decode(more)
+        _check(failures, "HTTP error raised", False)
+    except Exception:
+        _check(failures, "HTTP error raised", True)
+    VpicStub.fail_after = None
+    _check(failures, "chunks before the failure stay cached", len(db.get_cached_vins(more)) == 50)
+
+    listing = os.path.join(os.path.dirname(temp_db_path()), "fleet.txt")
+    with open(listing, "w") as f:
+        f.write("# fleet onboarding\n" + "\n".join(f"{vin},unit {i}" for i, vin in enumerate(_vins(60, "4"))) + "\n\n")
+    VpicStub.batches.clear()
+    warmed = decoder.prewarm(listing)
+    _check(failures, "pre-warm decodes a VIN list file", warmed == 60 and VpicStub.batches == [50, 10],
+           (warmed, VpicStub.batches))
+
+    real = ["1HGCM82633A004352", "1M8GDM9AXKP042788", "5YJ3E1EA2KF317000", "WVWZZZ1JZXW000001"]
+    _check(failures, "check digits",
+           [vin_offline.check_digit_ok(vin) for vin in real] == [True, True, True, False]
+           and not vin_offline.check_digit_ok("1HGCM82633A004353"))
+    _check(failures, "make from WMI, year from position 10",
+           [vin_offline.decode(vin) for vin in real]
+           == [("Honda", "", "2003"), ("", "", "1989"), ("Tesla", "", "2019"), ("Volkswagen", "", "1999")],
+           [vin_offline.decode(vin) for vin in real])
+    VpicStub.batches.clear()
+    offline_db = DBManager(temp_db_path("vin_offline.db"))
+    offline = VinDecoder(db=offline_db, url=url, online=False).decode(real)
+    _check(failures, "offline decoder fills vin_cache without the network",
+           not VpicStub.batches and offline["1HGCM82633A004352"] == ("Honda", "", "2003", False)
+           and len(offline_db.get_cached_vins(real)) == 4, VpicStub.batches)
+    VpicStub.fail_after = 0
+    unreachable = VinDecoder(db=DBManager(temp_db_path("vin_down.db")), url=url).decode(real[:1] + real[2:])
+    VpicStub.fail_after = None
+    _check(failures, "vPIC down falls back to offline answers",
+           unreachable["5YJ3E1EA2KF317000"] == ("Tesla", "", "2019", False), unreachable)
+    VpicStub.html_error = True
+    garbled = VinDecoder(db=DBManager(temp_db_path("vin_html.db")), url=url).decode(real[:1] + real[2:])
+    VpicStub.html_error = False
+    _check(failures, "non-JSON answer falls back to offline answers",
+           garbled["5YJ3E1EA2KF317000"] == ("Tesla", "", "2019", False), garbled)
+    enriched = VinDecoder(db=offline_db, url=url, cache=VinCache(offline_db, negative_ttl=timedelta(0)))
+    _check(failures, "offline answers are enriched online later",
+           all(r[1] for r in enriched.decode(real).values()) and VpicStub.batches == [4], VpicStub.batches)
+
+    fleet = _vins(200, prefix="3")
+    start = time.perf_counter()
+    for vin in fleet:
+        decoder._decode_batch([vin])
+    one_by_one = time.perf_counter() - start
+    start = time.perf_counter()
+    decoder.decode(fleet)
+    batched = time.perf_counter() - start
+    print(f"\n200 VINs at {LATENCY_MS} ms per round trip: one per request {one_by_one * 1000:.0f} ms, "
+          f"batched {batched * 1000:.0f} ms")
+
+    server.shutdown()
+    if failures:
+        print(f"VIN decoder check FAILED ({len(failures)}).")
+        return 1
+    print("VIN decoder check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
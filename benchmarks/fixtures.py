@@ -0,0 +1,95 @@
+# benchmarks/fixtures.py
+"""Synthetic shop databases shared by the benchmark scripts."""
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from model.db_manager import DBManager
+
+MAKES = [
+    ("Toyota", ["Corolla", "Camry", "Tacoma", "RAV4"]),
+    ("Honda", ["Civic", "Accord", "CR-V", "Pilot"]),
+    ("Ford", ["F-150", "Escape", "Focus", "Ranger"]),
+    ("Chevrolet", ["Silverado", "Malibu", "Equinox", "Cruze"]),
+    ("Subaru", ["Outback", "Forester", "Impreza", "Crosstrek"]),
+]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Chris", "Morgan", "Casey", "Jamie", "Robin", "Drew"]
+LAST_NAMES = ["Smith", "Nguyen", "Garcia", "Brown", "Wilson", "Martin", "Lee", "Clark", "Lewis", "Young"]
+STATUSES = ["Scheduled", "In Progress", "Complete", "Complete", "Complete"]
+PARTS = ["Oil filter", "Brake pads", "Air filter", "Spark plug", "Wiper blade", "Battery", "Rotor"]
+MECHANICS = ["Dave", "Priya", "Luis", "Kim"]
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+
+
+def temp_db_path(name="bench.db"):
+    return os.path.join(tempfile.mkdtemp(prefix="rtf_bench_"), name)
+
+
+def build_database(db_path, work_orders=100_000, customers=None, vehicles=None,
+                   parts_per_order=2, hours_per_order=1, seed=42, pragmas=None):
+    """
+    Fill db_path with a synthetic shop history. Customers and vehicles scale
+    with the number of work orders unless given explicitly.
+    """
+    rnd = random.Random(seed)
+    customers = customers or max(1, work_orders // 20)
+    vehicles = vehicles or max(1, work_orders // 10)
+    db = DBManager(db_path, pragmas)
+    start = datetime(2020, 1, 1)
+
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO customers (first_name, last_name, phone, email) VALUES (?, ?, ?, ?)",
+            ((rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES), f"555-{i:07d}", f"cust{i}@example.com")
+             for i in range(customers)),
+        )
+
+        def _vehicle(i):
+            make, models = rnd.choice(MAKES)
+            vin = "".join(rnd.choice(VIN_CHARS) for _ in range(17))
+            return (rnd.randint(1, customers), make, rnd.choice(models),
+                    str(rnd.randint(1998, 2025)), vin, rnd.randint(0, 300_000))
+
+        conn.executemany(
+            "INSERT INTO vehicles (customer_id, make, model, year, vin, odometer_km) VALUES (?, ?, ?, ?, ?, ?)",
+            (_vehicle(i) for i in range(vehicles)),
+        )
+
+        def _order(i):
+            created = start + timedelta(minutes=i * 15 + rnd.randint(0, 14))
+            status = rnd.choice(STATUSES)
+            completed = created + timedelta(hours=rnd.randint(1, 48)) if status == "Complete" else None
+            return (rnd.randint(1, vehicles), f"Customer states:\n- issue {i % 97}",
+                    f"Technician notes for order {i}", status, created.strftime("%Y-%m-%d %H:%M:%S"),
+                    completed and completed.strftime("%Y-%m-%d %H:%M:%S"), 65.0)
+
+        conn.executemany(
+            "INSERT INTO work_orders (vehicle_id, issue, notes, status, created_at, completed_at, rate)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_order(i) for i in range(work_orders)),
+        )
+
+        def _parts():
+            for order_id in range(1, work_orders + 1):
+                for _ in range(parts_per_order):
+                    qty = rnd.randint(1, 4)
+                    price = round(rnd.uniform(5, 250), 2)
+                    yield order_id, rnd.choice(PARTS), qty, price, round(qty * price, 2)
+
+        conn.executemany(
+            "INSERT INTO work_order_parts (work_order_id, part_name, quantity, unit_price, cost) VALUES (?, ?, ?, ?, ?)",
+            _parts(),
+        )
+
+        def _hours():
+            for order_id in range(1, work_orders + 1):
+                day = (start + timedelta(minutes=order_id * 15)).date().isoformat()
+                for _ in range(hours_per_order):
+                    yield order_id, rnd.choice(MECHANICS), round(rnd.uniform(0.25, 6), 2), day
+
+        conn.executemany(
+            "INSERT INTO mechanic_hours (work_order_id, mechanic, hours, date) VALUES (?, ?, ?, ?)",
+            _hours(),
+        )
+    return db
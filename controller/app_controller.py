@@ -2,16 +2,40 @@ import os
 SESSION_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "session.json"))
 import json
 import tkinter as tk
+from collections import Counter, OrderedDict
 from view.login_frame import LoginFrame
 from tkinter import ttk, messagebox
 from view.base_frame import BaseFrame
 from model.db_manager import DBManager
 from view.dashboard_frame import DashboardFrame  # Ensure this is loaded here to avoid circular import
+from helpers.change_feed import ChangeFeed
+from helpers.task_executor import TaskExecutor
+from helpers.vin_decoder import VinDecoder
+
+def _frame_key(frame_class, args, kwargs):
+    return frame_class, args, tuple(sorted(kwargs.items()))
+
+
+def _count_widgets(widget):
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
 
 class AppController:
+    # Frames kept alive (hidden) for quick return; the least recently shown
+    # beyond this are destroyed. Every work order or history opened is its
+    # own frame, so this bounds the widget count over a long shift.
+    MAX_FRAMES = 8
+
     def __init__(self, root):
         self.root = root
-        self.frames = {}
+        self.frames = OrderedDict()  # (class, args, kwargs) -> frame, least recently shown first
+        self.frame_stats = Counter()  # created, reused, evicted
+        self.current_frame = None
+        # Shared by all frames for DB/network work that must not block the UI.
+        self.executor = TaskExecutor(root)
+        self.vin_decoder = VinDecoder(self.executor)
+        # Other terminals' writes, published on the change bus like our own.
+        self.change_feed = ChangeFeed(root)
 
         # Auto-login if session file exists
         if os.path.exists(SESSION_FILE):
@@ -20,8 +44,6 @@ class AppController:
                 with open(SESSION_FILE) as f:
                     session = json.load(f)
                     self.user_id = session["user"]
-                if LoginFrame in self.frames:
-                    del self.frames[LoginFrame]
                 self.show_frame(DashboardFrame)
                 return
             except Exception as e:
@@ -31,19 +53,26 @@ class AppController:
 
     def show_frame(self, frame_class, *args, **kwargs):
         """
-        Instantiate and raise frame_class(self.root, self, *args, **kwargs).
+        Raise frame_class(self.root, self, *args, **kwargs) and return it (None
+        if it failed to load). Frames are cached by class and arguments, so
+        HistoryFrame for one customer is not reused for another.
         """
-        if frame_class not in self.frames:
+        key = _frame_key(frame_class, args, kwargs)
+        created = key not in self.frames
+        if not created:
+            self.frame_stats["reused"] += 1
+        else:
             try:
                 # Pass along any positional or keyword args (e.g. mode, entity_id)
                 frame = frame_class(self.root, self, *args, **kwargs)
-                self.frames[frame_class] = frame
                 frame.place(x=0, y=0, relwidth=1, relheight=1)
 
                 # Only run setup_ui once per frame instance
                 if not hasattr(frame, "ui_initialized"):
                     frame.setup_ui()
                     frame.ui_initialized = True
+                self.frames[key] = frame
+                self.frame_stats["created"] += 1
 
             except Exception:
                 import traceback
@@ -51,17 +80,50 @@ class AppController:
                 print(f"[ERROR] Failed to load frame: {frame_class.__name__}")
                 return
 
-        # Raise the frame
-        frame = self.frames[frame_class]
+        # Raise the frame; the one it covers stops its timers
+        self.frames.move_to_end(key)
+        frame = self.frames[key]
+        previous, self.current_frame = self.current_frame, frame
+        if previous is not frame and hasattr(previous, "on_hide"):
+            previous.on_hide()
         frame.tkraise()
+        if previous is not frame and hasattr(frame, "on_show"):
+            frame.on_show()
 
-        # If the frame has a refresh_data method, call it
-        if hasattr(frame, "refresh_data") and callable(frame.refresh_data):
+        # If the frame has a refresh_data method, call it. Frames that watch
+        # the change bus already caught up in on_show, once first loaded.
+        if (created or not getattr(frame, "watching", False)) and callable(getattr(frame, "refresh_data", None)):
             try:
                 frame.refresh_data()
             except Exception as e:
                 print("[Frame Refresh Error]", e)
 
+        self._evict()
+        return frame
+
+    def _evict(self):
+        """
+        Destroy the least recently shown frames beyond MAX_FRAMES, skipping
+        the current one and any whose can_evict() says it holds unsaved work.
+        """
+        for key, frame in list(self.frames.items()):
+            if len(self.frames) <= self.MAX_FRAMES:
+                break
+            if frame is self.current_frame or not getattr(frame, "can_evict", lambda: True)():
+                continue
+            del self.frames[key]
+            frame.destroy()
+            self.frame_stats["evicted"] += 1
+
+    def widget_counts(self):
+        """Live widgets per cached frame, by frame name, plus "total" for the whole window (popups included)."""
+        counts = {
+            f"{cls.__name__}{args or ''}{dict(kwargs) if kwargs else ''}": _count_widgets(frame)
+            for (cls, args, kwargs), frame in self.frames.items()
+        }
+        counts["total"] = _count_widgets(self.root)
+        return counts
+
     def logout(self):
         if os.path.exists(SESSION_FILE):
             print("[LOGOUT] Removing session file:", SESSION_FILE)
@@ -0,0 +1,148 @@
+# helpers/calendar_cache.py
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser
+
+from model.db_manager import DBManager
+
+
+def to_utc(value):
+    """
+    ISO-8601 UTC string ("YYYY-MM-DDTHH:MM:SSZ") for a datetime, date or
+    ISO string. Naive values and all-day dates are taken as UTC.
+    """
+    if isinstance(value, str):
+        value = parser.isoparse(value)
+    if not isinstance(value, datetime):  # an all-day date
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _event_bounds(event):
+    start = event.get("start", {})
+    end = event.get("end", start)
+    start_utc = to_utc(start.get("dateTime") or start.get("date"))
+    end_utc = to_utc(end.get("dateTime") or end.get("date") or start_utc)
+    return start_utc, max(start_utc, end_utc)
+
+
+def _is_gone(error):
+    # googleapiclient.errors.HttpError carries the response as .resp; checked
+    # by attribute so this module does not need the client library.
+    return getattr(getattr(error, "resp", None), "status", None) == 410
+
+
+class CalendarCache:
+    """
+    SQLite copy of one Google Calendar, kept current with sync tokens.
+
+    sync() pulls only what changed since the last sync (a full download of
+    the last FULL_SYNC_DAYS the first time, or when Google expires the token
+    with 410 Gone). events_between() never touches the network, so the
+    calendar screens keep working offline with the last-synced data; ranges
+    older than the cache keeps (see covers()) need fetch_between() and a
+    connection. `service` is anything shaped like the object returned by
+    google_calendar_helper.get_service(); it may be set later.
+    """
+
+    PAGE_SIZE = 250
+    # A full sync fetches events ending after this many days ago; the
+    # screens mostly show recent weeks, and fetch_between() serves older ones.
+    FULL_SYNC_DAYS = 90
+    _sync_lock = threading.Lock()  # the client's transport is not thread-safe, and the service is shared
+
+    def __init__(self, service=None, db=None, calendar_id="primary"):
+        self.service = service
+        self.db = db or DBManager()
+        self.calendar_id = calendar_id
+
+    def events_between(self, time_min, time_max, max_results=None):
+        """Cached events overlapping [time_min, time_max), as API event dicts by start time."""
+        rows = self.db.get_calendar_events(
+            self.calendar_id, to_utc(time_min), to_utc(time_max), max_results or -1
+        )
+        return [json.loads(data) for data in rows]
+
+    def covers(self, time_min):
+        """True if the cache holds every event from time_min on (it keeps the last FULL_SYNC_DAYS)."""
+        return to_utc(time_min) >= self._window_start()
+
+    def fetch_between(self, time_min, time_max, max_results=None):
+        """
+        Events overlapping [time_min, time_max) straight from Google, by
+        start time, for ranges older than the cache keeps. Not cached.
+        """
+        if self.service is None:
+            raise RuntimeError("Google Calendar service is not available")
+        events, page_token = [], None
+        with self._sync_lock:
+            while True:
+                params = {
+                    "calendarId": self.calendar_id, "singleEvents": True, "orderBy": "startTime",
+                    "timeMin": to_utc(time_min), "timeMax": to_utc(time_max),
+                    "maxResults": min(max_results or self.PAGE_SIZE, self.PAGE_SIZE),
+                }
+                if page_token:
+                    params["pageToken"] = page_token
+                result = self.service.events().list(**params).execute()
+                events.extend(event for event in result.get("items", []) if event.get("status") != "cancelled")
+                page_token = result.get("nextPageToken")
+                if not page_token or (max_results and len(events) >= max_results):
+                    break
+        return events[:max_results] if max_results else events
+
+    def _window_start(self):
+        return to_utc(datetime.now(timezone.utc) - timedelta(days=self.FULL_SYNC_DAYS))
+
+    def last_synced(self):
+        state = self.db.get_calendar_sync_state(self.calendar_id)
+        return state[1] if state else None
+
+    def sync(self):
+        """Bring the cache up to date. Returns the number of events added, changed or removed."""
+        if self.service is None:
+            raise RuntimeError("Google Calendar service is not available")
+        with self._sync_lock:
+            state = self.db.get_calendar_sync_state(self.calendar_id)
+            token = state[0] if state else None
+            if token:
+                try:
+                    return self._pull(token)
+                except Exception as e:
+                    if not _is_gone(e):
+                        raise
+                    # Token expired: fall through to a full resync.
+            return self._pull(None)
+
+    def _pull(self, sync_token):
+        changed, deleted = [], []
+        page_token = None
+        while True:
+            params = {"calendarId": self.calendar_id, "singleEvents": True, "maxResults": self.PAGE_SIZE}
+            if sync_token:
+                params["syncToken"] = sync_token
+            else:
+                # Only on a full sync: Google rejects timeMin alongside a
+                # syncToken.
+                params["timeMin"] = self._window_start()
+            if page_token:
+                params["pageToken"] = page_token
+            result = self.service.events().list(**params).execute()
+            for event in result.get("items", []):
+                if event.get("status") == "cancelled":
+                    deleted.append(event["id"])
+                else:
+                    changed.append((event["id"], *_event_bounds(event), json.dumps(event)))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+        # Written only once every page is in, so a failed sync leaves the
+        # previous copy intact.
+        self.db.save_calendar_sync(
+            self.calendar_id, changed, deleted, result.get("nextSyncToken"), full=sync_token is None
+        )
+        return len(changed) + len(deleted)
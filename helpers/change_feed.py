@@ -0,0 +1,80 @@
+# helpers/change_feed.py
+from model import change_bus
+from model.change_bus import Change
+from model.db_manager import CHANGE_LOG_PAGE_SIZE, DBManager
+from model.migrations import CHANGE_LOG_TABLES
+
+
+class ChangeFeed:
+    """
+    Publishes writes committed by other terminals sharing the database file
+    on the change bus, so their screens update as if the write were local.
+
+    Triggers append every insert, update and delete on the watched tables to
+    change_log (migration 10). Each poll first checks PRAGMA data_version,
+    which moves whenever another connection commits and reads no table; only
+    then are the change_log rows after the last seen seq fetched. Rows this
+    process wrote were published when they committed and are skipped.
+
+    Runs on the Tk thread, so subscribers may touch widgets directly.
+    """
+
+    POLL_MS = 1000
+    # Days of change_log kept. Trimming by age never takes rows a running
+    # terminal has yet to read (it polls every second); one asleep for longer
+    # than this finds a gap and refreshes every watched table instead.
+    KEEP_DAYS = 7
+
+    def __init__(self, root, db=None):
+        self.root = root
+        self.db = db or DBManager()
+        self.db.trim_change_log(self.KEEP_DAYS)
+        self._data_version = self.db.get_data_version()
+        self.last_seq = self.db.get_change_log_seq()
+        self._after_id = None
+        self._closed = False
+        self._schedule()
+
+    def poll(self):
+        """Publish what other terminals committed since the last poll. Returns the changes."""
+        version = self.db.get_data_version()
+        if version == self._data_version:
+            return []
+        # Read the version before the rows: a commit landing in between is
+        # fetched now and merely triggers one more (empty) fetch next time.
+        self._data_version = version
+        changes = []
+        while True:
+            rows = self.db.get_changes_since(self.last_seq, CHANGE_LOG_PAGE_SIZE)
+            if not rows:
+                break
+            if rows[0][0] > self.last_seq + 1:
+                # Rows we never saw were trimmed; we cannot tell what changed.
+                changes.extend(Change(table, None, "update") for table in CHANGE_LOG_TABLES)
+            changes.extend(change for seq, change, local in rows if not local)
+            self.last_seq = rows[-1][0]
+            if len(rows) < CHANGE_LOG_PAGE_SIZE:
+                break
+        # A status change logs the order twice (completed_at follows it).
+        changes = list(dict.fromkeys(changes))
+        if changes:
+            change_bus.publish(changes)
+        return changes
+
+    def shutdown(self):
+        self._closed = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        if not self._closed:
+            self._after_id = self.root.after(self.POLL_MS, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.poll()
+        except Exception as e:
+            print("[Change Feed Error]", e)
+        self._schedule()
@@ -0,0 +1,71 @@
+# helpers/csv_export.py
+import csv
+import os
+from datetime import datetime
+
+from model.db_manager import DBManager
+
+EXPORT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "exports"))
+
+# name -> (DBManager generator, takes the work-order filters, header)
+EXPORTS = {
+    "work_orders": ("export_work_orders", True, [
+        "Work Order", "Created", "Status", "Customer", "Phone", "Make", "Model", "Year", "VIN",
+        "Odometer (KM)", "Issue", "Notes", "Rate", "Parts Total", "Hours", "Subtotal",
+    ]),
+    "parts": ("export_work_order_parts", True, [
+        "Part ID", "Work Order", "Part", "Quantity", "Unit Price", "Cost", "Added",
+    ]),
+    "mechanic_hours": ("export_mechanic_hours", True, [
+        "Entry ID", "Work Order", "Mechanic", "Hours", "Date",
+    ]),
+    "customers": ("export_customers", False, [
+        "Customer ID", "First Name", "Last Name", "Phone", "Email",
+    ]),
+    "vehicles": ("export_vehicles", False, [
+        "Vehicle ID", "Customer ID", "Owner", "Make", "Model", "Year", "VIN", "Odometer (KM)",
+    ]),
+}
+
+
+def write_csv(path, header, pages):
+    """
+    Write header and then each page of rows to path as they arrive. Returns
+    the number of rows. The file only appears once it is complete.
+    """
+    partial = path + ".part"
+    count = 0
+    try:
+        # utf-8-sig so Excel reads accented names correctly.
+        with open(partial, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for page in pages:
+                writer.writerows(page)
+                count += len(page)
+        os.replace(partial, path)
+    except BaseException:
+        # Failed or cancelled: leave no half-written file behind.
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return count
+
+
+def export_csv(names=tuple(EXPORTS), folder=EXPORT_DIR, status=None, start=None, end=None, db=None):
+    """
+    Export each of `names` (keys of EXPORTS) to "<name>-<timestamp>.csv" in
+    folder. status, start and end ("YYYY-MM-DD", inclusive) select the work
+    orders for the work-order, parts and hours files. Returns {name: (path,
+    rows)}. Blocks, so run it on a worker.
+    """
+    db = db or DBManager()
+    os.makedirs(folder, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    written = {}
+    for name in names:
+        method, filtered, header = EXPORTS[name]
+        pages = getattr(db, method)(status, start, end) if filtered else getattr(db, method)()
+        path = os.path.join(folder, f"{name}-{stamp}.csv")
+        written[name] = (path, write_csv(path, header, pages))
+    return written
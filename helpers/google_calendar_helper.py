@@ -1,11 +1,42 @@
 import os
 import pickle
+import threading
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+_service = None
+_building = False
+_service_lock = threading.Lock()  # guards the two globals above, never held while building
+
+
+def get_service():
+    """
+    Process-wide Calendar service, built on first use and shared after that.
+    The first call can take seconds (token refresh) or as long as the user
+    takes over the OAuth flow in a browser, so call it from a worker thread,
+    not the Tk thread. While one thread is building the service, other
+    callers get a RuntimeError at once rather than waiting on it.
+    """
+    global _service, _building
+    with _service_lock:
+        if _service is not None:
+            return _service
+        if _building:
+            raise RuntimeError("Google Calendar sign-in is still in progress")
+        _building = True
+    service = None
+    try:
+        service = build_service()
+        return service
+    finally:
+        with _service_lock:
+            _service = service
+            _building = False
+
+
 def build_service():
     """Authenticate and return Google Calendar API service."""
     creds = None
@@ -27,4 +58,6 @@ def build_service():
         with open(token_path, "wb") as token:
             pickle.dump(creds, token)
 
-    return build('calendar', 'v3', credentials=creds)
+    # The discovery document bundled with googleapiclient, rather than
+    # fetching it from Google on every start.
+    return build('calendar', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
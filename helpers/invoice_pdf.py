@@ -0,0 +1,289 @@
+# helpers/invoice_pdf.py
+"""
+Invoice PDFs for completed work orders, written directly as PDF 1.4 with the
+standard Helvetica fonts, so nothing beyond the standard library is needed.
+
+InvoiceTemplate lays out everything that is the same on every invoice (shop
+header, labels, table headings, rules) once, as ready-to-emit PDF bytes.
+Rendering an invoice then only formats its own values. render_invoices()
+spreads a batch over a process pool, where each worker builds the template
+once and reuses it.
+"""
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from model.db_manager import DBManager, local_day, utc_bounds
+
+SHOP_NAME = "RTF Auto"
+INVOICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "exports", "invoices"))
+
+# An invoice renders in well under a millisecond with a cached template, so
+# a day's batch is done in-process faster than worker processes can start
+# (~0.2 s). Only backfills of this many or more go to the pool.
+POOL_MIN = 2000
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, in points
+LEFT, RIGHT = 50, 562
+BOTTOM = 60
+FIRST_BODY_TOP = 560
+NEXT_BODY_TOP = 700
+ROW = 14
+# Table columns: description (left-aligned) then right edges of qty, rate, amount.
+QTY_X, RATE_X, AMOUNT_X = 400, 480, RIGHT
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard AFM.
+_WIDTHS = dict(zip(
+    map(chr, range(32, 127)),
+    (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+     556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+     1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+     667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+     333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+     556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584),
+))
+
+
+def _width(text, size):
+    return sum(_WIDTHS.get(ch, 556) for ch in text) * size / 1000
+
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text(x, y, text, size=10, font="F1"):
+    return f"BT /{font} {size} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET\n"
+
+
+def _right(x, y, text, size=10, font="F1"):
+    return _text(x - _width(text, size), y, text, size, font)
+
+
+def _rule(y, width=0.5):
+    return f"{width} w {LEFT} {y} m {RIGHT} {y} l S\n"
+
+
+def _fit(text, size, width):
+    """text cut with an ellipsis to fit width points."""
+    if _width(text, size) <= width:
+        return text
+    while text and _width(text + "…", size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def _wrap(text, size, width):
+    lines = []
+    for paragraph in str(text or "").splitlines() or [""]:
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and _width(candidate, size) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(_fit(line, size, width))
+    return lines
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+class InvoiceTemplate:
+    """The unchanging parts of an invoice, compiled to PDF bytes once."""
+
+    def __init__(self, shop_name=SHOP_NAME):
+        self.first_page = self._encode(
+            _text(LEFT, 740, shop_name, 22, "F2")
+            + _right(RIGHT, 740, "INVOICE", 22, "F2")
+            + _rule(725, 1)
+            + _text(LEFT, 700, "Bill To", 9, "F2")
+            + _text(300, 700, "Vehicle", 9, "F2")
+            + _text(430, 700, "Invoice #", 9, "F2")
+            + _text(430, 660, "Date", 9, "F2")
+            + self._table_heading(FIRST_BODY_TOP + 15)
+        )
+        self.next_page = self._encode(
+            _text(LEFT, 750, shop_name, 12, "F2")
+            + _right(RIGHT, 750, "INVOICE (continued)", 12, "F2")
+            + _rule(740, 1)
+        )
+        self.table_heading = self._encode(self._table_heading(NEXT_BODY_TOP + 15))
+        self.objects = [
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        self.page_dict = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {} 0 R >>"
+        )
+
+    @staticmethod
+    def _encode(ops):
+        return ops.encode("cp1252", "replace")
+
+    @staticmethod
+    def _table_heading(y):
+        return (
+            _text(LEFT, y, "Description", 9, "F2")
+            + _right(QTY_X, y, "Qty / Hrs", 9, "F2")
+            + _right(RATE_X, y, "Rate", 9, "F2")
+            + _right(AMOUNT_X, y, "Amount", 9, "F2")
+            + _rule(y - 5)
+        )
+
+    def render(self, invoice):
+        """PDF bytes for an invoice dict as returned by load_invoice()."""
+        return self._assemble(self._layout(invoice))
+
+    def _layout(self, invoice):
+        pages = [[self.first_page]]
+        page = pages[0]
+        name, phone, email = invoice["customer"]
+        vehicle, vin, odometer = invoice["vehicle"]
+        header = [
+            _text(LEFT, 686, _fit(name, 10, 240)),
+            _text(LEFT, 672, phone or ""),
+            _text(LEFT, 658, _fit(email or "", 10, 240)),
+            _text(300, 686, _fit(vehicle, 10, 125)),
+            _text(300, 672, vin or "", 9),
+            _text(300, 658, f"{odometer:,} km" if odometer else ""),
+            _text(430, 686, str(invoice["id"])),
+            _text(430, 646, invoice["date"]),
+        ]
+        page.append(self._encode("".join(header)))
+        y = FIRST_BODY_TOP
+
+        def line(ops, height=ROW, table=False):
+            nonlocal page, y
+            if y - height < BOTTOM:
+                page = [self.next_page] + ([self.table_heading] if table else [])
+                pages.append(page)
+                y = NEXT_BODY_TOP
+            y -= height
+            page.append(self._encode(ops(y)))
+
+        rate = invoice["rate"]
+        for part, quantity, unit_price, cost in invoice["parts"]:
+            line(lambda y: _text(LEFT, y, _fit(part, 10, QTY_X - LEFT - 60)) + _right(QTY_X, y, str(quantity))
+                 + _right(RATE_X, y, _money(unit_price)) + _right(AMOUNT_X, y, _money(cost)), table=True)
+        for mechanic, hours, worked in invoice["hours"]:
+            label = _fit(f"Labor – {mechanic} ({worked})", 10, QTY_X - LEFT - 60)
+            line(lambda y: _text(LEFT, y, label) + _right(QTY_X, y, f"{hours:g}")
+                 + _right(RATE_X, y, _money(rate)) + _right(AMOUNT_X, y, _money(hours * rate)), table=True)
+
+        parts_total, total_hours, labor_total, subtotal = invoice["totals"]
+        line(lambda y: _rule(y + ROW - 4), height=6)
+        for label, amount, font in (
+            ("Parts", parts_total, "F1"),
+            (f"Labor ({total_hours:g} h @ {_money(rate)})", labor_total, "F1"),
+            ("Total", subtotal, "F2"),
+        ):
+            line(lambda y: _right(RATE_X, y, label, 10, font) + _right(AMOUNT_X, y, _money(amount), 10, font))
+
+        for title, body in (("Customer concern", invoice["issue"]), ("Work performed", invoice["notes"])):
+            if not (body or "").strip():
+                continue
+            line(lambda y: _text(LEFT, y, title, 10, "F2"), height=ROW * 2)
+            for text in _wrap(body, 9, RIGHT - LEFT):
+                line(lambda y: _text(LEFT, y, text, 9), height=12)
+
+        count = len(pages)
+        for number, page in enumerate(pages, 1):
+            page.append(self._encode(_right(RIGHT, 35, f"Page {number} of {count}", 8)))
+        return [b"".join(page) for page in pages]
+
+    def _assemble(self, contents):
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+
+        def add(body):
+            offsets.append(len(out))
+            out.extend(b"%d 0 obj\n" % len(offsets))
+            out.extend(body)
+            out.extend(b"\nendobj\n")
+
+        first_page = 3 + len(self.objects)
+        kids = " ".join(f"{first_page + 2 * i} 0 R" for i in range(len(contents)))
+        add(b"<< /Type /Catalog /Pages 2 0 R >>")
+        add(f"<< /Type /Pages /Kids [{kids}] /Count {len(contents)} >>".encode())
+        for body in self.objects:
+            add(body)
+        for content in contents:
+            add(self.page_dict.format(len(offsets) + 2).encode())
+            add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+        xref = len(out)
+        out.extend(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        out.extend(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+        out.extend(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets) + 1, xref))
+        return bytes(out)
+
+
+@functools.lru_cache(maxsize=None)
+def get_template():
+    """This process's InvoiceTemplate, built on first use."""
+    return InvoiceTemplate()
+
+
+def load_invoice(db, work_order_id):
+    """Everything an invoice shows, as plain (picklable) values; None if the order doesn't exist."""
+    detail = db.get_work_order_detail(work_order_id)
+    if detail is None:
+        return None
+    (wo_id, created_at, completed_at, _status, issue, notes, rate,
+     name, phone, email, make, model, year, vin, odometer) = detail
+    totals = db.get_work_order_totals(work_order_id) or (0.0, 0.0, 0.0, 0.0)
+    stamp = completed_at or created_at  # UTC
+    return {
+        "id": wo_id,
+        "date": local_day(stamp) if stamp else date.today().isoformat(),
+        "customer": (name, phone, email),
+        "vehicle": (" ".join(str(v) for v in (year, make, model) if v), vin, odometer),
+        "issue": issue,
+        "notes": notes,
+        "rate": float(rate or 0),
+        "parts": [
+            (part, quantity, float(unit_price or 0), float(cost or 0))
+            for _id, part, quantity, unit_price, cost, _added in db.get_parts_for_work_order(work_order_id)
+        ],
+        "hours": [(mechanic, float(hours or 0), worked) for _id, mechanic, hours, worked in db.get_mechanic_hours(work_order_id)],
+        "totals": tuple(float(t) for t in totals),
+    }
+
+
+def _write_invoice(job):
+    invoice, path = job
+    data = get_template().render(invoice)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def render_invoices(invoices, folder=INVOICE_DIR, processes=None):
+    """
+    Write each invoice dict to folder/invoice-<id>.pdf and return the paths.
+    Batches of POOL_MIN or more are spread over a process pool (processes
+    workers, default one per CPU); processes=1 keeps everything in-process.
+    """
+    os.makedirs(folder, exist_ok=True)
+    jobs = [(invoice, os.path.join(folder, f"invoice-{invoice['id']}.pdf")) for invoice in invoices]
+    if processes == 1 or len(jobs) < POOL_MIN:
+        return [_write_invoice(job) for job in jobs]
+    # spawn: the app forks from a process with Tk and worker threads running.
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_write_invoice, jobs, chunksize=4))
+
+
+def render_day(day=None, folder=INVOICE_DIR, db=None, processes=None):
+    """Invoices for every order completed on `day` (local time, default today). Returns the paths."""
+    db = db or DBManager()
+    ids = db.get_work_orders_completed_between(*utc_bounds(day or date.today()))
+    invoices = (load_invoice(db, wo_id) for wo_id in ids)
+    # An order deleted since the list was read is skipped.
+    return render_invoices([invoice for invoice in invoices if invoice is not None], folder, processes)
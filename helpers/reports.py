@@ -0,0 +1,128 @@
+# helpers/reports.py
+import threading
+import time
+from datetime import date, timedelta
+
+from model import change_bus
+from model.db_manager import DBManager, utc_bounds
+
+HOURS_PER_DAY = 8  # bookable hours per mechanic per weekday, for utilization
+
+
+def this_week(today=None):
+    today = today or date.today()
+    monday = today - timedelta(days=today.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def last_week(today=None):
+    monday, _ = this_week(today)
+    return monday - timedelta(days=7), monday - timedelta(days=1)
+
+
+def this_month(today=None):
+    today = today or date.today()
+    first = today.replace(day=1)
+    return first, (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def last_month(today=None):
+    first, _ = this_month(today)
+    return this_month(first - timedelta(days=1))
+
+
+PERIODS = {
+    "This week": this_week,
+    "Last week": last_week,
+    "This month": this_month,
+    "Last month": last_month,
+}
+
+
+def _weekdays(first, last):
+    days = (last - first).days + 1
+    full_weeks, rest = divmod(days, 7)
+    return full_weeks * 5 + sum((first.weekday() + i) % 7 < 5 for i in range(rest))
+
+
+def build_report(first, last, db=None, top_parts=10):
+    """
+    Everything the reports screen shows for the local days first..last
+    (inclusive). Each section is one grouped query; nothing is summed in
+    Python beyond the utilization ratio.
+    """
+    db = db or DBManager()
+    start, end = utc_bounds(first, last)
+    orders, revenue, average, largest, parts, labor, hours = db.report_ticket_summary(start, end)
+    available = _weekdays(first, last) * HOURS_PER_DAY
+    mechanics = [
+        (name, worked, orders_worked, share, worked / available if available else None)
+        for name, worked, orders_worked, share in db.report_mechanic_hours(first.isoformat(), last.isoformat())
+    ]
+    return {
+        "first": first,
+        "last": last,
+        "summary": {
+            "orders": orders, "revenue": revenue, "average_ticket": average, "largest_ticket": largest,
+            "parts": parts, "labor": labor, "hours_billed": hours,
+        },
+        "revenue_by_day": db.report_revenue_by_day(start, end),
+        "mechanics": mechanics,  # (name, hours, orders, share of hours, utilization)
+        "top_parts": db.report_top_parts(start, end, top_parts),
+    }
+
+
+class ReportCache:
+    """
+    build_report() results keyed by date range. The shared cache is dropped
+    whenever a write to a table the reports read is published on the change
+    bus (other terminals' writes arrive there through the change feed while
+    the app runs); entries also expire after TTL seconds.
+    """
+
+    TTL = 300
+    SIZE = 32
+
+    def __init__(self, db=None, ttl=TTL, size=SIZE):
+        self.db = db
+        self.ttl = ttl
+        self.size = size
+        self._entries = {}  # (first, last) -> (built_at, report)
+        self._generation = 0  # bumped by invalidate()
+        self._lock = threading.Lock()  # reports are built on worker threads
+
+    def get(self, first, last, refresh=False):
+        key = (first, last)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry and not refresh and now - entry[0] < self.ttl:
+            return entry[1]
+        report = build_report(first, last, self.db)
+        with self._lock:
+            # Not kept if a write landed while it was being built.
+            if generation != self._generation:
+                return report
+            self._entries[key] = (now, report)
+            if len(self._entries) > self.size:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+        return report
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+_cache = ReportCache()
+change_bus.subscribe(("work_orders", "work_order_parts", "mechanic_hours"), lambda changes: _cache.invalidate())
+
+
+def get_report(first, last, refresh=False):
+    """Cached build_report() for the local days first..last."""
+    return _cache.get(first, last, refresh)
+
+
+def invalidate():
+    _cache.invalidate()
@@ -0,0 +1,168 @@
+# helpers/task_executor.py
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    """Handle for a submitted job. Callbacks never run once it is cancelled."""
+
+    def __init__(self, executor, key, on_done=None, on_error=None, on_item=None):
+        self._executor = executor
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_item = on_item
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        # A running job can't be interrupted; its result is just dropped.
+        if self.future is not None and self.future.cancel():
+            self._executor._settle()
+        self._executor._forget(self)
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class TaskExecutor:
+    """
+    Runs slow DB/network calls on a thread pool and hands results back on the
+    Tk thread.
+
+    Workers never touch widgets: they put (task, kind, value) on a queue that
+    the Tk thread drains with after(), and only then are on_item / on_done /
+    on_error called. Submitting with a key cancels the previous task for that key, so
+    only the latest request's result is ever delivered.
+    """
+
+    POLL_MS = 25
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rtf-task")
+        self._results = queue.SimpleQueue()
+        self._latest = {}  # key -> Task
+        self._pending = 0  # submitted and not yet drained; only touched on the Tk thread
+        self._after_id = None
+        self._closed = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a worker. on_done(result) or on_error(exc)
+        is called on the Tk thread unless the task was cancelled or superseded.
+        Must be called from the Tk thread.
+        """
+        return self._start(self._run, Task(self, key, on_done, on_error), fn, args, kwargs)
+
+    def submit_iter(self, fn, *args, on_item=None, on_done=None, on_error=None, key=None, **kwargs):
+        """
+        Like submit(), for an fn that returns an iterable: each item is passed
+        to on_item(item) on the Tk thread as soon as the worker produces it,
+        then on_done(None). A cancelled task stops iterating at the next item.
+        """
+        task = Task(self, key, on_done, on_error, on_item)
+        return self._start(self._run_iter, task, fn, args, kwargs)
+
+    def cancel(self, key):
+        """Cancel the outstanding task for key, if any."""
+        task = self._latest.get(key)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self):
+        self._closed = True
+        for task in list(self._latest.values()):
+            task.cancel()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # —— internals ——
+    def _start(self, runner, task, fn, args, kwargs):
+        if self._closed:
+            raise RuntimeError("TaskExecutor has been shut down")
+        if task.key is not None:
+            previous = self._latest.get(task.key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[task.key] = task
+        self._pending += 1
+        task.future = self._pool.submit(runner, task, fn, args, kwargs)
+        self._schedule()
+        return task
+
+    def _run(self, task, fn, args, kwargs):
+        if task.cancelled:
+            self._results.put((task, "done", None))
+            return
+        try:
+            self._results.put((task, "done", fn(*args, **kwargs)))
+        except BaseException as e:
+            self._results.put((task, "error", e))
+
+    def _run_iter(self, task, fn, args, kwargs):
+        try:
+            if not task.cancelled:
+                items = iter(fn(*args, **kwargs))
+                try:
+                    for item in items:
+                        if task.cancelled:
+                            break
+                        self._results.put((task, "item", item))
+                finally:
+                    close = getattr(items, "close", None)
+                    if close:
+                        close()  # release e.g. an open cursor when stopping early
+            self._results.put((task, "done", None))
+        except BaseException as e:
+            self._results.put((task, "error", e))
+
+    def _settle(self):
+        self._pending -= 1
+
+    def _forget(self, task):
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+
+    def _schedule(self):
+        # Poll only while something is outstanding; an idle app wakes up for nothing.
+        if self._after_id is None and not self._closed:
+            self._after_id = self.root.after(self.POLL_MS, self._drain)
+
+    def _drain(self):
+        self._after_id = None
+        while True:
+            try:
+                task, kind, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if kind != "item":
+                self._settle()
+            self._deliver(task, kind, value)
+        if self._pending:
+            self._schedule()
+
+    def _deliver(self, task, kind, value):
+        if task.cancelled:
+            return
+        if kind != "item":
+            self._forget(task)
+        try:
+            if kind == "item":
+                if task.on_item:
+                    task.on_item(value)
+            elif kind == "done":
+                if task.on_done:
+                    task.on_done(value)
+            elif task.on_error:
+                task.on_error(value)
+            else:
+                print("[Task Error]", "".join(traceback.format_exception(value)).rstrip())
+        except Exception:
+            traceback.print_exc()
@@ -0,0 +1,213 @@
+# helpers/vin_decoder.py
+import sys
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from helpers import vin_offline
+from model.db_manager import DBManager
+
+BATCH_URL = "https://vpic.nhtsa.dot.gov/api/vehicles/DecodeVINValuesBatch/"
+
+
+def normalize_vin(vin):
+    return vin.strip().upper()
+
+
+def read_vin_list(path):
+    """VINs from a text file: one per line (or first CSV column); blank lines and # comments skipped."""
+    with open(path, encoding="utf-8") as f:
+        vins = (line.split("#", 1)[0].split(",", 1)[0] for line in f)
+        return [normalize_vin(vin) for vin in vins if vin.strip()]
+
+
+def _parse_cached_at(value):
+    # SQLite CURRENT_TIMESTAMP is UTC "YYYY-MM-DD HH:MM:SS".
+    if not value:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+class VinCache:
+    """
+    In-process LRU in front of the vin_cache table.
+
+    get_many() returns (fresh, stale). An entry goes stale after TTL, or after
+    NEGATIVE_TTL if make, model or year is missing (vPIC didn't know the VIN,
+    or only the offline tables decoded it), and should then be decoded
+    again. The stale answer is still returned so it can be used if vPIC can't
+    be reached. `stats` counts memory_hits, db_hits, misses and expired.
+    """
+
+    SIZE = 2048
+    TTL = timedelta(days=90)
+    NEGATIVE_TTL = timedelta(days=1)
+
+    def __init__(self, db=None, size=SIZE, ttl=TTL, negative_ttl=NEGATIVE_TTL):
+        self.db = db or DBManager()
+        self.size = size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = Counter()
+        self._entries = OrderedDict()  # vin -> (make, model, year, cached_at)
+        self._lock = threading.Lock()  # decode() runs on several workers
+
+    def get_many(self, vins):
+        """({vin: (make, model, year)} fresh, {vin: (make, model, year)} stale); uncached VINs are in neither."""
+        fresh, stale, missing = {}, {}, []
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for vin in vins:
+                entry = self._entries.get(vin)
+                if entry is None:
+                    missing.append(vin)
+                    continue
+                self._entries.move_to_end(vin)
+                self._sort(vin, entry, now, fresh, stale, "memory_hits")
+        if missing:
+            loaded = self.db.get_cached_vins(missing)
+            with self._lock:
+                for vin in missing:
+                    if vin not in loaded:
+                        self.stats["misses"] += 1
+                        continue
+                    make, model, year, cached_at = loaded[vin]
+                    entry = (make, model, year, _parse_cached_at(cached_at))
+                    self._remember(vin, entry)
+                    self._sort(vin, entry, now, fresh, stale, "db_hits")
+        return fresh, stale
+
+    def put_many(self, rows):
+        """Store (vin, make, model, year) rows; blank make/model/year records a VIN vPIC doesn't know."""
+        self.db.cache_vins(rows)
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for vin, make, model, year in rows:
+                self._remember(vin, (make, model, year, now))
+
+    def _sort(self, vin, entry, now, fresh, stale, hit):
+        ttl = self.ttl if all(entry[:3]) else self.negative_ttl
+        if now - entry[3] < ttl:
+            fresh[vin] = entry[:3]
+            self.stats[hit] += 1
+        else:
+            stale[vin] = entry[:3]
+            self.stats["expired"] += 1
+
+    def _remember(self, vin, entry):
+        self._entries[vin] = entry
+        self._entries.move_to_end(vin)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+class VinDecoder:
+    """
+    Decodes VINs with NHTSA vPIC's DecodeVINValuesBatch endpoint, behind a
+    VinCache.
+
+    decode(vins) is the blocking core for worker threads. Fresh cached VINs
+    are answered from the cache. The rest are decoded offline (make and
+    year, see vin_offline). With `online`, they are also sent to the batch
+    endpoint in chunks of CHUNK_SIZE to fill in the model. Each chunk's
+    answers are cached, including VINs that decoded to nothing. If vPIC
+    can't be reached, a chunk falls back to stale or offline answers, and the
+    error is raised only if some VIN in it has neither.
+
+    request(vins, on_done) is the Tk-side entry point. VINs requested within
+    QUEUE_MS of each other are decoded as one batch on the executor. Each
+    caller then gets {vin: (make, model, year, cached)} for its own VINs on
+    the Tk thread.
+    """
+
+    CHUNK_SIZE = 50
+    QUEUE_MS = 50
+    TIMEOUT = 10
+
+    def __init__(self, executor=None, db=None, url=BATCH_URL, cache=None, online=True):
+        self.executor = executor
+        self.cache = cache or VinCache(db)
+        self.url = url
+        self.online = online
+        self._waiting = []  # (vins, on_done, on_error) for the next batch
+        self._after_id = None
+
+    def request(self, vins, on_done, on_error=None):
+        """Queue vins for decoding. Must be called from the Tk thread."""
+        self._waiting.append(([normalize_vin(vin) for vin in vins], on_done, on_error))
+        if self._after_id is None:
+            self._after_id = self.executor.root.after(self.QUEUE_MS, self._flush)
+
+    def _flush(self):
+        self._after_id = None
+        waiting, self._waiting = self._waiting, []
+
+        def _done(results):
+            for vins, on_done, _ in waiting:
+                on_done({vin: results[vin] for vin in vins if vin in results})
+
+        def _error(e):
+            for _, _, on_error in waiting:
+                if on_error:
+                    on_error(e)
+
+        vins = [vin for batch, _, _ in waiting for vin in batch]
+        self.executor.submit(self.decode, vins, on_done=_done, on_error=_error)
+
+    def decode(self, vins):
+        """{vin: (make, model, year, cached)} for every non-blank VIN; unknown VINs decode to blanks."""
+        import requests  # deferred: it is slow to import and only needed here, off the Tk thread
+
+        vins = list(dict.fromkeys(normalize_vin(vin) for vin in vins if vin.strip()))
+        fresh, stale = self.cache.get_many(vins)
+        results = {vin: (*decoded, True) for vin, decoded in fresh.items()}
+        misses = [vin for vin in vins if vin not in fresh]
+        offline = {vin: vin_offline.decode(vin) for vin in misses}
+        for start in range(0, len(misses), self.CHUNK_SIZE):
+            chunk = misses[start:start + self.CHUNK_SIZE]
+            try:
+                decoded = self._decode_batch(chunk) if self.online else {}
+            except (requests.RequestException, ValueError, KeyError):
+                # Unreachable, or an answer that isn't vPIC's JSON (e.g. an HTML error page).
+                use_stale = {vin for vin in chunk if any(stale.get(vin, ()))}
+                if not all(vin in use_stale or any(offline[vin]) for vin in chunk):
+                    raise
+                self.cache.put_many([(vin, *offline[vin]) for vin in chunk if vin not in use_stale])
+                results.update(
+                    (vin, (*stale[vin], True) if vin in use_stale else (*offline[vin], False)) for vin in chunk
+                )
+                continue
+            rows = [
+                (vin, *(remote or local for remote, local in zip(decoded.get(vin, ("", "", "")), offline[vin])))
+                for vin in chunk
+            ]
+            # Cached chunk by chunk, so a failure part-way keeps what already came back.
+            self.cache.put_many(rows)
+            results.update((vin, (make, model, year, False)) for vin, make, model, year in rows)
+        return results
+
+    def prewarm(self, path):
+        """Decode every VIN listed in `path` into the cache. Returns how many decoded to a vehicle."""
+        return sum(1 for make, model, year, _ in self.decode(read_vin_list(path)).values() if any((make, model, year)))
+
+    def _decode_batch(self, vins):
+        import requests
+
+        response = requests.post(
+            self.url, data={"format": "json", "data": ";".join(vins)}, timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        return {
+            normalize_vin(row.get("VIN") or ""): tuple(
+                (row.get(field) or "").strip() for field in ("Make", "Model", "ModelYear")
+            )
+            for row in response.json()["Results"]
+        }
+
+
+if __name__ == "__main__":
+    # python -m helpers.vin_decoder fleet_vins.txt
+    decoder = VinDecoder()
+    for path in sys.argv[1:]:
+        print(f"{path}: {decoder.prewarm(path)} VINs decoded")
+    print(dict(decoder.cache.stats))
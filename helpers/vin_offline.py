@@ -0,0 +1,70 @@
+# helpers/vin_offline.py
+"""
+VIN decoding without the network: make from the WMI (positions 1-3), model
+year from position 10, and the position 9 check digit. The WMI table ships
+in helpers/data/wmi.csv and is read on first use. Models need per-make VDS
+tables, so they are left to the online vPIC lookup.
+"""
+import csv
+import functools
+import os
+from datetime import datetime
+
+WMI_PATH = os.path.join(os.path.dirname(__file__), "data", "wmi.csv")
+
+VIN_CHARS = set("0123456789ABCDEFGHJKLMNPRSTUVWXYZ")  # no I, O or Q
+YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"     # 1980..2009, then again from 2010
+_TRANSLITERATION = {
+    **{str(d): d for d in range(10)},
+    "A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6, "G": 7, "H": 8,
+    "J": 1, "K": 2, "L": 3, "M": 4, "N": 5, "P": 7, "R": 9,
+    "S": 2, "T": 3, "U": 4, "V": 5, "W": 6, "X": 7, "Y": 8, "Z": 9,
+}
+_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+@functools.lru_cache(maxsize=None)
+def _wmi_table():
+    with open(WMI_PATH, newline="", encoding="utf-8") as f:
+        return {row["wmi"]: row["make"] for row in csv.DictReader(line for line in f if not line.startswith("#"))}
+
+
+def is_well_formed(vin):
+    return len(vin) == 17 and set(vin) <= VIN_CHARS
+
+
+def check_digit(vin):
+    """The position 9 check digit a well-formed VIN should carry ("0"-"9" or "X")."""
+    remainder = sum(_TRANSLITERATION[ch] * weight for ch, weight in zip(vin, _WEIGHTS)) % 11
+    return "X" if remainder == 10 else str(remainder)
+
+
+def check_digit_ok(vin):
+    """
+    True if position 9 matches. Required on North American VINs; elsewhere a
+    mismatch only means the maker doesn't use it.
+    """
+    return is_well_formed(vin) and vin[8] == check_digit(vin)
+
+
+def make(vin):
+    return _wmi_table().get(vin[:3], "")
+
+
+def model_year(vin):
+    """Model year from position 10, or None. Codes repeat every 30 years."""
+    if vin[9] not in YEAR_CODES:
+        return None
+    year = 1980 + YEAR_CODES.index(vin[9])
+    if vin[0] in "12345":
+        # North America: a letter in position 7 marks the 2010+ cycle.
+        return year + 30 if vin[6].isalpha() else year
+    return year + 30 if year + 30 <= datetime.now().year + 1 else year
+
+
+def decode(vin):
+    """(make, model, year) as far as the tables go; blanks when unknown or malformed. Model is always blank."""
+    if not is_well_formed(vin):
+        return "", "", ""
+    year = model_year(vin)
+    return make(vin), "", str(year) if year else ""
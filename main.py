@@ -1,17 +1,25 @@
 # rtf_auto_app/main.py
+import os
 import tkinter as tk
-from tkinter import ttk
 from controller.app_controller import AppController
-from view.login_frame import LoginFrame
 from helpers.logger import setup_logging
+from model.connection_pool import SHARED_FILE_PRAGMAS
 from model.db_manager import DBManager
-import os
 
-# Setup logging
-setup_logging()
+# "wal" only when every terminal runs on the PC that holds rtf_auto.db.
+# Unset (or "delete") treats the file as shared over the network, which is
+# the safe choice for a front desk plus bay terminals.
+JOURNAL_MODE_ENV = "RTF_JOURNAL_MODE"
 
-# Initialize DB
-DBManager()._run_migrations()
+
+def db_pragmas():
+    """Connection pragmas for the app's database, from RTF_JOURNAL_MODE."""
+    mode = os.environ.get(JOURNAL_MODE_ENV, "delete").strip().lower()
+    if mode == "wal":
+        return None  # connection_pool.DEFAULT_PRAGMAS
+    if mode != "delete":
+        print(f"[DB] Unknown {JOURNAL_MODE_ENV}={mode!r}; using the rollback journal")
+    return SHARED_FILE_PRAGMAS
 
 class RTFApp(tk.Tk):
     def __init__(self):
@@ -21,7 +29,22 @@ class RTFApp(tk.Tk):
         self.resizable(True, True)
 
         self.controller = AppController(self)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-if __name__ == "__main__":
+    def _on_close(self):
+        self.controller.change_feed.shutdown()
+        self.controller.executor.shutdown()
+        self.destroy()
+
+def main():
+    # Nothing here runs on import, so invoice worker processes (which
+    # re-import modules under spawn) and the startup benchmark stay cheap.
+    setup_logging()
+    # The first DBManager fixes the pragmas for every later one; it also
+    # creates the database and runs any pending migrations, once.
+    DBManager(pragmas=db_pragmas())
     app = RTFApp()
     app.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# model/change_bus.py
+"""
+In-process publish/subscribe for committed database writes.
+
+DBManager records a Change for every row it inserts, updates or deletes and
+publishes them as one batch when the outermost transaction commits (nothing
+is published for a rollback). Screens subscribe to the tables they show and
+update only when something they display has changed. Writes committed by
+other processes on the same database are published by helpers/change_feed.py.
+
+Callbacks run on the thread that committed the write. Tk widgets must only be
+touched from the Tk thread; BaseFrame.watch() takes care of that.
+"""
+import threading
+import traceback
+from collections import namedtuple
+
+# table: table written; key: its primary key (None when many rows changed at
+# once); op: "insert", "update" or "delete"; parent: the owning work order's
+# id for work_order_parts, mechanic_hours and work_order_services rows.
+Change = namedtuple("Change", "table key op parent", defaults=(None,))
+
+
+class ChangeBus:
+    def __init__(self):
+        self._subscribers = {}  # token -> (set of tables, callback)
+        self._lock = threading.Lock()
+
+    def subscribe(self, tables, callback):
+        """
+        Call callback(changes) with the relevant Changes of every committed
+        batch that touches one of `tables`. Returns a function that
+        unsubscribes.
+        """
+        token = object()
+        with self._lock:
+            self._subscribers[token] = (frozenset(tables), callback)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers.pop(token, None)
+
+        return unsubscribe
+
+    def publish(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for tables, callback in subscribers:
+            relevant = [change for change in changes if change.table in tables]
+            if relevant:
+                try:
+                    callback(relevant)
+                except Exception:
+                    # One broken subscriber must not stop the others or fail the write.
+                    traceback.print_exc()
+
+
+bus = ChangeBus()
+subscribe = bus.subscribe
+publish = bus.publish
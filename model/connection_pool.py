@@ -0,0 +1,172 @@
+# model/connection_pool.py
+import os
+import pathlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Size of sqlite3's per-connection prepared statement cache. DBManager issues a
+# few dozen distinct statements, so this keeps every one of them compiled.
+STATEMENT_CACHE_SIZE = 256
+
+# Applied to every connection a pool opens. journal_mode is a property of the
+# database file and is only set through the write connection. WAL lets readers
+# and the writer work at the same time, but needs all terminals on the same
+# machine as the file; use "delete" for a database on a network share.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",     # safe with WAL; fsync only at checkpoints
+    "cache_size": -16000,        # negative = KiB, so ~16 MB of page cache
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "memory",
+}
+_WRITER_ONLY = {"journal_mode"}
+
+# Overrides for a database file that other PCs open over the network: WAL's
+# shared-memory index does not work across machines, the rollback journal
+# needs full fsyncs to survive a power cut, and mmap over a network
+# filesystem is unreliable.
+SHARED_FILE_PRAGMAS = {"journal_mode": "delete", "synchronous": "full", "mmap_size": 0}
+
+
+class ConnectionPool:
+    """
+    Long-lived SQLite connections for one database file: per thread, one
+    write connection and one read-only connection.
+
+    Connections are opened lazily the first time a thread asks for one and are
+    reused for the life of that thread, so callers must NOT close them.
+    """
+
+    def __init__(self, db_path, cached_statements=STATEMENT_CACHE_SIZE, pragmas=None):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []  # (thread, connection) pairs
+        # An in-memory database is private to its connection, so there is
+        # nothing for a second, read-only connection to open.
+        self.split_reads = db_path != ":memory:"
+
+    def _connect(self, read_only=False):
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves in transaction().
+        # check_same_thread=False only so close_all() can run from any thread;
+        # each connection is still only used by the thread that opened it.
+        if read_only:
+            # pathlib rather than urllib.request.pathname2url: the latter drags
+            # in the whole http/email stack at startup.
+            target = pathlib.Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+        else:
+            target = self.db_path
+        conn = sqlite3.connect(
+            target,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            uri=read_only,
+        )
+        for name, value in self.pragmas.items():
+            if read_only and name in _WRITER_ONLY:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    def _prune_dead_threads(self):
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def connection(self):
+        """Return this thread's write connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            self._local.depth = 0
+        return conn
+
+    def reader(self):
+        """
+        Return this thread's read-only connection. Inside a transaction the
+        write connection is returned instead, so reads see uncommitted writes.
+
+        Read each statement to the end straight away. Under the rollback
+        journal (SHARED_FILE_PRAGMAS) a cursor left open holds a shared lock,
+        and every writer on every terminal waits on it, then fails with
+        "database is locked"; only WAL lets readers and the writer overlap.
+        Long listings are paged as separate short statements instead.
+        """
+        if not self.split_reads or getattr(self._local, "depth", 0):
+            return self.connection()
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self._local.reader = self._connect(read_only=True)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit on success, roll back on error. Nested blocks on the same thread
+        become savepoints of the outer transaction.
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT sp_{depth}")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO sp_{depth}")
+                conn.execute(f"RELEASE sp_{depth}")
+            raise
+        else:
+            if depth == 0:
+                conn.execute("COMMIT")
+            else:
+                conn.execute(f"RELEASE sp_{depth}")
+        finally:
+            self._local.depth = depth
+
+    def close_all(self):
+        with self._lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path, pragmas=None):
+    """
+    Process-wide pool for db_path (one per database file). pragmas only take
+    effect when the pool is first created.
+    """
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path, pragmas=pragmas)
+        return pool
+
+
+def close_all_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
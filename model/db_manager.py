@@ -1,158 +1,310 @@
 # model/db_manager.py
 import sqlite3
 import os
-from datetime import datetime
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+
+from model import change_bus, migrations
+from model.change_bus import Change
+from model.connection_pool import get_pool
 
 DEFAULT_DB = "rtf_auto.db"
 
+# Rows per page for the keyset-paged list queries.
+PAGE_SIZE = 200
+
+# Most rows a search returns; results are ranked, so these are the best ones.
+SEARCH_LIMIT = 500
+# Above this many matches bm25 costs more than it tells apart (every row
+# matches the same common word), so broad searches list newest first instead.
+RANK_MAX_MATCHES = 5000
+
+# Tables a get_work_orders_page row is built from; list screens watch these.
+WORK_ORDER_ROW_TABLES = ("work_orders", "work_order_parts", "mechanic_hours", "vehicles", "customers")
+
+# Ids per statement for the batched lookups (well under SQLite's variable limit).
+BATCH_SIZE = 500
+
+# Rows per page handed out by the export_* generators.
+EXPORT_PAGE_SIZE = 1000
+
+# Connection pools whose database this process has already migrated.
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+# Changes recorded inside the transactions open on each thread, per pool;
+# published on the change bus when the outermost one commits.
+_open_changes = threading.local()
+
+# change_log rows per page for get_changes_since.
+CHANGE_LOG_PAGE_SIZE = 500
+
+# (first, last) change_log seq range of each recent committed transaction that
+# published its changes here, per pool. The change feed skips those rows; a
+# range that has aged out only costs a redundant refresh.
+LOCAL_SEQ_RANGES = 1024
+_local_seqs = {}
+_local_seqs_lock = threading.Lock()
+_LAST_SEQ_SQL = "SELECT ifnull(MAX(seq), 0) FROM change_log"
+
+def utc_bounds(first_day, last_day=None):
+    """
+    [start, end) covering the local calendar days first_day..last_day
+    (inclusive), as UTC "YYYY-MM-DD HH:MM:SS" to compare with timestamps
+    stored from CURRENT_TIMESTAMP.
+    """
+    start = datetime.combine(first_day, time()).astimezone(timezone.utc)
+    end = datetime.combine((last_day or first_day) + timedelta(days=1), time()).astimezone(timezone.utc)
+    return start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _as_date(day):
+    return date.fromisoformat(day) if isinstance(day, str) else day
+
+
+def local_day(utc_timestamp):
+    """
+    Local calendar date ("YYYY-MM-DD") of a UTC timestamp stored from
+    CURRENT_TIMESTAMP; the reverse of utc_bounds.
+    """
+    stamp = datetime.fromisoformat(utc_timestamp).replace(tzinfo=timezone.utc)
+    return stamp.astimezone().date().isoformat()
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text typed into a search bar: every word
+    must match, each as a prefix. Quoting each word keeps user input from
+    being read as FTS syntax. Returns None if there is nothing to search for.
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
 class DBManager:
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, pragmas=None):
+        """
+        pragmas overrides entries of connection_pool.DEFAULT_PRAGMAS
+        (journal_mode, synchronous, cache_size, mmap_size, temp_store).
+        It only applies to the first DBManager created for a given file.
+        """
         self.db_path = db_path or DEFAULT_DB
+        self.pool = get_pool(self.db_path, pragmas)
         self._run_migrations()
 
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
-
-    def _run_migrations(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # model/db_manager.py (inside DBManager._run_migrations)
-
-# —— ensure work_orders has odometer_km ——  
-        cursor.execute("PRAGMA table_info(work_orders)")
-        cols = [col[1] for col in cursor.fetchall()]
-        if "odometer_km" not in cols:
-            cursor.execute("""
-                ALTER TABLE work_orders
-                ADD COLUMN odometer_km INTEGER DEFAULT 0
-            """)
-
-
-        cursor.execute("PRAGMA table_info(vehicles)")
-        columns = [col[1] for col in cursor.fetchall()]
-        if "odometer_km" not in columns:
-            cursor.execute("ALTER TABLE vehicles ADD COLUMN odometer_km INTEGER DEFAULT 0")
-
-        # USERS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE,
-                password TEXT,
-                role TEXT
-            )
-        """)
-
-        # CUSTOMERS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS customers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name TEXT,
-                last_name TEXT,
-                phone TEXT,
-                email TEXT
-            )
-        """)
-
-        # VEHICLES
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vehicles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                customer_id INTEGER,
-                make TEXT,
-                model TEXT,
-                year TEXT,
-                vin TEXT,
-                odometer_km INTEGER DEFAULT 0,
-                FOREIGN KEY(customer_id) REFERENCES customers(id)
-            )
-        """)
-
-        # WORK ORDERS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS work_orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                vehicle_id INTEGER,
-                issue TEXT,
-                notes TEXT,
-                status TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                rate REAL DEFAULT 65.0,
-                hourly_rate REAL DEFAULT 100.0,
-                FOREIGN KEY(vehicle_id) REFERENCES vehicles(id)
-            )
-        """)
-
-        # SERVICES
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS work_order_services (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                work_order_id INTEGER,
-                service_type TEXT,
-                FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
-            )
-        """)
-
-        # MECHANIC HOURS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS mechanic_hours (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                work_order_id INTEGER,
-                mechanic TEXT,
-                hours REAL,
-                date TEXT,
-                FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
-            )
-        """)
-        # VIN Cache
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vin_cache (
-                vin TEXT PRIMARY KEY,
-                make TEXT,
-                model TEXT,
-                year TEXT,
-                cached_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-
-        # PARTS
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS work_order_parts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                work_order_id INTEGER,
-                part_name TEXT,
-                quantity INTEGER,
-                unit_price REAL,
-                cost REAL DEFAULT 0.0,
-                added_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
+        """
+        This thread's pooled write connection. It is shared with every other
+        DBManager on the same thread, so do NOT close it.
+        """
+        return self.pool.connection()
+
+    def get_read_connection(self):
+        """This thread's pooled read-only connection (do NOT close it)."""
+        return self.pool.reader()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit on success, roll back on error; nested blocks are savepoints.
+        Changes recorded with _changed() are published on the change bus once
+        the outermost transaction commits, and dropped with a rollback.
+        """
+        open_changes = vars(_open_changes).setdefault("by_pool", {})
+        outer = self.pool not in open_changes
+        changes = open_changes.setdefault(self.pool, [])
+        mark = len(changes)
+        try:
+            with self.pool.transaction() as conn:
+                if outer:
+                    # The write lock is held from BEGIN IMMEDIATE, so every
+                    # change_log row between these two reads is ours.
+                    first_seq = conn.execute(_LAST_SEQ_SQL).fetchone()[0]
+                yield conn
+                if outer and changes:
+                    last_seq = conn.execute(_LAST_SEQ_SQL).fetchone()[0]
+        except BaseException:
+            del changes[mark:]
+            raise
+        finally:
+            if outer:
+                del open_changes[self.pool]
+        if outer and changes:
+            # Only after COMMIT: a failed commit would hand the seqs out again.
+            if last_seq > first_seq:
+                with _local_seqs_lock:
+                    ranges = _local_seqs.setdefault(self.pool, deque(maxlen=LOCAL_SEQ_RANGES))
+                    ranges.append((first_seq + 1, last_seq))
+            change_bus.publish(changes)
+
+    def _changed(self, table, key, op, parent=None):
+        """Record a change made in the current transaction."""
+        vars(_open_changes)["by_pool"][self.pool].append(Change(table, key, op, parent))
+
+    # —— query helpers ——
+    def _fetchall(self, sql, params=()):
+        return self.get_read_connection().execute(sql, params).fetchall()
+
+    def _fetchone(self, sql, params=()):
+        return self.get_read_connection().execute(sql, params).fetchone()
+
+    def _write(self, sql, params, table, op, key=None, parent=None):
+        """
+        Execute one statement on `table` in a transaction and record the
+        change if it touched a row. key defaults to the inserted row's id.
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute(sql, params)
+            if cursor.rowcount:
+                self._changed(table, cursor.lastrowid if key is None else key, op, parent)
+            return cursor
+
+    def _work_order_of(self, table, row_id):
+        """work_order_id of a part or hours row, read inside the current transaction."""
+        row = self.get_connection().execute(f"SELECT work_order_id FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        return row[0] if row else None
+
+    # —— keyset paging ——
+    def _keyset_page(self, select_sql, column, after, limit, descending, params=()):
+        """
+        One page of select_sql ordered by (column, id), starting after the
+        (value, id) key `after`. select_sql must end in a WHERE clause whose
+        row alias is `t`. NULL sort values are paged too: SQLite sorts them
+        first ascending and last descending, and a row-value comparison
+        never matches them, so they are fetched as a separate run.
+        """
+        op, order = ("<", "DESC") if descending else (">", "ASC")
+        non_null = f"ORDER BY {column} {order}, t.id {order} LIMIT ?"
+        nulls = f"{column} IS NULL ORDER BY t.id {order} LIMIT ?"
+        params = tuple(params)
+
+        if after is None:
+            return self._fetchall(f"{select_sql} 1 {non_null}", params + (limit,))
+
+        value, last_id = after
+        if value is None:
+            rows = self._fetchall(
+                f"{select_sql} {column} IS NULL AND t.id {op} ? ORDER BY t.id {order} LIMIT ?",
+                params + (last_id, limit),
             )
-        """)
+            if not descending and len(rows) < limit:
+                rows += self._fetchall(
+                    f"{select_sql} {column} IS NOT NULL {non_null}", params + (limit - len(rows),)
+                )
+            return rows
+
+        rows = self._fetchall(
+            f"{select_sql} ({column}, t.id) {op} (?, ?) {non_null}", params + (value, last_id, limit)
+        )
+        if descending and len(rows) < limit:
+            rows += self._fetchall(f"{select_sql} {nulls}", params + (limit - len(rows),))
+        return rows
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _iter_pages(get_page, key, page_size):
+        """Yield lists of rows from get_page(after, limit) until it runs dry."""
+        after = None
+        while True:
+            page = get_page(after, page_size)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = key(page[-1])
+
+    # —— full-text search ——
+    def _search(self, fts_table, select_sql, text, limit, page_size, conditions="", params=()):
+        """
+        Pages of select_sql (aliasing fts_table as f, ending in its MATCH ?)
+        for the words in text, followed by `conditions`. Ranked by bm25
+        unless there are more than RANK_MAX_MATCHES candidates; then newest
+        first, which FTS5 reads straight off its index.
+
+        The first page_size rows are read on their own so they can be shown
+        at once, the rest up to limit in one more statement. Each is read to
+        the end before its page is handed out: a cursor left open between
+        pages would keep a read transaction, and with it every writer, waiting.
+        """
+        query = fts_query(text)
+        if query is None:
+            return
+        matches = self._fetchone(f"SELECT COUNT(*) FROM {fts_table} WHERE {fts_table} MATCH ?", (query,))[0]
+        order = "f.rank, f.rowid DESC" if matches <= RANK_MAX_MATCHES else "f.rowid DESC"
+        sql = f"{select_sql} {conditions} ORDER BY {order} LIMIT ? OFFSET ?"
+        first = min(page_size, limit)
+        for size, offset in ((first, 0), (limit - first, first)):
+            if size <= 0:
+                return
+            page = self._fetchall(sql, (query,) + tuple(params) + (size, offset))
+            if page:
+                yield page
+            if len(page) < size:
+                return
+
+    def _run_migrations(self, force=False):
+        """
+        Apply pending schema migrations. Only the first DBManager per database
+        in a process does any work; pass force=True to re-check the schema
+        and restore any missing index.
+        """
+        if not force and self.pool in _migrated:
+            return
+        with _migrate_lock:
+            if force or self.pool not in _migrated:
+                migrations.migrate(self.pool, repair=force)
+                _migrated.add(self.pool)
 
     def get_notes_for_work_order(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT notes FROM work_orders WHERE id = ?", (work_order_id,))
-        result = cursor.fetchone()
-        conn.close()
+        result = self._fetchone("SELECT notes FROM work_orders WHERE id = ?", (work_order_id,))
         return result[0] if result else ""
 
     def update_work_order_notes(self, work_order_id, notes):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE work_orders SET notes = ? WHERE id = ?", (notes, work_order_id))
-        conn.commit()
-        conn.close()
+        self._write("UPDATE work_orders SET notes = ? WHERE id = ?", (notes, work_order_id),
+                    "work_orders", "update", work_order_id)
+
+    def get_work_order_status(self, work_order_id):
+        """The order's status, or None if it no longer exists."""
+        row = self._fetchone("SELECT status FROM work_orders WHERE id = ?", (work_order_id,))
+        return row[0] if row else None
+
+    def get_work_order_rate(self, work_order_id):
+        row = self._fetchone("SELECT rate FROM work_orders WHERE id = ?", (work_order_id,))
+        return float(row[0]) if row and row[0] is not None else 0.0
+
+    def get_work_order_totals(self, work_order_id):
+        """(parts_total, total_hours, labor_total, subtotal) for one order, or None."""
+        totals = self.get_work_order_totals_batch([work_order_id])
+        return totals.get(work_order_id)
+
+    def get_work_order_totals_batch(self, work_order_ids):
+        """
+        {work_order_id: (parts_total, total_hours, labor_total, subtotal)},
+        aggregated live from parts and mechanic hours; labour is hours at
+        the order's rate. Unknown ids are left out.
+        """
+        ids = list(dict.fromkeys(work_order_ids))
+        totals = {}
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start:start + BATCH_SIZE]
+            for row in self._fetchall(f"""
+                SELECT id, parts_total, total_hours, total_hours * rate, parts_total + total_hours * rate
+                FROM (
+                    SELECT w.id,
+                        (SELECT ifnull(SUM(cost), 0) FROM work_order_parts WHERE work_order_id = w.id) AS parts_total,
+                        (SELECT ifnull(SUM(hours), 0) FROM mechanic_hours WHERE work_order_id = w.id) AS total_hours,
+                        ifnull(w.rate, 0) AS rate
+                    FROM work_orders w
+                    WHERE w.id IN ({", ".join("?" * len(chunk))})
+                )
+            """, chunk):
+                totals[row[0]] = tuple(row[1:])
+        return totals
 
     def get_work_orders_by_status(self, status="In Progress"):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT work_orders.id,
                 v.id || ' - ' || c.first_name || ' ' || c.last_name || ' ' || v.make || ' ' || v.model || ' ' || v.year,
                 work_orders.issue, work_orders.notes, work_orders.status, work_orders.rate
@@ -162,14 +314,9 @@ class DBManager:
             WHERE work_orders.status = ?
             ORDER BY work_orders.id DESC
         """, (status,))
-        rows = cursor.fetchall()
-        conn.close()
-        return rows
 
     def get_all_work_orders(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT work_orders.id,
                 v.id || ' - ' || c.first_name || ' ' || c.last_name || ' ' || v.make || ' ' || v.model || ' ' || v.year,
                 work_orders.issue,
@@ -181,152 +328,235 @@ class DBManager:
             JOIN customers c ON v.customer_id = c.id
             ORDER BY work_orders.id DESC
         """)
-        rows = cursor.fetchall()
-        conn.close()
-        return rows
+
+    def get_work_orders_page(self, after_id=None, limit=PAGE_SIZE, status=None):
+        """
+        Same rows as get_all_work_orders (or get_work_orders_by_status when
+        status is given) plus the order's subtotal from work_order_totals,
+        `limit` at a time, newest first.
+        """
+        conditions, params = [], ()
+        if status is not None:
+            conditions.append("t.status = ?")
+            params += (status,)
+        if after_id is not None:
+            conditions.append("t.id < ?")
+            params += (after_id,)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        return self._fetchall(f"""
+            SELECT t.id,
+                v.id || ' - ' || c.first_name || ' ' || c.last_name || ' ' || v.make || ' ' || v.model || ' ' || v.year,
+                t.issue,
+                t.notes,
+                t.status,
+                t.rate,
+                ifnull(tt.parts_total, 0) + ifnull(tt.total_hours, 0) * ifnull(t.rate, 0)
+            FROM work_orders t
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            LEFT JOIN work_order_totals tt ON tt.work_order_id = t.id
+            {where}
+            ORDER BY t.id DESC
+            LIMIT ?
+        """, params + (limit,))
+
+    def iter_work_orders(self, page_size=PAGE_SIZE, status=None):
+        """Generator of work-order pages (lists of rows), fetched on demand."""
+        def get_page(after_id, limit):
+            return self.get_work_orders_page(after_id, limit, status)
+        return self._iter_pages(get_page, lambda row: row[0], page_size)
+
+    def get_work_order_key_at(self, offset, status=None):
+        """
+        id of the row `offset` rows into get_work_orders_page's order, or
+        None past the end. Reads ids only, so a list can jump deep without
+        fetching every page before it.
+        """
+        where, params = ("WHERE t.status = ?", (status,)) if status is not None else ("", ())
+        row = self._fetchone(f"""
+            SELECT t.id
+            FROM work_orders t
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            {where}
+            ORDER BY t.id DESC
+            LIMIT 1 OFFSET ?
+        """, params + (offset,))
+        return row[0] if row else None
+
+    def count_work_orders(self, status=None):
+        """Number of rows get_work_orders_page would page through."""
+        where, params = ("WHERE t.status = ?", (status,)) if status is not None else ("", ())
+        return self._fetchone(f"""
+            SELECT COUNT(*)
+            FROM work_orders t
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            {where}
+        """, params)[0]
+
+    def search_work_orders(self, text, status=None, limit=SEARCH_LIMIT):
+        """
+        Work orders whose customer, vehicle, issue or notes match every word
+        of text (as prefixes), best match first. Rows as in
+        get_work_orders_page, plus the indexed text as a last column so
+        callers can narrow the results without another query.
+        """
+        return [row for page in self._search_work_orders(text, status, limit, limit) for row in page]
+
+    def iter_search_work_orders(self, text, status=None, limit=SEARCH_LIMIT, page_size=50):
+        """search_work_orders as a generator of pages: the first page_size rows, then the rest."""
+        return self._search_work_orders(text, status, limit, page_size)
+
+    def _search_work_orders(self, text, status, limit, page_size):
+        status_filter, params = ("AND t.status = ?", (status,)) if status is not None else ("", ())
+        return self._search("work_order_fts", """
+            SELECT t.id,
+                v.id || ' - ' || c.first_name || ' ' || c.last_name || ' ' || v.make || ' ' || v.model || ' ' || v.year,
+                t.issue,
+                t.notes,
+                t.status,
+                t.rate,
+                ifnull(tt.parts_total, 0) + ifnull(tt.total_hours, 0) * ifnull(t.rate, 0),
+                f.customer || ' ' || f.vehicle || ' ' || ifnull(f.issue, '') || ' ' || ifnull(f.notes, '')
+            FROM work_order_fts f
+            JOIN work_orders t ON t.id = f.rowid
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            LEFT JOIN work_order_totals tt ON tt.work_order_id = t.id
+            WHERE work_order_fts MATCH ?""", text, limit, page_size, status_filter, params)
 
     def add_part_to_work_order(self, work_order_id, part_name, quantity, unit_price, cost=None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT INTO work_order_parts (work_order_id, part_name, quantity, unit_price, cost)
             VALUES (?, ?, ?, ?, ?)
-        """, (work_order_id, part_name, quantity, unit_price, cost or 0.0))
-        conn.commit()
-        conn.close()
+        """, (work_order_id, part_name, quantity, unit_price, cost or 0.0),
+            "work_order_parts", "insert", parent=work_order_id)
 
     def get_parts_for_work_order(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT id, part_name, quantity, unit_price, cost, added_at
             FROM work_order_parts
             WHERE work_order_id = ?
         """, (work_order_id,))
-        result = cursor.fetchall()
-        conn.close()
-        return result
+
+    def update_work_order_part(self, part_id, part_name, quantity, unit_price, cost):
+        with self.transaction():
+            self._write("""
+                UPDATE work_order_parts SET part_name = ?, quantity = ?, unit_price = ?, cost = ?
+                WHERE id = ?
+            """, (part_name, quantity, unit_price, cost, part_id),
+                "work_order_parts", "update", part_id, self._work_order_of("work_order_parts", part_id))
 
     def delete_work_order_part(self, part_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM work_order_parts WHERE id = ?", (part_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction():
+            parent = self._work_order_of("work_order_parts", part_id)
+            self._write("DELETE FROM work_order_parts WHERE id = ?", (part_id,),
+                        "work_order_parts", "delete", part_id, parent)
 
     def get_mechanic_hours(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT id, mechanic, hours, date
             FROM mechanic_hours
             WHERE work_order_id = ?
         """, (work_order_id,))
-        results = cursor.fetchall()
-        conn.close()
-        return results
 
     def add_mechanic_hours(self, work_order_id, mechanic, hours, date):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT INTO mechanic_hours (work_order_id, mechanic, hours, date)
             VALUES (?, ?, ?, ?)
-        """, (work_order_id, mechanic, hours, date))
-        conn.commit()
-        conn.close()
+        """, (work_order_id, mechanic, hours, date), "mechanic_hours", "insert", parent=work_order_id)
+
+    def update_mechanic_hours_entry(self, entry_id, mechanic, hours, date):
+        with self.transaction():
+            self._write("""
+                UPDATE mechanic_hours SET mechanic = ?, hours = ?, date = ?
+                WHERE id = ?
+            """, (mechanic, hours, date, entry_id),
+                "mechanic_hours", "update", entry_id, self._work_order_of("mechanic_hours", entry_id))
 
     def delete_mechanic_hours_entry(self, entry_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM mechanic_hours WHERE id = ?", (entry_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction():
+            parent = self._work_order_of("mechanic_hours", entry_id)
+            self._write("DELETE FROM mechanic_hours WHERE id = ?", (entry_id,),
+                        "mechanic_hours", "delete", entry_id, parent)
 
     def delete_work_order(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM work_orders WHERE id = ?", (work_order_id,))
-        conn.commit()
-        conn.close()
+        self._write("DELETE FROM work_orders WHERE id = ?", (work_order_id,), "work_orders", "delete", work_order_id)
 
     def update_work_order_status(self, work_order_id, new_status):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE work_orders SET status = ? WHERE id = ?", (new_status, work_order_id))
-        conn.commit()
-        conn.close()
+        self._write("UPDATE work_orders SET status = ? WHERE id = ?", (new_status, work_order_id),
+                    "work_orders", "update", work_order_id)
 
     def add_work_order(self, vehicle_id, issue, notes, status, hourly_rate):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        """Insert a work order and return its id."""
+        cursor = self._write("""
             INSERT INTO work_orders (vehicle_id, issue, notes, status, rate)
             VALUES (?, ?, ?, ?, ?)
-        """, (vehicle_id, issue, notes, status, hourly_rate))
-        conn.commit()
-        conn.close()
+        """, (vehicle_id, issue, notes, status, hourly_rate), "work_orders", "insert")
+        return cursor.lastrowid
 
     def update_work_order(self, work_order_id, vehicle_id, notes, status):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             UPDATE work_orders
             SET vehicle_id = ?, notes = ?, status = ?
             WHERE id = ?
-        """, (vehicle_id, notes, status, work_order_id))
-        conn.commit()
-        conn.close()
+        """, (vehicle_id, notes, status, work_order_id), "work_orders", "update", work_order_id)
 
     def add_customer(self, first_name, last_name, phone, email):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT INTO customers (first_name, last_name, phone, email)
             VALUES (?, ?, ?, ?)
-        """, (first_name, last_name, phone, email))
-        conn.commit()
-        conn.close()
+        """, (first_name, last_name, phone, email), "customers", "insert")
 
     def update_customer(self, customer_id, first_name, last_name, phone, email):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             UPDATE customers
             SET first_name = ?, last_name = ?, phone = ?, email = ?
             WHERE id = ?
-        """, (first_name, last_name, phone, email, customer_id))
-        conn.commit()
-        conn.close()
+        """, (first_name, last_name, phone, email, customer_id), "customers", "update", customer_id)
 
     def get_all_customers(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT id, first_name, last_name, phone, email
             FROM customers
             ORDER BY last_name ASC
         """)
-        results = cursor.fetchall()
-        conn.close()
-        return results
+
+    def get_customers_page(self, after=None, limit=PAGE_SIZE):
+        """
+        Rows as in get_all_customers, ordered by last name then id.
+        `after` is the (last_name, id) of the last row already shown.
+        """
+        return self._keyset_page("""
+            SELECT t.id, t.first_name, t.last_name, t.phone, t.email
+            FROM customers t
+            WHERE""", "t.last_name", after, limit, descending=False)
+
+    def iter_customers(self, page_size=PAGE_SIZE):
+        return self._iter_pages(self.get_customers_page, lambda row: (row[2], row[0]), page_size)
+
+    def get_customer_key_at(self, offset):
+        """(last_name, id) of the row `offset` rows into get_customers_page's order, or None."""
+        row = self._fetchone("""
+            SELECT t.last_name, t.id FROM customers t
+            ORDER BY t.last_name, t.id
+            LIMIT 1 OFFSET ?
+        """, (offset,))
+        return tuple(row) if row else None
+
+    def count_customers(self):
+        return self._fetchone("SELECT COUNT(*) FROM customers")[0]
 
     def get_customer_list(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT id, first_name || ' ' || last_name AS full_name, phone, email
             FROM customers
             ORDER BY full_name ASC
         """)
-        results = cursor.fetchall()
-        conn.close()
-        return results
 
     def get_all_vehicles(self):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        return self._fetchall("""
             SELECT v.id,
                 c.first_name || ' ' || c.last_name AS owner_name,
                 v.make, v.model, v.year, v.vin, v.odometer_km
@@ -334,90 +564,339 @@ class DBManager:
             JOIN customers c ON v.customer_id = c.id
             ORDER BY v.year DESC
         """)
-        results = cursor.fetchall()
-        conn.close()
-        return results
 
+    def get_vehicles_page(self, after=None, limit=PAGE_SIZE):
+        """
+        Rows as in get_all_vehicles, ordered by year then id (both
+        descending). `after` is the (year, id) of the last row already shown.
+        """
+        return self._keyset_page("""
+            SELECT t.id,
+                c.first_name || ' ' || c.last_name AS owner_name,
+                t.make, t.model, t.year, t.vin, t.odometer_km
+            FROM vehicles t
+            JOIN customers c ON t.customer_id = c.id
+            WHERE""", "t.year", after, limit, descending=True)
+
+    def iter_vehicles(self, page_size=PAGE_SIZE):
+        return self._iter_pages(self.get_vehicles_page, lambda row: (row[4], row[0]), page_size)
+
+    def get_vehicle_key_at(self, offset):
+        """(year, id) of the row `offset` rows into get_vehicles_page's order, or None."""
+        row = self._fetchone("""
+            SELECT t.year, t.id
+            FROM vehicles t
+            JOIN customers c ON t.customer_id = c.id
+            ORDER BY t.year DESC, t.id DESC
+            LIMIT 1 OFFSET ?
+        """, (offset,))
+        return tuple(row) if row else None
+
+    def count_vehicles(self):
+        return self._fetchone("""
+            SELECT COUNT(*)
+            FROM vehicles v
+            JOIN customers c ON v.customer_id = c.id
+        """)[0]
+
+
+    def search_vehicles(self, text, limit=SEARCH_LIMIT):
+        """
+        Vehicles whose owner, make, model, year or VIN match every word of
+        text (as prefixes), best match first. Rows as in get_all_vehicles.
+        """
+        return [row for page in self._search_vehicles(text, limit, limit) for row in page]
+
+    def iter_search_vehicles(self, text, limit=SEARCH_LIMIT, page_size=50):
+        """search_vehicles as a generator of pages: the first page_size rows, then the rest."""
+        return self._search_vehicles(text, limit, page_size)
+
+    def _search_vehicles(self, text, limit, page_size):
+        return self._search("vehicle_fts", """
+            SELECT t.id,
+                c.first_name || ' ' || c.last_name AS owner_name,
+                t.make, t.model, t.year, t.vin, t.odometer_km
+            FROM vehicle_fts f
+            JOIN vehicles t ON t.id = f.rowid
+            JOIN customers c ON t.customer_id = c.id
+            WHERE vehicle_fts MATCH ?""", text, limit, page_size)
 
     def add_vehicle(self, customer_id, make, model, year, vin, odometer_km):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT INTO vehicles (customer_id, make, model, year, vin, odometer_km)
             VALUES (?, ?, ?, ?, ?, ?)
-        """, (customer_id, make, model, year, vin, odometer_km))
-        conn.commit()
-        conn.close()
+        """, (customer_id, make, model, year, vin, odometer_km), "vehicles", "insert")
 
     def add_work_order_service(self, work_order_id, service_type):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT INTO work_order_services (work_order_id, service_type)
             VALUES (?, ?)
-        """, (work_order_id, service_type))
-        conn.commit()
-        conn.close()
+        """, (work_order_id, service_type), "work_order_services", "insert", parent=work_order_id)
 
     def get_services_for_work_order(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT service_type FROM work_order_services WHERE work_order_id = ?", (work_order_id,))
-        results = cursor.fetchall()
-        conn.close()
+        results = self._fetchall(
+            "SELECT service_type FROM work_order_services WHERE work_order_id = ?", (work_order_id,)
+        )
         return [r[0] for r in results]
 
     def delete_services_for_work_order(self, work_order_id):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM work_order_services WHERE work_order_id = ?", (work_order_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            if conn.execute("DELETE FROM work_order_services WHERE work_order_id = ?", (work_order_id,)).rowcount:
+                self._changed("work_order_services", None, "delete", work_order_id)
 
     def validate_user(self, uid, pwd):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT role FROM users WHERE username = ? AND password = ?", (uid, pwd))
-        result = cursor.fetchone()
-        conn.close()
+        result = self._fetchone("SELECT role FROM users WHERE username = ? AND password = ?", (uid, pwd))
         if result:
             return True, result[0]  # (is_valid, role)
         return False, None
-    
+
     def update_vehicle(self, vehicle_id, customer_id, make, model, year, vin, odometer_km):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             UPDATE vehicles
             SET customer_id = ?, make = ?, model = ?, year = ?, vin = ?, odometer_km = ?
             WHERE id = ?
-        """, (customer_id, make, model, year, vin, odometer_km, vehicle_id))
-        conn.commit()
-        conn.close()
+        """, (customer_id, make, model, year, vin, odometer_km, vehicle_id), "vehicles", "update", vehicle_id)
 
     def get_cached_vin(self, vin):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT make, model, year FROM vin_cache WHERE vin = ?", (vin,))
-        row = cursor.fetchone()
-        conn.close()
+        row = self._fetchone("SELECT make, model, year FROM vin_cache WHERE vin = ?", (vin,))
         return row if row else None
-    
-    
+
+
     def cache_vin(self, vin, make, model, year):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+        self._write("""
             INSERT OR REPLACE INTO vin_cache (vin, make, model, year)
             VALUES (?, ?, ?, ?)
-        """, (vin, make, model, year))
-        conn.commit()
-        conn.close()
+        """, (vin, make, model, year), "vin_cache", "update", vin)
+
+    def get_cached_vins(self, vins):
+        """{vin: (make, model, year, cached_at)} for those of `vins` that are cached."""
+        vins = list(dict.fromkeys(vins))
+        cached = {}
+        for start in range(0, len(vins), BATCH_SIZE):
+            chunk = vins[start:start + BATCH_SIZE]
+            for vin, *decoded in self._fetchall(f"""
+                SELECT vin, make, model, year, cached_at FROM vin_cache
+                WHERE vin IN ({",".join("?" * len(chunk))})
+            """, chunk):
+                cached[vin] = tuple(decoded)
+        return cached
+
+    def cache_vins(self, rows):
+        """Store many (vin, make, model, year) rows in one transaction, stamped now."""
+        with self.transaction() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO vin_cache (vin, make, model, year)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            self._changed("vin_cache", None, "update")
+
+    # —— invoices ——
+    def get_work_order_detail(self, work_order_id):
+        """
+        (id, created_at, completed_at, status, issue, notes, rate, customer
+        name, phone, email, make, model, year, vin, odometer_km) or None.
+        """
+        return self._fetchone("""
+            SELECT t.id, t.created_at, t.completed_at, t.status, t.issue, t.notes, t.rate,
+                c.first_name || ' ' || c.last_name, c.phone, c.email,
+                v.make, v.model, v.year, v.vin, COALESCE(NULLIF(t.odometer_km, 0), v.odometer_km)
+            FROM work_orders t
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            WHERE t.id = ?
+        """, (work_order_id,))
+
+    def get_work_orders_completed_between(self, start, end):
+        """Ids of orders completed in [start, end) (UTC "YYYY-MM-DD HH:MM:SS"), in completion order."""
+        return [row[0] for row in self._fetchall("""
+            SELECT id FROM work_orders
+            WHERE completed_at >= ? AND completed_at < ? AND status = 'Complete'
+            ORDER BY completed_at, id
+        """, (start, end))]
+
+    # —— reports ——
+    # start/end are UTC bounds from utc_bounds(); days are bucketed in local
+    # time. Revenue counts an order on the day it was completed.
+    def report_revenue_by_day(self, start, end):
+        """(day, orders, revenue, running revenue) for each day with completed orders."""
+        return self._fetchall("""
+            SELECT day, orders, revenue, SUM(revenue) OVER (ORDER BY day)
+            FROM (
+                SELECT date(t.completed_at, 'localtime') AS day,
+                    COUNT(*) AS orders,
+                    SUM(ifnull(tt.parts_total, 0) + ifnull(tt.total_hours, 0) * ifnull(t.rate, 0)) AS revenue
+                FROM work_orders t
+                LEFT JOIN work_order_totals tt ON tt.work_order_id = t.id
+                WHERE t.completed_at >= ? AND t.completed_at < ? AND t.status = 'Complete'
+                GROUP BY day
+            )
+            ORDER BY day
+        """, (start, end))
+
+    def report_ticket_summary(self, start, end):
+        """(orders, revenue, average ticket, largest ticket, parts revenue, labor revenue, hours billed)."""
+        return self._fetchone("""
+            SELECT COUNT(*), ifnull(SUM(ticket), 0), ifnull(AVG(ticket), 0), ifnull(MAX(ticket), 0),
+                ifnull(SUM(parts), 0), ifnull(SUM(labor), 0), ifnull(SUM(hours), 0)
+            FROM (
+                SELECT ifnull(tt.parts_total, 0) AS parts,
+                    ifnull(tt.total_hours, 0) AS hours,
+                    ifnull(tt.total_hours, 0) * ifnull(t.rate, 0) AS labor,
+                    ifnull(tt.parts_total, 0) + ifnull(tt.total_hours, 0) * ifnull(t.rate, 0) AS ticket
+                FROM work_orders t
+                LEFT JOIN work_order_totals tt ON tt.work_order_id = t.id
+                WHERE t.completed_at >= ? AND t.completed_at < ? AND t.status = 'Complete'
+            )
+        """, (start, end))
+
+    def report_mechanic_hours(self, first_day, last_day):
+        """
+        (mechanic, hours, work orders, share of all hours) logged on
+        first_day..last_day ("YYYY-MM-DD", inclusive), most hours first.
+        share is None when no hours were logged at all.
+        """
+        return self._fetchall("""
+            SELECT mechanic, ifnull(SUM(hours), 0), COUNT(DISTINCT work_order_id),
+                ifnull(SUM(hours), 0) / NULLIF(SUM(SUM(hours)) OVER (), 0)
+            FROM mechanic_hours
+            WHERE date BETWEEN ? AND ?
+            GROUP BY mechanic
+            ORDER BY 2 DESC
+        """, (first_day, last_day))
+
+    def report_top_parts(self, start, end, limit=10):
+        """(rank, part, quantity, spend, work orders) over orders completed in [start, end), by spend."""
+        return self._fetchall("""
+            SELECT RANK() OVER (ORDER BY SUM(p.cost) DESC), p.part_name,
+                SUM(p.quantity), SUM(p.cost), COUNT(DISTINCT p.work_order_id)
+            FROM work_orders t
+            JOIN work_order_parts p ON p.work_order_id = t.id
+            WHERE t.completed_at >= ? AND t.completed_at < ? AND t.status = 'Complete'
+            GROUP BY p.part_name
+            ORDER BY 1, 2
+            LIMIT ?
+        """, (start, end, limit))
+
+    # —— CSV export ——
+    def _export(self, select_sql, order, page_size, status=None, start=None, end=None):
+        """
+        Pages of select_sql (whose work-order alias is `t`), keyset-paged on
+        `order`, the id column each row starts with. start and end are
+        inclusive local days ("YYYY-MM-DD" or date) bounding the work
+        order's created_at, as in the reports (see utc_bounds).
+
+        Each page is its own statement, read to the end, so no read
+        transaction stays open between pages and writers from every
+        terminal get in while a long export runs. The pages are therefore
+        not one snapshot: a row written mid-export may or may not appear.
+        """
+        conditions, params = ["1"], ()
+        if status is not None:
+            conditions.append("t.status = ?")
+            params += (status,)
+        if start is not None:
+            conditions.append("t.created_at >= ?")
+            params += (utc_bounds(_as_date(start))[0],)
+        if end is not None:
+            conditions.append("t.created_at < ?")
+            params += (utc_bounds(_as_date(end))[1],)
+        where = " AND ".join(conditions)
+
+        def get_page(after_id, limit):
+            if after_id is None:
+                return self._fetchall(f"{select_sql} WHERE {where} ORDER BY {order} LIMIT ?", params + (limit,))
+            return self._fetchall(
+                f"{select_sql} WHERE {where} AND {order} > ? ORDER BY {order} LIMIT ?", params + (after_id, limit)
+            )
+        return self._iter_pages(get_page, lambda row: row[0], page_size)
+
+    def export_work_orders(self, status=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE):
+        return self._export("""
+            SELECT t.id, t.created_at, t.status,
+                c.first_name || ' ' || c.last_name, c.phone,
+                v.make, v.model, v.year, v.vin, t.odometer_km,
+                t.issue, t.notes, t.rate,
+                ifnull(tt.parts_total, 0), ifnull(tt.total_hours, 0),
+                ifnull(tt.parts_total, 0) + ifnull(tt.total_hours, 0) * ifnull(t.rate, 0)
+            FROM work_orders t
+            JOIN vehicles v ON t.vehicle_id = v.id
+            JOIN customers c ON v.customer_id = c.id
+            LEFT JOIN work_order_totals tt ON tt.work_order_id = t.id
+        """, "t.id", page_size, status, start, end)
+
+    def export_work_order_parts(self, status=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE):
+        """Parts of the work orders export_work_orders would include."""
+        return self._export("""
+            SELECT p.id, p.work_order_id, p.part_name, p.quantity, p.unit_price, p.cost, p.added_at
+            FROM work_order_parts p
+            JOIN work_orders t ON t.id = p.work_order_id
+        """, "p.id", page_size, status, start, end)
+
+    def export_mechanic_hours(self, status=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE):
+        """Hours logged on the work orders export_work_orders would include."""
+        return self._export("""
+            SELECT h.id, h.work_order_id, h.mechanic, h.hours, h.date
+            FROM mechanic_hours h
+            JOIN work_orders t ON t.id = h.work_order_id
+        """, "h.id", page_size, status, start, end)
+
+    def export_customers(self, page_size=EXPORT_PAGE_SIZE):
+        return self._export(
+            "SELECT t.id, t.first_name, t.last_name, t.phone, t.email FROM customers t", "t.id", page_size
+        )
+
+    def export_vehicles(self, page_size=EXPORT_PAGE_SIZE):
+        return self._export("""
+            SELECT t.id, t.customer_id, c.first_name || ' ' || c.last_name,
+                t.make, t.model, t.year, t.vin, t.odometer_km
+            FROM vehicles t
+            LEFT JOIN customers c ON c.id = t.customer_id
+        """, "t.id", page_size)
+
+    # —— calendar event cache ——
+    def get_calendar_events(self, calendar_id, start_utc, end_utc, limit=-1):
+        """
+        Cached event JSON for events overlapping [start_utc, end_utc), by start.
+        Bounds are ISO-8601 UTC strings as stored ("YYYY-MM-DDTHH:MM:SSZ").
+        """
+        return [row[0] for row in self._fetchall("""
+            SELECT data FROM calendar_events
+            WHERE calendar_id = ? AND start_utc < ? AND end_utc > ?
+            ORDER BY start_utc
+            LIMIT ?
+        """, (calendar_id, end_utc, start_utc, limit))]
+
+    def get_calendar_sync_state(self, calendar_id):
+        """(sync_token, synced_at) of the last sync, or None if never synced."""
+        return self._fetchone(
+            "SELECT sync_token, synced_at FROM calendar_sync_state WHERE calendar_id = ?", (calendar_id,)
+        )
+
+    def save_calendar_sync(self, calendar_id, events, deleted_ids, sync_token, full=False):
+        """
+        Apply one sync atomically. events are (event_id, start_utc, end_utc,
+        data) tuples; full=True replaces everything cached for the calendar.
+        """
+        with self.transaction() as conn:
+            if full:
+                conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,))
+            conn.executemany("""
+                INSERT OR REPLACE INTO calendar_events (calendar_id, event_id, start_utc, end_utc, data)
+                VALUES (?, ?, ?, ?, ?)
+            """, ((calendar_id,) + tuple(event) for event in events))
+            conn.executemany(
+                "DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?",
+                ((calendar_id, event_id) for event_id in deleted_ids),
+            )
+            conn.execute("""
+                INSERT OR REPLACE INTO calendar_sync_state (calendar_id, sync_token, synced_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, (calendar_id, sync_token))
+            if full or events or deleted_ids:
+                self._changed("calendar_events", None, "update")
 
     def get_history_by_vehicle(self, vehicle_id):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("""
+        return self._fetchall("""
             SELECT
               w.id,
               w.created_at,
@@ -430,14 +909,9 @@ class DBManager:
             WHERE w.vehicle_id = ?
             ORDER BY datetime(w.created_at) DESC
         """, (vehicle_id,))
-        rows = cur.fetchall()
-        conn.close()
-        return rows
 
     def get_history_by_customer(self, customer_id):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute("""
+        return self._fetchall("""
             SELECT
               w.id,
               w.created_at,
@@ -451,6 +925,50 @@ class DBManager:
             WHERE v.customer_id = ?
             ORDER BY datetime(w.created_at) DESC
         """, (customer_id,))
-        rows = cur.fetchall()
-        conn.close()
-        return rows
\ No newline at end of file
+
+    # —— change log (other terminals' writes) ——
+    def get_change_log_seq(self):
+        """seq of the newest change_log row, 0 if there is none."""
+        return self._fetchone(_LAST_SEQ_SQL)[0]
+
+    def get_changes_since(self, after_seq, limit=CHANGE_LOG_PAGE_SIZE):
+        """
+        Up to `limit` change_log rows after after_seq, oldest first, as
+        (seq, Change, local). local is True for rows written by a transaction
+        of this process, whose changes were already published here.
+        """
+        rows = self._fetchall(
+            "SELECT seq, table_name, row_id, op, parent FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+            (after_seq, limit),
+        )
+        with _local_seqs_lock:
+            ranges = _local_seqs.get(self.pool, ())
+            while ranges and ranges[0][1] <= after_seq:
+                ranges.popleft()
+            ranges = list(ranges)
+        return [
+            (seq, Change(table, row_id, op, parent), any(first <= seq <= last for first, last in ranges))
+            for seq, table, row_id, op, parent in rows
+        ]
+
+    def trim_change_log(self, days):
+        """Delete change_log rows logged more than `days` days ago."""
+        # Rows are logged in seq order, so everything before the first row
+        # inside the window is older. With no row inside it (a quiet spell)
+        # every row is older and all of them go.
+        with self.transaction() as conn:
+            conn.execute("""
+                DELETE FROM change_log
+                WHERE seq < ifnull(
+                    (SELECT seq FROM change_log WHERE changed_at >= datetime('now', ?) ORDER BY seq LIMIT 1),
+                    (SELECT MAX(seq) + 1 FROM change_log)
+                )
+            """, (f"-{int(days)} days",))
+
+    def get_data_version(self):
+        """
+        PRAGMA data_version of this thread's read connection: it changes
+        whenever another connection commits to the database, and costs no
+        table read.
+        """
+        return self.get_read_connection().execute("PRAGMA data_version").fetchone()[0]
@@ -0,0 +1,498 @@
+# model/migrations.py
+"""
+Ordered schema migrations, tracked in the schema_version table.
+
+Each step runs in its own transaction together with the row that records it,
+so a crash part-way through leaves the database at the previous version.
+Steps must also be safe on databases created before schema_version existed
+(those report version 0 and replay every step), hence the IF NOT EXISTS /
+column checks everywhere.
+"""
+import sqlite3
+
+
+def _column_names(conn, table):
+    return [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_column_if_missing(conn, table, column, ddl):
+    if column not in _column_names(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+# —— steps ——
+
+def _create_base_schema(conn):
+    # USERS
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password TEXT,
+            role TEXT
+        )
+    """)
+
+    # CUSTOMERS
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT,
+            last_name TEXT,
+            phone TEXT,
+            email TEXT
+        )
+    """)
+
+    # VEHICLES
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS vehicles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER,
+            make TEXT,
+            model TEXT,
+            year TEXT,
+            vin TEXT,
+            odometer_km INTEGER DEFAULT 0,
+            FOREIGN KEY(customer_id) REFERENCES customers(id)
+        )
+    """)
+
+    # WORK ORDERS
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vehicle_id INTEGER,
+            issue TEXT,
+            notes TEXT,
+            status TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            rate REAL DEFAULT 65.0,
+            hourly_rate REAL DEFAULT 100.0,
+            FOREIGN KEY(vehicle_id) REFERENCES vehicles(id)
+        )
+    """)
+
+    # SERVICES
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_order_services (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_order_id INTEGER,
+            service_type TEXT,
+            FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
+        )
+    """)
+
+    # MECHANIC HOURS
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mechanic_hours (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_order_id INTEGER,
+            mechanic TEXT,
+            hours REAL,
+            date TEXT,
+            FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
+        )
+    """)
+
+    # VIN Cache
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS vin_cache (
+            vin TEXT PRIMARY KEY,
+            make TEXT,
+            model TEXT,
+            year TEXT,
+            cached_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # PARTS
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_order_parts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_order_id INTEGER,
+            part_name TEXT,
+            quantity INTEGER,
+            unit_price REAL,
+            cost REAL DEFAULT 0.0,
+            added_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(work_order_id) REFERENCES work_orders(id)
+        )
+    """)
+
+
+def _add_odometer_columns(conn):
+    _add_column_if_missing(conn, "work_orders", "odometer_km", "INTEGER DEFAULT 0")
+    _add_column_if_missing(conn, "vehicles", "odometer_km", "INTEGER DEFAULT 0")
+
+
+def _add_work_order_rate(conn):
+    # Formerly patched by hand from the dashboard's "Run Migration" button.
+    _add_column_if_missing(conn, "work_orders", "rate", "REAL DEFAULT 65.0")
+
+
+# Secondary indexes owned by the migrations, by name. Each one backs a
+# DBManager access path; benchmarks/check_query_plans.py keeps them honest.
+INDEXES = {
+    # get_work_orders_by_status: WHERE status = ? ORDER BY id DESC
+    "idx_work_orders_status": "work_orders(status, id)",
+    # get_history_by_vehicle / get_history_by_customer: ORDER BY datetime(created_at)
+    "idx_work_orders_vehicle_created": "work_orders(vehicle_id, datetime(created_at))",
+    "idx_work_order_parts_work_order": "work_order_parts(work_order_id)",
+    "idx_mechanic_hours_work_order": "mechanic_hours(work_order_id)",
+    "idx_work_order_services_work_order": "work_order_services(work_order_id)",
+    "idx_vehicles_customer": "vehicles(customer_id)",
+    "idx_vehicles_year": "vehicles(year)",
+    "idx_customers_last_name": "customers(last_name)",
+    # get_customer_list: ORDER BY full_name
+    "idx_customers_full_name": "customers(first_name || ' ' || last_name)",
+    # get_calendar_events: WHERE calendar_id = ? AND start_utc < ?
+    "idx_calendar_events_start": "calendar_events(calendar_id, start_utc)",
+    # get_work_orders_completed_between: a day's completed orders for invoicing
+    "idx_work_orders_completed": "work_orders(completed_at)",
+    # reports: WHERE status = 'Complete' AND completed_at >= ? AND completed_at < ?
+    "idx_work_orders_status_completed": "work_orders(status, completed_at)",
+    # report_mechanic_hours: WHERE date BETWEEN ? AND ?, covering
+    "idx_mechanic_hours_date": "mechanic_hours(date, mechanic, hours, work_order_id)",
+}
+
+
+def _table_exists(conn, table):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def ensure_indexes(conn, indexes=None):
+    """
+    Create any missing index from the managed set. Indexes on tables or
+    columns that a later migration creates are skipped; that migration
+    ensures them.
+    """
+    for name, target in (indexes or INDEXES).items():
+        if not _table_exists(conn, target.split("(", 1)[0]):
+            continue
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        except sqlite3.OperationalError as e:
+            if "no such column" not in str(e):
+                raise
+
+
+def _create_indexes(conn):
+    ensure_indexes(conn)
+
+
+# Full-text search. Each FTS row's rowid is the id of the work order or
+# vehicle it indexes; triggers keep the denormalised names and vehicle
+# details current when any of the three source tables change.
+_WORK_ORDER_FTS_ROW = """
+    SELECT w.id,
+        ifnull(c.first_name, '') || ' ' || ifnull(c.last_name, ''),
+        ifnull(v.make, '') || ' ' || ifnull(v.model, '') || ' ' || ifnull(v.year, '') || ' ' || ifnull(v.vin, ''),
+        w.issue, w.notes
+    FROM work_orders w
+    LEFT JOIN vehicles v ON v.id = w.vehicle_id
+    LEFT JOIN customers c ON c.id = v.customer_id
+"""
+
+_VEHICLE_FTS_ROW = """
+    SELECT v.id, ifnull(c.first_name, '') || ' ' || ifnull(c.last_name, ''), v.make, v.model, v.year, v.vin
+    FROM vehicles v
+    LEFT JOIN customers c ON c.id = v.customer_id
+"""
+
+_FTS_TRIGGERS = {
+    "trg_work_orders_fts_insert": f"""
+        AFTER INSERT ON work_orders BEGIN
+            INSERT INTO work_order_fts (rowid, customer, vehicle, issue, notes)
+            {_WORK_ORDER_FTS_ROW} WHERE w.id = new.id;
+        END""",
+    "trg_work_orders_fts_update": f"""
+        AFTER UPDATE OF id, vehicle_id, issue, notes ON work_orders BEGIN
+            DELETE FROM work_order_fts WHERE rowid = old.id;
+            INSERT INTO work_order_fts (rowid, customer, vehicle, issue, notes)
+            {_WORK_ORDER_FTS_ROW} WHERE w.id = new.id;
+        END""",
+    "trg_work_orders_fts_delete": """
+        AFTER DELETE ON work_orders BEGIN
+            DELETE FROM work_order_fts WHERE rowid = old.id;
+        END""",
+    "trg_vehicles_fts_insert": f"""
+        AFTER INSERT ON vehicles BEGIN
+            INSERT INTO vehicle_fts (rowid, owner, make, model, year, vin)
+            {_VEHICLE_FTS_ROW} WHERE v.id = new.id;
+        END""",
+    "trg_vehicles_fts_update": f"""
+        AFTER UPDATE OF id, customer_id, make, model, year, vin ON vehicles BEGIN
+            DELETE FROM vehicle_fts WHERE rowid = old.id;
+            INSERT INTO vehicle_fts (rowid, owner, make, model, year, vin)
+            {_VEHICLE_FTS_ROW} WHERE v.id = new.id;
+            DELETE FROM work_order_fts WHERE rowid IN (SELECT id FROM work_orders WHERE vehicle_id = new.id);
+            INSERT INTO work_order_fts (rowid, customer, vehicle, issue, notes)
+            {_WORK_ORDER_FTS_ROW} WHERE w.vehicle_id = new.id;
+        END""",
+    "trg_vehicles_fts_delete": """
+        AFTER DELETE ON vehicles BEGIN
+            DELETE FROM vehicle_fts WHERE rowid = old.id;
+        END""",
+    "trg_customers_fts_update": f"""
+        AFTER UPDATE OF first_name, last_name ON customers BEGIN
+            UPDATE vehicle_fts SET owner = ifnull(new.first_name, '') || ' ' || ifnull(new.last_name, '')
+            WHERE rowid IN (SELECT id FROM vehicles WHERE customer_id = new.id);
+            UPDATE work_order_fts SET customer = ifnull(new.first_name, '') || ' ' || ifnull(new.last_name, '')
+            WHERE rowid IN (
+                SELECT w.id FROM vehicles v JOIN work_orders w ON w.vehicle_id = v.id
+                WHERE v.customer_id = new.id
+            );
+        END""",
+}
+
+
+def _create_search_index(conn):
+    # prefix='2 3' keeps short prefix queries ("ho*", "1hg*") off the slow path.
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS work_order_fts
+        USING fts5(customer, vehicle, issue, notes, prefix='2 3')
+    """)
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS vehicle_fts
+        USING fts5(owner, make, model, year, vin, prefix='2 3')
+    """)
+    # Names and vehicles outrank free-text notes.
+    conn.execute("INSERT INTO work_order_fts (work_order_fts, rank) VALUES ('rank', 'bm25(4.0, 4.0, 1.0, 0.5)')")
+    for name, body in _FTS_TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    conn.execute("DELETE FROM work_order_fts")
+    conn.execute(f"INSERT INTO work_order_fts (rowid, customer, vehicle, issue, notes) {_WORK_ORDER_FTS_ROW}")
+    conn.execute("DELETE FROM vehicle_fts")
+    conn.execute(f"INSERT INTO vehicle_fts (rowid, owner, make, model, year, vin) {_VEHICLE_FTS_ROW}")
+
+
+# Per-order parts cost and logged hours, kept current by triggers so list
+# screens can show totals without aggregating. Labour is hours × the order's
+# rate, applied when read, so a rate change needs no trigger.
+_TOTALS_TRIGGERS = {
+    "trg_work_orders_totals_insert": """
+        AFTER INSERT ON work_orders BEGIN
+            INSERT OR IGNORE INTO work_order_totals (work_order_id) VALUES (new.id);
+        END""",
+    "trg_work_orders_totals_delete": """
+        AFTER DELETE ON work_orders BEGIN
+            DELETE FROM work_order_totals WHERE work_order_id = old.id;
+        END""",
+}
+
+
+def _detail_totals_triggers(table, column, total):
+    # Recompute the affected order's total from its (few) detail rows rather
+    # than adjusting it by deltas, so it can never drift.
+    def recompute(row):
+        return f"""
+            UPDATE work_order_totals
+            SET {total} = (SELECT ifnull(SUM({column}), 0) FROM {table} WHERE work_order_id = {row}.work_order_id)
+            WHERE work_order_id = {row}.work_order_id;"""
+
+    return {
+        f"trg_{table}_totals_insert": f"AFTER INSERT ON {table} BEGIN{recompute('new')}\n        END",
+        f"trg_{table}_totals_update": (
+            f"AFTER UPDATE OF work_order_id, {column} ON {table} BEGIN{recompute('old')}{recompute('new')}\n        END"
+        ),
+        f"trg_{table}_totals_delete": f"AFTER DELETE ON {table} BEGIN{recompute('old')}\n        END",
+    }
+
+
+_TOTALS_TRIGGERS.update(_detail_totals_triggers("work_order_parts", "cost", "parts_total"))
+_TOTALS_TRIGGERS.update(_detail_totals_triggers("mechanic_hours", "hours", "total_hours"))
+
+
+def rebuild_totals(conn):
+    """Recompute work_order_totals from scratch."""
+    conn.execute("DELETE FROM work_order_totals")
+    conn.execute("""
+        INSERT INTO work_order_totals (work_order_id, parts_total, total_hours)
+        SELECT w.id,
+            (SELECT ifnull(SUM(cost), 0) FROM work_order_parts WHERE work_order_id = w.id),
+            (SELECT ifnull(SUM(hours), 0) FROM mechanic_hours WHERE work_order_id = w.id)
+        FROM work_orders w
+    """)
+
+
+def _create_totals_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS work_order_totals (
+            work_order_id INTEGER PRIMARY KEY,
+            parts_total REAL NOT NULL DEFAULT 0,
+            total_hours REAL NOT NULL DEFAULT 0
+        )
+    """)
+    for name, body in _TOTALS_TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    rebuild_totals(conn)
+
+
+def _create_calendar_cache(conn):
+    # Local copy of Google Calendar events, kept current with sync tokens by
+    # helpers/calendar_cache.py. data is the event resource as JSON.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS calendar_events (
+            calendar_id TEXT NOT NULL,
+            event_id TEXT NOT NULL,
+            start_utc TEXT,
+            end_utc TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (calendar_id, event_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS calendar_sync_state (
+            calendar_id TEXT PRIMARY KEY,
+            sync_token TEXT,
+            synced_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    ensure_indexes(conn)
+
+
+# completed_at follows status: stamped when an order becomes Complete (unless
+# inserted with one), cleared if it is reopened.
+_COMPLETED_AT_TRIGGERS = {
+    "trg_work_orders_completed_ai": """
+        AFTER INSERT ON work_orders WHEN new.status = 'Complete' AND new.completed_at IS NULL BEGIN
+            UPDATE work_orders SET completed_at = CURRENT_TIMESTAMP WHERE id = new.id;
+        END""",
+    "trg_work_orders_completed_au": """
+        AFTER UPDATE OF status ON work_orders WHEN new.status IS NOT old.status BEGIN
+            UPDATE work_orders
+            SET completed_at = CASE WHEN new.status = 'Complete' THEN CURRENT_TIMESTAMP END
+            WHERE id = new.id;
+        END""",
+}
+
+
+def _add_completed_at(conn):
+    _add_column_if_missing(conn, "work_orders", "completed_at", "TEXT")
+    for name, body in _COMPLETED_AT_TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    # Orders completed before this column existed: the last day hours were
+    # logged, else when the order was opened.
+    conn.execute("""
+        UPDATE work_orders
+        SET completed_at = COALESCE(
+            (SELECT datetime(MAX(date)) FROM mechanic_hours WHERE work_order_id = work_orders.id),
+            datetime(created_at)
+        )
+        WHERE status = 'Complete' AND completed_at IS NULL
+    """)
+    ensure_indexes(conn)
+
+
+# Cross-terminal change feed (helpers/change_feed.py). Triggers append a row
+# for every insert, update or delete on the tables screens watch, so another
+# terminal reads just the rows after the last seq it saw instead of
+# re-querying. AUTOINCREMENT keeps seq increasing even after old rows are
+# trimmed. parent is the owning work order of a detail row, as in
+# change_bus.Change. changed_at lets the log be trimmed by age.
+CHANGE_LOG_TABLES = {
+    "customers": None,
+    "vehicles": None,
+    "work_orders": None,
+    "work_order_parts": "work_order_id",
+    "mechanic_hours": "work_order_id",
+    "work_order_services": "work_order_id",
+}
+
+
+def _change_log_triggers(table, parent):
+    def log(op, row):
+        return f"""
+            INSERT INTO change_log (table_name, row_id, op, parent, changed_at)
+            VALUES ('{table}', {row}.id, '{op}', {f"{row}.{parent}" if parent else "NULL"}, CURRENT_TIMESTAMP);"""
+
+    return {
+        f"trg_{table}_change_log_insert": f"AFTER INSERT ON {table} BEGIN{log('insert', 'new')}\n        END",
+        f"trg_{table}_change_log_update": f"AFTER UPDATE ON {table} BEGIN{log('update', 'new')}\n        END",
+        f"trg_{table}_change_log_delete": f"AFTER DELETE ON {table} BEGIN{log('delete', 'old')}\n        END",
+    }
+
+
+def _create_change_log(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER,
+            op TEXT NOT NULL,
+            parent INTEGER,
+            changed_at TEXT
+        )
+    """)
+    for table, parent in CHANGE_LOG_TABLES.items():
+        for name, body in _change_log_triggers(table, parent).items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+# (version, description, step) — append only, never renumber.
+MIGRATIONS = [
+    (1, "base schema", _create_base_schema),
+    (2, "odometer_km on work_orders and vehicles", _add_odometer_columns),
+    (3, "rate on work_orders", _add_work_order_rate),
+    (4, "secondary indexes", _create_indexes),
+    (5, "full-text search over work orders and vehicles", _create_search_index),
+    (6, "trigger-maintained work_order_totals", _create_totals_table),
+    (7, "Google Calendar event cache", _create_calendar_cache),
+    (8, "completed_at on work_orders", _add_completed_at),
+    (9, "reporting indexes", _create_indexes),
+    (10, "trigger-maintained change_log for other terminals", _create_change_log),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def current_version(conn):
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not row:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(pool, migrations=MIGRATIONS, repair=False):
+    """
+    Bring the database behind pool up to date. Returns the versions applied.
+    repair=True also recreates any managed index that has gone missing and
+    recomputes work_order_totals.
+    """
+    applied = []
+    if current_version(pool.connection()) < migrations[-1][0]:
+        for version, description, step in migrations:
+            # BEGIN IMMEDIATE serialises terminals migrating the same file at
+            # once; re-check inside the lock so a step never runs twice.
+            with pool.transaction() as conn:
+                _ensure_version_table(conn)
+                if current_version(conn) >= version:
+                    continue
+                step(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description),
+                )
+            applied.append(version)
+
+    if repair:
+        with pool.transaction() as conn:
+            ensure_indexes(conn)
+            rebuild_totals(conn)
+    return applied
@@ -1,12 +1,104 @@
+import threading
 import tkinter as tk
 
+from model import change_bus
+
 class BaseFrame(tk.Frame):
     def __init__(self, master, controller):
         super().__init__(master)
         self.controller = controller
+        self.shown = False
+        self._timers = {}  # callback -> [interval_ms, after id or None]
+        self._unwatch = None
+        self._pending_changes = []
 
         # Ensure this only runs once per frame
         if not hasattr(self, 'ui_initialized') or not self.ui_initialized:
             if hasattr(self, 'setup_ui') and callable(self.setup_ui):
                 self.setup_ui()
             self.ui_initialized = True
+
+    def on_show(self):
+        """Called by AppController.show_frame when this frame is raised."""
+        self.shown = True
+        for callback, timer in self._timers.items():
+            if timer[1] is None:
+                timer[1] = self.after(timer[0], self._tick, callback)
+        self._apply_pending_changes()
+
+    def on_hide(self):
+        """Called when another frame is raised over this one; pauses every() timers."""
+        self.shown = False
+        for timer in self._timers.values():
+            if timer[1] is not None:
+                self.after_cancel(timer[1])
+                timer[1] = None
+
+    def every(self, interval_ms, callback):
+        """Call callback() every interval_ms, but only while this frame is shown."""
+        self._timers[callback] = [interval_ms, None]
+        if self.shown:
+            self._timers[callback][1] = self.after(interval_ms, self._tick, callback)
+
+    def _tick(self, callback):
+        timer = self._timers[callback]
+        timer[1] = self.after(timer[0], self._tick, callback)
+        try:
+            callback()
+        except Exception as e:
+            print(f"[{type(self).__name__} timer error]", e)
+
+    @property
+    def watching(self):
+        return self._unwatch is not None
+
+    def watch(self, *tables):
+        """
+        Keep this frame current from the change bus instead of refreshing on
+        every show. Writes to `tables` are passed to apply_changes() at once
+        while the frame is shown, or held until it is next shown; showing a
+        frame that nothing has changed under costs no queries.
+        """
+        self._unwatch = change_bus.subscribe(tables, self._on_changes)
+
+    def apply_changes(self, changes):
+        """Bring the frame up to date with a list of change_bus.Change. Defaults to refresh_data()."""
+        self.refresh_data()
+
+    def _on_changes(self, changes):
+        # Runs on the thread that committed. A worker hands the batch to the
+        # Tk thread (tkinter queues after() calls from other threads for the
+        # main loop), so the frame's state is only ever touched there. The
+        # root's after() rather than ours: a frame destroyed meanwhile
+        # unregisters its own callbacks.
+        if threading.current_thread() is threading.main_thread():
+            self._receive_changes(changes)
+        else:
+            self._root().after(0, self._receive_changes, changes)
+
+    def _receive_changes(self, changes):
+        if self._unwatch is None:
+            return  # destroyed since the write
+        self._pending_changes.extend(changes)
+        if self.shown:
+            self._apply_pending_changes()
+
+    def _apply_pending_changes(self):
+        changes, self._pending_changes = self._pending_changes, []
+        if changes:
+            try:
+                self.apply_changes(changes)
+            except Exception as e:
+                print(f"[{type(self).__name__} change error]", e)
+
+    def can_evict(self):
+        """False while destroying this hidden frame would lose the user's work; AppController then keeps it."""
+        return True
+
+    def destroy(self):
+        # Pending after() callbacks would otherwise fire into a dead frame.
+        self.on_hide()
+        if self._unwatch:
+            self._unwatch()
+            self._unwatch = None
+        super().destroy()
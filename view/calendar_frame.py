@@ -7,14 +7,20 @@ from dateutil import parser
 import webbrowser
 
 from view.base_frame import BaseFrame
-from helpers.google_calendar_helper import build_service
+from helpers.google_calendar_helper import get_service
+from helpers.calendar_cache import CalendarCache
 
 
 class CalendarFrame(BaseFrame):
+    SYNC_INTERVAL_MS = 5 * 60 * 1000  # while the calendar is on screen
+
     def __init__(self, master, controller):
-        self.google_service = build_service()
+        # The Google service is built on a worker the first time we sync, so
+        # the screen opens straight away on the cached events.
+        self.cache = CalendarCache()
+        self._shown_range = None  # (time_min, time_max, error_title) of the events list
+        self._sync_task = None
         self.event_links = {}  # Store Treeview item ID -> event URL
-        self._last_displayed = None  # For calendar month polling
         super().__init__(master, controller)
 
     def _go_back(self):
@@ -27,10 +33,14 @@ class CalendarFrame(BaseFrame):
 
         self.cal = Calendar(self, selectmode="day", date_pattern="yyyy-mm-dd")
         self.cal.pack(pady=10)
+        self.cal.bind("<<CalendarMonthChanged>>", lambda e: self._highlight_calendar_days())
 
         ttk.Button(self, text="🗓 View Events for Selected Day", command=self._load_selected_day).pack()
         ttk.Button(self, text="🗓 Show This Week's Events", command=self._load_week_events).pack(pady=10)
 
+        self.sync_label = ttk.Label(self, text="", foreground="gray")
+        self.sync_label.pack()
+
         self.events_list = ttk.Treeview(
             self,
             columns=("Start", "Summary", "Customer", "Vehicle"),
@@ -44,150 +54,153 @@ class CalendarFrame(BaseFrame):
         self.events_list.pack(fill="both", expand=True, padx=10, pady=5)
 
         self.events_list.bind("<Double-1>", self._open_selected_event)
-        self._poll_calendar_month()
+        self.every(self.SYNC_INTERVAL_MS, self._sync)
 
     def refresh_data(self):
+        # Show the cached copy straight away, then pull what changed since.
         self._load_week_events()
         self._highlight_calendar_days()
+        self._sync()
+
+    def _sync(self):
+        # One sync at a time: the first can sit in Google's sign-in flow for
+        # as long as the user takes, and each queued one would hold one of
+        # the executor's shared workers.
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        self.sync_label.config(text="Syncing with Google Calendar…")
+        self._sync_task = self.controller.executor.submit(
+            self._pull_changes, on_done=self._sync_done, on_error=self._sync_failed, key="calendar.sync"
+        )
+
+    def _pull_changes(self):
+        # Runs on a worker.
+        if self.cache.service is None:
+            self.cache.service = get_service()
+        return self.cache.sync()
+
+    def _sync_done(self, changed):
+        self._show_sync_status()
+        if changed:
+            self._load_events(*self._shown_range)
+            self._highlight_calendar_days()
+
+    def _sync_failed(self, error):
+        self._show_sync_status(offline=True)
+        print("Calendar sync error:", error)
+
+    def _show_sync_status(self, offline=False):
+        synced = self.cache.last_synced()
+        when = self._format_event_time(synced) if synced else "never"
+        prefix = "Offline – showing events" if offline else "Events"
+        self.sync_label.config(text=f"{prefix} last synced {when}")
 
     def _load_week_events(self):
         now = datetime.utcnow().isoformat() + "Z"
         week_later = (datetime.utcnow() + timedelta(days=7)).isoformat() + "Z"
-
-        self.events_list.delete(*self.events_list.get_children())
-        self.event_links.clear()
-
-        try:
-            events_result = self.google_service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                timeMax=week_later,
-                maxResults=20,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
-            if not events:
-                self.events_list.insert("", "end", values=("No events", "", "", ""))
-                return
-
-            for event in events:
-                raw_start = event['start'].get('dateTime', event['start'].get('date'))
-                start = self._format_event_time(raw_start)
-                summary = event.get('summary', 'No Title').replace("[RTF]", "").strip()
-                description = event.get("description", "")
-
-                customer = vehicle = ""
-                for line in description.split("\n"):
-                    line = line.strip()
-                    if line.lower().startswith("customer & vehicle"):
-                        vehicle_line = line.split(":", 1)[1].strip()
-                        if " " in vehicle_line:
-                            parts = vehicle_line.split(" ", 1)
-                            customer, vehicle = parts[0].strip(), parts[1].strip()
-                        else:
-                            customer, vehicle = "Unknown", vehicle_line
-                    elif line.lower().startswith("customer"):
-                        customer = line.split(":", 1)[1].strip()
-                    elif line.lower().startswith("vehicle"):
-                        vehicle = line.split(":", 1)[1].strip()
-
-                item_id = self.events_list.insert("", "end", values=(start, summary, customer, vehicle))
-                self.event_links[item_id] = event.get("htmlLink", "")
-
-        except Exception as e:
-            messagebox.showerror("Google Calendar Error", str(e))
+        self._load_events(now, week_later, "Google Calendar Error")
 
     def _load_selected_day(self):
         selected_date = self.cal.get_date()
         start = f"{selected_date}T00:00:00-07:00"
         end = f"{selected_date}T23:59:59-07:00"
+        self._load_events(start, end, "Calendar Error")
+
+    def _load_events(self, time_min, time_max, error_title):
+        self._shown_range = (time_min, time_max, error_title)
+        # Week and day views share a key, so whichever was asked for last wins.
+        self.controller.executor.submit(
+            self._fetch_events, time_min, time_max,
+            on_done=self._show_events,
+            on_error=lambda e: messagebox.showerror(error_title, str(e)),
+            key="calendar.events",
+        )
 
+    def _list_events(self, timeMin, timeMax, maxResults=None):
+        # Runs on a worker. Returns (events, complete): ranges older than the
+        # cache keeps come from Google directly, or only partly, from the
+        # cache, while offline.
+        if self.cache.covers(timeMin):
+            return self.cache.events_between(timeMin, timeMax, maxResults), True
+        if self.cache.service is not None:
+            try:
+                return self.cache.fetch_between(timeMin, timeMax, maxResults), True
+            except Exception as e:
+                print("Calendar fetch error:", e)
+        return self.cache.events_between(timeMin, timeMax, maxResults), False
+
+    def _fetch_events(self, time_min, time_max):
+        rows = []
+        events, complete = self._list_events(timeMin=time_min, timeMax=time_max, maxResults=20)
+        for event in events:
+            raw_start = event['start'].get('dateTime', event['start'].get('date'))
+            start = self._format_event_time(raw_start)
+            summary = event.get('summary', 'No Title').replace("[RTF]", "").strip()
+            description = event.get("description", "")
+
+            customer = vehicle = ""
+            for line in description.split("\n"):
+                line = line.strip()
+                if line.lower().startswith("customer & vehicle"):
+                    vehicle_line = line.split(":", 1)[1].strip()
+                    if " " in vehicle_line:
+                        parts = vehicle_line.split(" ", 1)
+                        customer, vehicle = parts[0].strip(), parts[1].strip()
+                    else:
+                        customer, vehicle = "Unknown", vehicle_line
+                elif line.lower().startswith("customer"):
+                    customer = line.split(":", 1)[1].strip()
+                elif line.lower().startswith("vehicle"):
+                    vehicle = line.split(":", 1)[1].strip()
+
+            rows.append((start, summary, customer, vehicle, event.get("htmlLink", "")))
+        return rows, complete
+
+    def _show_events(self, result):
+        rows, complete = result
+        self._show_coverage(complete)
         self.events_list.delete(*self.events_list.get_children())
         self.event_links.clear()
-
-        try:
-            events_result = self.google_service.events().list(
-                calendarId='primary',
-                timeMin=start,
-                timeMax=end,
-                maxResults=20,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
-            if not events:
-                self.events_list.insert("", "end", values=("No events", "", "", ""))
-                return
-
-            for event in events:
-                raw_start = event['start'].get('dateTime', event['start'].get('date'))
-                start = self._format_event_time(raw_start)
-                summary = event.get('summary', 'No Title').replace("[RTF]", "").strip()
-
-                description = event.get("description", "")
-                customer = vehicle = ""
-
-                for line in description.split("\n"):
-                    line = line.strip()
-                    if line.lower().startswith("customer & vehicle"):
-                        vehicle_line = line.split(":", 1)[1].strip()
-                        if " " in vehicle_line:
-                            parts = vehicle_line.split(" ", 1)
-                            customer, vehicle = parts[0].strip(), parts[1].strip()
-                        else:
-                            customer, vehicle = "Unknown", vehicle_line
-
-                item_id = self.events_list.insert("", "end", values=(start, summary, customer, vehicle))
-                self.event_links[item_id] = event.get("htmlLink", "")
-
-        except Exception as e:
-            messagebox.showerror("Calendar Error", str(e))
+        if not rows:
+            self.events_list.insert("", "end", values=("No events", "", "", ""))
+            return
+        for *values, link in rows:
+            item_id = self.events_list.insert("", "end", values=values)
+            self.event_links[item_id] = link
 
     def _highlight_calendar_days(self):
-        try:
-            month, year = self.cal.get_displayed_month()
-            first_date = datetime(year, month, 1)
-            last_date = (first_date + timedelta(days=40)).replace(day=1) - timedelta(days=1)
-
-            time_min = first_date.isoformat() + "Z"
-            time_max = last_date.isoformat() + "Z"
-
-            events_result = self.google_service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            self.cal.calevent_remove('all')
-            events = events_result.get('items', [])
-
-            for event in events:
-                raw = event['start'].get('dateTime', event['start'].get('date'))
-                dt = parser.parse(raw)
-                summary = event.get("summary", "Event").replace("[RTF]", "").strip()
-                description = event.get("description", "")
-                label = f"{summary}\n{description}"
-                self.cal.calevent_create(dt.date(), label, "service")
-
-            self.cal.tag_config("service", background="lightblue", foreground="black")
-
-        except Exception as e:
-            messagebox.showerror("Calendar Highlight Error", str(e))
-
-    def _poll_calendar_month(self):
-        try:
-            current = self.cal.get_displayed_month()
-            if current != self._last_displayed:
-                self._last_displayed = current
-                self._highlight_calendar_days()
-        except Exception as e:
-            print("Polling error:", e)
-        self.after(500, self._poll_calendar_month)
+        month, year = self.cal.get_displayed_month()
+        first_date = datetime(year, month, 1)
+        last_date = (first_date + timedelta(days=40)).replace(day=1) - timedelta(days=1)
+
+        self.controller.executor.submit(
+            self._list_events,
+            timeMin=first_date.isoformat() + "Z",
+            timeMax=last_date.isoformat() + "Z",
+            on_done=self._show_month_events,
+            on_error=lambda e: messagebox.showerror("Calendar Highlight Error", str(e)),
+            key="calendar.month",
+        )
+
+    def _show_month_events(self, result):
+        events, complete = result
+        self._show_coverage(complete)
+        self.cal.calevent_remove('all')
+        for event in events:
+            raw = event['start'].get('dateTime', event['start'].get('date'))
+            dt = parser.parse(raw)
+            summary = event.get("summary", "Event").replace("[RTF]", "").strip()
+            description = event.get("description", "")
+            label = f"{summary}\n{description}"
+            self.cal.calevent_create(dt.date(), label, "service")
+
+        self.cal.tag_config("service", background="lightblue", foreground="black")
+
+    def _show_coverage(self, complete):
+        if not complete:
+            self.sync_label.config(
+                text=f"Offline – events older than {self.cache.FULL_SYNC_DAYS} days are not cached and may be missing"
+            )
 
     def _open_selected_event(self, event):
         selected = self.events_list.focus()
@@ -1,9 +1,13 @@
 # view/completed_work_orders_frame.py
 
+import pathlib
+import webbrowser
 from tkinter import ttk, messagebox
 from view.base_frame import BaseFrame
-from model.db_manager import DBManager
+from model.db_manager import DBManager, WORK_ORDER_ROW_TABLES
 from view.dashboard_frame import DashboardFrame
+from view.virtual_tree import VirtualTreeview, KeysetRowProvider
+from helpers.invoice_pdf import INVOICE_DIR, load_invoice, render_day, render_invoices
 
 class CompletedWorkOrdersFrame(BaseFrame):
     def __init__(self, master, controller):
@@ -13,7 +17,8 @@ class CompletedWorkOrdersFrame(BaseFrame):
         if not hasattr(self, "ui_initialized"):
             self.setup_ui()
         self.ui_initialized = True
-        self.refresh_data()
+        # No refresh_data() here: show_frame loads a newly created frame.
+        self.watch(*WORK_ORDER_ROW_TABLES)
 
 
 
@@ -22,31 +27,38 @@ class CompletedWorkOrdersFrame(BaseFrame):
         ttk.Button(self, text="← Back to Dashboard", command=self._go_back).pack(pady=5, anchor="w")
         ttk.Label(self, text="Completed Work Orders", font=("Segoe UI", 16)).pack(pady=10)
 
-        self.tree = ttk.Treeview(self, columns=("ID", "Vehicle", "Issue", "Notes", "Status", "Rate"), show="headings")
+        self.vlist = VirtualTreeview(
+            self, columns=("ID", "Vehicle", "Issue", "Notes", "Status", "Rate", "Total"),
+            provider=KeysetRowProvider(
+                lambda after, limit: self.db.get_work_orders_page(after, limit, status="Complete"),
+                lambda: self.db.count_work_orders("Complete"),
+                key_at=lambda offset: self.db.get_work_order_key_at(offset, "Complete"),
+            ),
+            values=lambda row: row[:6] + (f"${row[6]:.2f}",),
+            on_select=self._on_select,
+        )
+        self.tree = self.vlist.tree
         for col in self.tree["columns"]:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
-        self.tree.pack(expand=True, fill="both", padx=10, pady=5)
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.vlist.pack(expand=True, fill="both", padx=10, pady=5)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(pady=10)
 
         ttk.Button(button_frame, text="↺ Return to In Progress", command=self._return_to_in_progress).grid(row=0, column=0, padx=10)
         ttk.Button(button_frame, text="❌ Delete Work Order", command=self._delete_work_order).grid(row=0, column=1, padx=10)
+        ttk.Button(button_frame, text="🧾 Invoice PDF", command=self._invoice_selected).grid(row=0, column=2, padx=10)
+        ttk.Button(button_frame, text="🖨 Today's Invoices", command=self._invoice_today).grid(row=0, column=3, padx=10)
 
     def _go_back(self):
         self.controller.show_frame(DashboardFrame)
 
-    def _on_select(self, event):
-        selected = self.tree.focus()
-        if selected:
-            self.selected_order_id = int(self.tree.item(selected, "values")[0])
+    def _on_select(self, row):
+        self.selected_order_id = int(row[0])
 
     def refresh_data(self):
-        self.tree.delete(*self.tree.get_children())
-        for row in self.db.get_work_orders_by_status("Complete"):
-            self.tree.insert("", "end", values=row)
+        self.vlist.refresh()
 
 
     def _return_to_in_progress(self):
@@ -54,7 +66,39 @@ class CompletedWorkOrdersFrame(BaseFrame):
             messagebox.showinfo("Select", "Select a work order first.")
             return
         self.db.update_work_order_status(self.selected_order_id, "In Progress")
-        self.refresh_data()
+        self.selected_order_id = None
+        self.vlist.clear_selection()
+
+    def _invoice_selected(self):
+        if not self.selected_order_id:
+            messagebox.showinfo("Select", "Select a work order to invoice.")
+            return
+        self.controller.executor.submit(
+            self._render_invoice, self.selected_order_id,
+            on_done=lambda path: webbrowser.open(pathlib.Path(path).as_uri()),
+            on_error=lambda e: messagebox.showerror("Invoice Error", str(e)),
+            key="invoices.one",
+        )
+
+    def _render_invoice(self, wo_id):
+        # Runs on a worker; the order may have been deleted, e.g. from another terminal.
+        invoice = load_invoice(self.db, wo_id)
+        if invoice is None:
+            raise LookupError(f"Work order #{wo_id} no longer exists.")
+        return render_invoices([invoice])[0]
+
+    def _invoice_today(self):
+        def _done(paths):
+            if paths:
+                messagebox.showinfo("Invoices", f"{len(paths)} invoices saved to {INVOICE_DIR}")
+            else:
+                messagebox.showinfo("Invoices", "No work orders were completed today.")
+
+        self.controller.executor.submit(
+            render_day, on_done=_done,
+            on_error=lambda e: messagebox.showerror("Invoice Error", str(e)),
+            key="invoices.day",
+        )
 
     def _delete_work_order(self):
         if not self.selected_order_id:
@@ -63,4 +107,5 @@ class CompletedWorkOrdersFrame(BaseFrame):
         confirm = messagebox.askyesno("Delete", "Are you sure you want to permanently delete this work order?")
         if confirm:
             self.db.delete_work_order(self.selected_order_id)
-            self.refresh_data()
+            self.selected_order_id = None
+            self.vlist.clear_selection()
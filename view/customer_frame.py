@@ -2,10 +2,12 @@
 from view.base_frame import BaseFrame
 from tkinter import ttk, messagebox
 from model.db_manager import DBManager
+from view.virtual_tree import VirtualTreeview, KeysetRowProvider
 
 class CustomerFrame(BaseFrame):
     def __init__(self, master, controller):
         super().__init__(master, controller)
+        self.watch("customers")
 
     def _go_back(self):
         from view.dashboard_frame import DashboardFrame
@@ -15,12 +17,20 @@ class CustomerFrame(BaseFrame):
         ttk.Button(self, text="← Back to Dashboard", command=self._go_back).pack(pady=5, anchor="w")
         ttk.Label(self, text="Customer Management", font=("Segoe UI", 16)).pack(pady=10)
 
-        self.tree = ttk.Treeview(self, columns=("ID", "First", "Last", "Phone", "Email"), show="headings")
+        db = DBManager()
+        self.vlist = VirtualTreeview(
+            self, columns=("ID", "First", "Last", "Phone", "Email"),
+            provider=KeysetRowProvider(
+                db.get_customers_page, db.count_customers, page_key=lambda row: (row[2], row[0]),
+                key_at=db.get_customer_key_at,
+            ),
+            on_select=self._on_select,
+        )
+        self.tree = self.vlist.tree
         for col in self.tree["columns"]:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=140)
-        self.tree.pack(pady=5, expand=True, fill="both")
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.vlist.pack(pady=5, expand=True, fill="both")
 
         form = ttk.Frame(self)
         form.pack(pady=5)
@@ -47,24 +57,23 @@ class CustomerFrame(BaseFrame):
         command=self.open_history).pack(pady=5)
 
     def refresh_data(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for row in DBManager().get_all_customers():
-            self.tree.insert("", "end", values=row)
+        self.vlist.clear_selection()
+        self.vlist.refresh()
         self._clear_form()
 
-    def _on_select(self, event):
-        selected = self.tree.focus()
-        if selected:
-            data = self.tree.item(selected, "values")
-            self.first.delete(0, "end")
-            self.first.insert(0, data[1])
-            self.last.delete(0, "end")
-            self.last.insert(0, data[2])
-            self.phone.delete(0, "end")
-            self.phone.insert(0, data[3])
-            self.email.delete(0, "end")
-            self.email.insert(0, data[4])
+    def apply_changes(self, changes):
+        # Re-read the rows on screen; the selection and form are kept.
+        self.vlist.refresh()
+
+    def _on_select(self, data):
+        self.first.delete(0, "end")
+        self.first.insert(0, data[1] or "")
+        self.last.delete(0, "end")
+        self.last.insert(0, data[2] or "")
+        self.phone.delete(0, "end")
+        self.phone.insert(0, data[3] or "")
+        self.email.delete(0, "end")
+        self.email.insert(0, data[4] or "")
 
     def _clear_form(self):
         for entry in [self.first, self.last, self.phone, self.email]:
@@ -75,16 +84,16 @@ class CustomerFrame(BaseFrame):
             DBManager().add_customer(
                 self.first.get(), self.last.get(), self.phone.get(), self.email.get()
             )
-            self.refresh_data()
+            self._clear_form()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def _update_customer(self):
-        selected = self.tree.focus()
+        selected = self.vlist.selected_row()
         if not selected:
             messagebox.showinfo("Select Customer", "Please select a customer to update.")
             return
-        cust_id = self.tree.item(selected, "values")[0]
+        cust_id = selected[0]
         try:
             DBManager().update_customer(
                 cust_id,
@@ -93,25 +102,24 @@ class CustomerFrame(BaseFrame):
                 self.phone.get(),
                 self.email.get()
             )
-            self.refresh_data()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def _delete_customer(self):
-        selected = self.tree.focus()
+        selected = self.vlist.selected_row()
         if not selected:
             messagebox.showinfo("Select Customer", "Please select a customer to delete.")
             return
-        cust_id = self.tree.item(selected, "values")[0]
+        cust_id = selected[0]
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure?")
         if confirm:
             DBManager().delete_customer(cust_id)
             self.refresh_data()
     def open_history(self):
-        selected = self.tree.selection()
+        selected = self.vlist.selected_row()
         if not selected:
             messagebox.showwarning("Select Customer", "Please select a customer first.")
             return
-        cid = self.tree.item(selected[0])["values"][0]
+        cid = selected[0]
         from view.history_frame import HistoryFrame
         self.controller.show_frame(HistoryFrame, mode="customer", entity_id=cid)
\ No newline at end of file
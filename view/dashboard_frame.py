@@ -1,7 +1,10 @@
 # view/dashboard_frame.py
+import importlib
 from view.base_frame import BaseFrame
 from tkinter import ttk, messagebox
 from model.db_manager import DBManager
+from model import migrations
+from view.export_popup import open_export_popup
 
 class DashboardFrame(BaseFrame):
     def __init__(self, master, controller):
@@ -12,35 +15,36 @@ class DashboardFrame(BaseFrame):
         btns = ttk.Frame(self)
         btns.pack(pady=20)
 
-        from view.customer_frame import CustomerFrame
-        from view.vehicle_frame import VehicleFrame
-        from view.work_order_frame import WorkOrderFrame
-        from view.calendar_frame import CalendarFrame
-        from view.completed_work_orders_frame import CompletedWorkOrdersFrame
-        from view.in_progress_work_order_list_frame import InProgressOrdersListFrame
-
-        ttk.Button(btns, text="Customers", command=lambda: self.controller.show_frame(CustomerFrame)).pack(fill="x", pady=2)
-        ttk.Button(btns, text="Vehicles", command=lambda: self.controller.show_frame(VehicleFrame)).pack(fill="x", pady=2)
-        ttk.Button(btns, text="Work Orders", command=lambda: self.controller.show_frame(WorkOrderFrame)).pack(fill="x", pady=2)
-        ttk.Button(btns, text="✔ Completed Orders", command=lambda: self.controller.show_frame(CompletedWorkOrdersFrame)).pack(fill="x", pady=2)
-        ttk.Button(btns, text="🛠 In Progress Orders", command=lambda: self.controller.show_frame(InProgressOrdersListFrame)).pack(fill="x", pady=2)
-        ttk.Button(btns, text="Calendar", command=lambda: self.controller.show_frame(CalendarFrame)).pack(fill="x", pady=2)
+        # Screens are imported on first use: the calendar alone pulls in
+        # tkcalendar, dateutil and the Google client libraries.
+        screens = [
+            ("Customers", "view.customer_frame", "CustomerFrame"),
+            ("Vehicles", "view.vehicle_frame", "VehicleFrame"),
+            ("Work Orders", "view.work_order_frame", "WorkOrderFrame"),
+            ("✔ Completed Orders", "view.completed_work_orders_frame", "CompletedWorkOrdersFrame"),
+            ("🛠 In Progress Orders", "view.in_progress_work_order_list_frame", "InProgressOrdersListFrame"),
+            ("Calendar", "view.calendar_frame", "CalendarFrame"),
+            ("📊 Reports", "view.reports_frame", "ReportsFrame"),
+        ]
+        for text, module, name in screens:
+            ttk.Button(btns, text=text, command=lambda m=module, n=name: self._open(m, n)).pack(fill="x", pady=2)
+        ttk.Button(btns, text="📤 Export CSV", command=lambda: open_export_popup(self.controller)).pack(fill="x", pady=2)
         ttk.Button(self, text="⚙ Run Migration", command=self.run_migration).pack(pady=5)
         ttk.Button(self, text="Logout", command=self.controller.logout).pack(pady=10)
 
+    def _open(self, module, name):
+        try:
+            frame_class = getattr(importlib.import_module(module), name)
+        except ImportError as e:
+            messagebox.showerror("Unavailable", f"This screen could not be loaded:\n{e}")
+            return
+        self.controller.show_frame(frame_class)
+
     def run_migration(self):
         try:
             db = DBManager()
-            db.rebuild_mechanic_hours()
-            # Patch: add 'rate' column to work_orders if missing
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(work_orders)")
-            columns = [col[1] for col in cursor.fetchall()]
-            if "rate" not in columns:
-                cursor.execute("ALTER TABLE work_orders ADD COLUMN rate REAL DEFAULT 65.0")
-                conn.commit()
-            conn.close()
-
+            db._run_migrations(force=True)
+            version = migrations.current_version(db.get_connection())
+            messagebox.showinfo("Migration", f"Database schema is up to date (version {version}).")
         except Exception as e:
             messagebox.showerror("Migration Error", str(e))
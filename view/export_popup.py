@@ -0,0 +1,92 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, filedialog, messagebox
+
+from helpers.csv_export import EXPORT_DIR, EXPORTS, export_csv
+
+STATUSES = ["All", "Scheduled", "In Progress", "Complete"]
+
+
+def _parse_date(text, label):
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(f"{label} must be a date like 2024-01-31.")
+
+
+def open_export_popup(controller):
+    popup = tk.Toplevel()
+    popup.title("Export to CSV")
+    popup.resizable(False, False)
+
+    filters = ttk.LabelFrame(popup, text="Work orders")
+    filters.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+    ttk.Label(filters, text="Status").grid(row=0, column=0, padx=5, pady=3, sticky="w")
+    status_var = tk.StringVar(value="All")
+    ttk.Combobox(filters, textvariable=status_var, values=STATUSES, state="readonly", width=14).grid(
+        row=0, column=1, padx=5, pady=3, sticky="w"
+    )
+    ttk.Label(filters, text="From (YYYY-MM-DD)").grid(row=1, column=0, padx=5, pady=3, sticky="w")
+    start_entry = ttk.Entry(filters, width=16)
+    start_entry.grid(row=1, column=1, padx=5, pady=3, sticky="w")
+    ttk.Label(filters, text="To (YYYY-MM-DD)").grid(row=2, column=0, padx=5, pady=3, sticky="w")
+    end_entry = ttk.Entry(filters, width=16)
+    end_entry.grid(row=2, column=1, padx=5, pady=3, sticky="w")
+
+    tables = ttk.LabelFrame(popup, text="Files")
+    tables.grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+    table_vars = {name: tk.BooleanVar(value=True) for name in EXPORTS}
+    for i, (name, var) in enumerate(table_vars.items()):
+        ttk.Checkbutton(tables, text=name.replace("_", " ").title(), variable=var).grid(
+            row=i // 3, column=i % 3, padx=5, pady=2, sticky="w"
+        )
+
+    folder_var = tk.StringVar(value=EXPORT_DIR)
+    folder_row = ttk.Frame(popup)
+    folder_row.grid(row=2, column=0, padx=10, pady=5, sticky="ew")
+    ttk.Entry(folder_row, textvariable=folder_var, width=40).pack(side="left", fill="x", expand=True)
+    ttk.Button(
+        folder_row, text="Browse…",
+        command=lambda: folder_var.set(filedialog.askdirectory(initialdir=folder_var.get()) or folder_var.get()),
+    ).pack(side="left", padx=5)
+
+    status_label = ttk.Label(popup, text="", foreground="gray")
+    status_label.grid(row=3, column=0, padx=10, sticky="w")
+
+    def done(written):
+        status_label.config(text="")
+        export_btn.config(state="normal")
+        lines = [f"{name}: {rows:,} rows → {path}" for name, (path, rows) in written.items()]
+        messagebox.showinfo("Export Complete", "\n".join(lines), parent=popup)
+
+    def failed(e):
+        status_label.config(text="")
+        export_btn.config(state="normal")
+        messagebox.showerror("Export Error", str(e), parent=popup)
+
+    def submit():
+        try:
+            start = _parse_date(start_entry.get(), "From")
+            end = _parse_date(end_entry.get(), "To")
+        except ValueError as e:
+            messagebox.showerror("Invalid Date", str(e), parent=popup)
+            return
+        names = [name for name, var in table_vars.items() if var.get()]
+        if not names:
+            messagebox.showerror("Nothing Selected", "Choose at least one file to export.", parent=popup)
+            return
+        status = None if status_var.get() == "All" else status_var.get()
+
+        status_label.config(text="⏳ Exporting…")
+        export_btn.config(state="disabled")
+        # Files are written on a worker, a page of rows at a time.
+        controller.executor.submit(
+            export_csv, names, folder_var.get(), status, start, end,
+            on_done=done, on_error=failed, key="export.csv",
+        )
+
+    export_btn = ttk.Button(popup, text="Export", command=submit)
+    export_btn.grid(row=4, column=0, padx=10, pady=10, sticky="ew")
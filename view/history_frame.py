@@ -3,6 +3,7 @@
 import tkinter as tk
 from tkinter import ttk
 from view.base_frame import BaseFrame
+from view.tree_sync import TreeSync
 from model.db_manager import DBManager
 from view.dashboard_frame import DashboardFrame
 
@@ -38,6 +39,7 @@ class HistoryFrame(BaseFrame):
         # BaseFrame.__init__ calls setup_ui(), but does NOT load data
         # So we load data once here:
         self.load_history()
+        self.watch("work_orders", "vehicles")
 
     def setup_ui(self):
         # — Nav + Refresh bar —
@@ -66,6 +68,7 @@ class HistoryFrame(BaseFrame):
             self.tree.heading(c, text=c)
             self.tree.column(c, width=120, anchor="center")
         self.tree.pack(fill="both", expand=True, padx=10, pady=(0,10))
+        self.tree_sync = TreeSync(self.tree)
 
         # — Tooltip setup & bindings (after tree exists) —
         self.tooltip = ToolTip(self)
@@ -76,23 +79,20 @@ class HistoryFrame(BaseFrame):
         self.tree.bind("<Leave>", self._on_leave)
 
     def load_history(self):
-        # Clear old rows
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
         if self.mode == "vehicle":
-            rows = self.db.get_history_by_vehicle(self.entity_id)
-            for oid, ts, km, issue, notes, status in rows:
-                date = ts.split(" ")[0]
-                self.tree.insert("", "end",
-                                 values=(oid, date, km, issue, status, notes))
+            rows = [
+                (oid, ts.split(" ")[0], km, issue, status, notes)
+                for oid, ts, km, issue, notes, status
+                in self.db.get_history_by_vehicle(self.entity_id)
+            ]
         else:
-            rows = self.db.get_history_by_customer(self.entity_id)
-            for oid, ts, make, model, year, km, issue, notes, status in rows:
-                date = ts.split(" ")[0]
-                vehicle = f"{make} {model} ({year})"
-                self.tree.insert("", "end",
-                                 values=(oid, date, vehicle, km, status, notes))
+            rows = [
+                (oid, ts.split(" ")[0], f"{make} {model} ({year})", km, status, notes)
+                for oid, ts, make, model, year, km, issue, notes, status
+                in self.db.get_history_by_customer(self.entity_id)
+            ]
+        # Only changed orders are touched, so scroll position and selection stay.
+        self.tree_sync.update(rows)
 
     def _on_motion(self, event):
         row = self.tree.identify_row(event.y)
@@ -124,7 +124,7 @@ class HistoryFrame(BaseFrame):
         self.tooltip.hide()
         self._last_cell = (None, None)
 
-    # Allows AppController.show_frame to auto-refresh this frame
+    # Refresh button, and change-bus updates (BaseFrame.apply_changes)
     def refresh_data(self):
         self.load_history()
 
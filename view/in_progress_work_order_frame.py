@@ -3,13 +3,17 @@ from tkinter import ttk, messagebox
 import tkinter as tk
 from tkcalendar import DateEntry
 from view.base_frame import BaseFrame
+from view.tree_sync import TreeSync
 from model.db_manager import DBManager
 
 class InProgressWorkOrderFrame(BaseFrame):
     def __init__(self, master, controller, work_order_id):
         self.db = DBManager()
         self.work_order_id = work_order_id
+        self._notes_loaded = ""  # notes as last loaded or saved; anything else in the box is unsaved
         super().__init__(master, controller)
+        # Shown/hidden by InProgressWorkspaceFrame as its tab comes and goes.
+        self.watch("work_orders", "work_order_parts", "mechanic_hours")
 
     def setup_ui(self):
         ttk.Button(self, text="← Back", command=self._go_back).pack(pady=5, anchor="w")
@@ -50,6 +54,7 @@ class InProgressWorkOrderFrame(BaseFrame):
             self.parts_tree.column(col, width=110)
         self.parts_tree.pack(pady=(5, 5), fill="both", expand=True)
         self.parts_tree.bind("<<TreeviewSelect>>", self._on_part_select)
+        self.parts_sync = TreeSync(self.parts_tree, values=self._part_values)
 
         hours_frame = ttk.LabelFrame(wrapper, text="Mechanic Hours")
         hours_frame.pack(side="left", expand=True, fill="both", padx=10, pady=5)
@@ -77,6 +82,7 @@ class InProgressWorkOrderFrame(BaseFrame):
             self.hours_tree.column(col, width=110)
         self.hours_tree.pack(pady=(5, 5), fill="both", expand=True)
         self.hours_tree.bind("<<TreeviewSelect>>", self._on_hour_select)
+        self.hours_sync = TreeSync(self.hours_tree)
 
         self.total_hours_var = tk.StringVar(value="Total Hours: 0.0")
         ttk.Label(hours_frame, textvariable=self.total_hours_var, font=("Segoe UI", 10, "italic")).pack(pady=(0, 5))
@@ -86,37 +92,59 @@ class InProgressWorkOrderFrame(BaseFrame):
         self.refresh_data()
 
     def refresh_data(self):
-        self.notes_text.delete("1.0", "end")
-        self.notes_text.insert("1.0", self.db.get_notes_for_work_order(self.work_order_id))
-
-        # Parts
-        self.parts_tree.delete(*self.parts_tree.get_children())
-        parts = self.db.get_parts_for_work_order(self.work_order_id)
-        for row in parts:
-            total = float(row[2]) * float(row[3])
-            self.parts_tree.insert("", "end", values=(row[0], row[1], row[2], f"${row[3]:.2f}", f"${total:.2f}"))
-        part_total = sum(float(row[4]) for row in parts)
-
-        # Hours
-        self.hours_tree.delete(*self.hours_tree.get_children())
+        self._refresh_notes()
+        self._refresh_parts()
+        self._refresh_hours()
+        self._update_subtotal()
+
+    def _refresh_notes(self):
+        notes = self.db.get_notes_for_work_order(self.work_order_id) or ""
+        current = self.notes_text.get("1.0", "end-1c")
+        # Leave unsaved edits alone (e.g. when switching back to this tab).
+        if current != notes and current == self._notes_loaded:
+            self.notes_text.delete("1.0", "end")
+            self.notes_text.insert("1.0", notes)
+        self._notes_loaded = notes
+
+    def apply_changes(self, changes):
+        """Re-read only the parts of this order that changed."""
+        tables = {
+            change.table for change in changes
+            if change.parent == self.work_order_id
+            or (change.table == "work_orders" and change.key == self.work_order_id)
+            or (change.key is None and change.parent is None)  # any row of the table
+        }
+        if "work_orders" in tables:
+            self._refresh_notes()
+        if "work_order_parts" in tables:
+            self._refresh_parts()
+        if "mechanic_hours" in tables:
+            self._refresh_hours()
+        if tables:
+            self._update_subtotal()
+
+    def has_unsaved_notes(self):
+        return self.notes_text.get("1.0", "end-1c") != self._notes_loaded
+
+    def _refresh_parts(self):
+        self.parts_sync.update(self.db.get_parts_for_work_order(self.work_order_id))
+
+    def _refresh_hours(self):
         hours = self.db.get_mechanic_hours(self.work_order_id)
-        total_hours = 0.0
-        for row in hours:
-            self.hours_tree.insert("", "end", values=row)
-            total_hours += float(row[2])
+        self.hours_sync.update(hours)
+        total_hours = sum(float(row[2]) for row in hours)
         self.total_hours_var.set(f"Total Hours: {total_hours:.2f}")
 
-        # Subtotal
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT rate FROM work_orders WHERE id = ?", (self.work_order_id,))
-        row = cursor.fetchone()
-        conn.close()
-        rate = float(row[0]) if row else 0.0
-        labor_total = total_hours * rate
-        subtotal = part_total + labor_total
+    def _update_subtotal(self):
+        totals = self.db.get_work_order_totals(self.work_order_id)
+        subtotal = totals[3] if totals else 0.0
         self.subtotal_var.set(f"Work Order Subtotal: ${subtotal:.2f}")
 
+    @staticmethod
+    def _part_values(row):
+        total = float(row[2]) * float(row[3])
+        return (row[0], row[1], row[2], f"${row[3]:.2f}", f"${total:.2f}")
+
     def _go_back(self):
         from view.in_progress_work_order_list_frame import InProgressOrdersListFrame
         self.controller.show_frame(InProgressOrdersListFrame)
@@ -125,6 +153,7 @@ class InProgressWorkOrderFrame(BaseFrame):
         try:
             notes = self.notes_text.get("1.0", "end").strip()
             self.db.update_work_order_notes(self.work_order_id, notes)
+            self._notes_loaded = self.notes_text.get("1.0", "end-1c")
             messagebox.showinfo("Success", "Notes updated.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -135,7 +164,6 @@ class InProgressWorkOrderFrame(BaseFrame):
             unit_price = float(self.part_price.get())
             total = qty * unit_price
             self.db.add_part_to_work_order(self.work_order_id, self.part_name.get(), qty, unit_price, total)
-            self.refresh_data()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -147,15 +175,7 @@ class InProgressWorkOrderFrame(BaseFrame):
             qty = int(self.part_qty.get())
             unit = float(self.part_price.get())
             cost = qty * unit
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE work_order_parts SET part_name = ?, quantity = ?, unit_price = ?, cost = ?
-                WHERE id = ?
-            """, (self.part_name.get(), qty, unit, cost, self.selected_part_id))
-            conn.commit()
-            conn.close()
-            self.refresh_data()
+            self.db.update_work_order_part(self.selected_part_id, self.part_name.get(), qty, unit, cost)
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -165,7 +185,6 @@ class InProgressWorkOrderFrame(BaseFrame):
             return
         try:
             self.db.delete_work_order_part(self.selected_part_id)
-            self.refresh_data()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -189,7 +208,6 @@ class InProgressWorkOrderFrame(BaseFrame):
                 float(self.mech_hours.get()),
                 self.mech_date.get_date().isoformat()
             )
-            self.refresh_data()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -198,20 +216,12 @@ class InProgressWorkOrderFrame(BaseFrame):
             messagebox.showinfo("Select", "Select a log to update.")
             return
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE mechanic_hours SET mechanic = ?, hours = ?, date = ?
-                WHERE id = ?
-            """, (
+            self.db.update_mechanic_hours_entry(
+                self.selected_hour_id,
                 self.mech_name.get(),
                 float(self.mech_hours.get()),
-                self.mech_date.get_date().isoformat(),
-                self.selected_hour_id
-            ))
-            conn.commit()
-            conn.close()
-            self.refresh_data()
+                self.mech_date.get_date().isoformat()
+            )
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -220,7 +230,6 @@ class InProgressWorkOrderFrame(BaseFrame):
             messagebox.showinfo("Select", "Select a log to delete.")
             return
         self.db.delete_mechanic_hours_entry(self.selected_hour_id)
-        self.refresh_data()
 
     def _on_hour_select(self, event):
         selected = self.hours_tree.focus()
@@ -235,20 +244,4 @@ class InProgressWorkOrderFrame(BaseFrame):
             self.mech_date.insert(0, values[3])
 
     def calculate_subtotal(self):
-        parts = self.db.get_parts_for_work_order(self.work_order_id)
-        part_total = sum(float(row[4]) for row in parts)
-
-        hours = self.db.get_mechanic_hours(self.work_order_id)
-        total_hours = sum(float(row[2]) for row in hours)
-
-        # Get hourly rate from work_order
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT rate FROM work_orders WHERE id = ?", (self.work_order_id,))
-        row = cursor.fetchone()
-        conn.close()
-        rate = float(row[0]) if row else 0.0
-
-        labor_total = total_hours * rate
-        subtotal = part_total + labor_total
-        self.subtotal_var.set(f"Work Order Subtotal: ${subtotal:.2f}")
+        self._update_subtotal()
@@ -0,0 +1,136 @@
+# view/in_progress_workspace_frame.py
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk, messagebox
+
+from view.base_frame import BaseFrame
+from model.db_manager import DBManager
+from view.in_progress_work_order_frame import InProgressWorkOrderFrame
+
+
+class InProgressWorkspaceFrame(BaseFrame):
+    """
+    In-progress orders open side by side as notebook tabs. A tab keeps its
+    widgets, selection and unsaved notes while another is in front. Each tab
+    watches the change bus for its own order, so switching back re-reads
+    only what was written since (nothing, usually). Opening more than
+    MAX_TABS closes the tab viewed longest ago (one without unsaved notes,
+    if there is one). While a tab has unsaved notes the controller's frame
+    cache does not evict the workspace.
+    """
+
+    MAX_TABS = 4
+
+    def __init__(self, master, controller):
+        self.db = DBManager()
+        self.tabs = OrderedDict()  # work_order_id -> InProgressWorkOrderFrame, least recently viewed first
+        self._shown_tab = None
+        super().__init__(master, controller)
+        self.watch("work_orders")
+
+    def setup_ui(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=5)
+        ttk.Button(bar, text="← In Progress Orders", command=self._go_back).pack(side="left", padx=5)
+        ttk.Button(bar, text="✖ Close Tab", command=self._close_current).pack(side="right", padx=5)
+
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(expand=True, fill="both", padx=5, pady=(0, 5))
+        self.notebook.bind("<<NotebookTabChanged>>", self._tab_changed)
+        self.notebook.bind("<Button-2>", self._middle_click)
+
+    def _go_back(self):
+        from view.in_progress_work_order_list_frame import InProgressOrdersListFrame
+        self.controller.show_frame(InProgressOrdersListFrame)
+
+    def open_order(self, work_order_id, title=None):
+        tab = self.tabs.get(work_order_id)
+        if tab is None:
+            while len(self.tabs) >= self.MAX_TABS:
+                self.close_order(self._oldest_closable())
+            tab = InProgressWorkOrderFrame(self.notebook, self.controller, work_order_id)
+            self.tabs[work_order_id] = tab
+            self.notebook.add(tab, text=title or f"WO #{work_order_id}")
+        self.notebook.select(tab)
+
+    def can_evict(self):
+        # Kept while any tab has notes the user has not saved.
+        return not any(tab.has_unsaved_notes() for tab in self.tabs.values())
+
+    def _oldest_closable(self):
+        for work_order_id, tab in self.tabs.items():
+            if not tab.has_unsaved_notes():
+                return work_order_id
+        return next(iter(self.tabs))
+
+    def close_order(self, work_order_id):
+        tab = self.tabs.pop(work_order_id, None)
+        if tab is not None:
+            if tab is self._shown_tab:
+                self._shown_tab = None
+            self.notebook.forget(tab)
+            tab.destroy()
+
+    def _close_current(self):
+        tab = self._current_tab()
+        if tab is None:
+            return
+        if tab.has_unsaved_notes() and not messagebox.askyesno(
+            "Unsaved Notes", "This order's notes have unsaved changes. Close the tab anyway?"
+        ):
+            return
+        self.close_order(tab.work_order_id)
+        if not self.tabs:
+            self._go_back()
+
+    def _middle_click(self, event):
+        try:
+            index = self.notebook.index(f"@{event.x},{event.y}")
+        except tk.TclError:
+            return
+        self.notebook.select(index)
+        self._close_current()
+
+    def on_show(self):
+        super().on_show()
+        self._show_tab(self._current_tab())
+
+    def on_hide(self):
+        super().on_hide()
+        self._show_tab(None)
+
+    def _show_tab(self, tab):
+        # Only the tab in front of a shown workspace counts as shown.
+        if tab is self._shown_tab:
+            return
+        if self._shown_tab is not None and self._shown_tab.winfo_exists():
+            self._shown_tab.on_hide()
+        self._shown_tab = tab
+        if tab is not None:
+            tab.on_show()
+
+    def _current_tab(self):
+        selected = self.notebook.select()
+        return self.nametowidget(selected) if selected else None
+
+    def _tab_changed(self, event=None):
+        tab = self._current_tab()
+        if tab is not None:
+            self.tabs.move_to_end(tab.work_order_id)
+        if self.shown:
+            self._show_tab(tab)
+
+    def apply_changes(self, changes):
+        # Orders completed, cancelled or deleted from another screen.
+        touched = {change.key for change in changes if change.key in self.tabs}
+        if any(change.key is None for change in changes):
+            touched = set(self.tabs)
+        gone = [
+            work_order_id for work_order_id in sorted(touched)
+            if self.db.get_work_order_status(work_order_id) != "In Progress"
+        ]
+        for work_order_id in gone:
+            self.close_order(work_order_id)
+        if gone:
+            orders = ", ".join(f"#{work_order_id}" for work_order_id in gone)
+            messagebox.showinfo("Closed", f"No longer in progress, tab closed: {orders}")
@@ -0,0 +1,124 @@
+# view/reports_frame.py
+from datetime import datetime
+from tkinter import ttk, messagebox
+
+from view.base_frame import BaseFrame
+from helpers.reports import PERIODS, get_report
+
+CUSTOM = "Custom"
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+class ReportsFrame(BaseFrame):
+    def __init__(self, master, controller):
+        super().__init__(master, controller)
+
+    def setup_ui(self):
+        from view.dashboard_frame import DashboardFrame
+
+        ttk.Button(self, text="← Back to Dashboard", command=lambda: self.controller.show_frame(DashboardFrame)).pack(pady=5, anchor="w")
+        ttk.Label(self, text="Reports", font=("Segoe UI", 16)).pack(pady=5)
+
+        controls = ttk.Frame(self)
+        controls.pack(pady=5)
+        self.period = ttk.Combobox(controls, values=list(PERIODS) + [CUSTOM], state="readonly", width=14)
+        self.period.set("This week")
+        self.period.grid(row=0, column=0, padx=5)
+        self.period.bind("<<ComboboxSelected>>", lambda e: self.refresh_data())
+        ttk.Label(controls, text="From").grid(row=0, column=1, padx=(10, 2))
+        self.from_entry = ttk.Entry(controls, width=12)
+        self.from_entry.grid(row=0, column=2)
+        ttk.Label(controls, text="To").grid(row=0, column=3, padx=(10, 2))
+        self.to_entry = ttk.Entry(controls, width=12)
+        self.to_entry.grid(row=0, column=4)
+        ttk.Button(controls, text="Show", command=self._show_custom).grid(row=0, column=5, padx=5)
+        ttk.Button(controls, text="↻ Refresh", command=lambda: self.refresh_data(refresh=True)).grid(row=0, column=6, padx=5)
+
+        self.summary_label = ttk.Label(self, text="", font=("Segoe UI", 11))
+        self.summary_label.pack(pady=5)
+        self.status_label = ttk.Label(self, text="", foreground="gray")
+        self.status_label.pack()
+
+        tables = ttk.Frame(self)
+        tables.pack(expand=True, fill="both", padx=10, pady=5)
+        tables.columnconfigure((0, 1), weight=1)
+        tables.rowconfigure((0, 1), weight=1)
+        self.revenue_tree = self._table(tables, "Revenue per Day", ("Day", "Orders", "Revenue", "Running Total"), 0, 0, rowspan=2)
+        self.mechanic_tree = self._table(tables, "Hours per Mechanic", ("Mechanic", "Hours", "Orders", "Share", "Utilization"), 0, 1)
+        self.parts_tree = self._table(tables, "Top Parts", ("#", "Part", "Qty", "Spend", "Orders"), 1, 1)
+
+    def _table(self, parent, title, columns, row, column, rowspan=1):
+        box = ttk.LabelFrame(parent, text=title)
+        box.grid(row=row, column=column, rowspan=rowspan, sticky="nsew", padx=5, pady=5)
+        tree = ttk.Treeview(box, columns=columns, show="headings", height=8)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=90, anchor="w" if col in ("Day", "Mechanic", "Part") else "e")
+        tree.pack(expand=True, fill="both")
+        return tree
+
+    def _range(self):
+        period = self.period.get()
+        if period != CUSTOM:
+            first, last = PERIODS[period]()
+            for entry, day in ((self.from_entry, first), (self.to_entry, last)):
+                entry.delete(0, "end")
+                entry.insert(0, day.isoformat())
+            return first, last
+        first = datetime.strptime(self.from_entry.get().strip(), "%Y-%m-%d").date()
+        last = datetime.strptime(self.to_entry.get().strip(), "%Y-%m-%d").date()
+        if last < first:
+            raise ValueError("To must not be before From.")
+        return first, last
+
+    def _show_custom(self):
+        self.period.set(CUSTOM)
+        self.refresh_data()
+
+    def refresh_data(self, refresh=False):
+        try:
+            first, last = self._range()
+        except ValueError:
+            messagebox.showerror("Invalid Dates", "Enter From and To as dates like 2024-01-31.")
+            return
+        self.status_label.config(text="⏳ Loading…")
+        self.controller.executor.submit(
+            get_report, first, last, refresh,
+            on_done=self._show_report,
+            on_error=self._report_failed,
+            key="reports.build",
+        )
+
+    def _report_failed(self, e):
+        self.status_label.config(text="")
+        messagebox.showerror("Report Error", str(e))
+
+    def _show_report(self, report):
+        s = report["summary"]
+        self.status_label.config(text=f"{report['first']:%b %d, %Y} – {report['last']:%b %d, %Y}")
+        self.summary_label.config(text=(
+            f"Orders: {s['orders']:,}    Revenue: {_money(s['revenue'])}    "
+            f"Average ticket: {_money(s['average_ticket'])}    Largest: {_money(s['largest_ticket'])}    "
+            f"Parts: {_money(s['parts'])}    Labor: {_money(s['labor'])} ({s['hours_billed']:,.1f} h)"
+        ))
+
+        self._fill(self.revenue_tree, (
+            (day, orders, _money(revenue), _money(running))
+            for day, orders, revenue, running in report["revenue_by_day"]
+        ))
+        self._fill(self.mechanic_tree, (
+            (name, f"{hours:,.1f}", orders, "" if share is None else f"{share:.0%}", "" if util is None else f"{util:.0%}")
+            for name, hours, orders, share, util in report["mechanics"]
+        ))
+        self._fill(self.parts_tree, (
+            (rank, part, qty, _money(spend), orders)
+            for rank, part, qty, spend, orders in report["top_parts"]
+        ))
+
+    def _fill(self, tree, rows):
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert("", "end", values=row)
@@ -0,0 +1,54 @@
+# view/tree_sync.py
+
+
+class TreeSync:
+    """
+    Keeps a flat ttk.Treeview in step with a list of rows by primary key.
+
+    update(rows) diffs against what it last showed and issues only the
+    insert / item / move / delete calls needed, so selection, focus and the
+    scroll position of untouched rows survive a refresh. Items get
+    iid=str(key(row)); don't insert into the tree behind its back.
+    """
+
+    def __init__(self, tree, key=None, values=None):
+        self.tree = tree
+        self.key = key or (lambda row: row[0])
+        self.values = values or (lambda row: tuple(row))
+        self._order = []   # iids in display order, mirrors the tree
+        self._shown = {}   # iid -> values last written
+
+    def update(self, rows):
+        tree = self.tree
+        top = tree.yview()[0]
+        new_ids = [str(self.key(row)) for row in rows]
+        wanted = set(new_ids)
+
+        stale = [iid for iid in self._order if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                del self._shown[iid]
+            self._order = [iid for iid in self._order if iid in wanted]
+
+        for index, (iid, row) in enumerate(zip(new_ids, rows)):
+            values = tuple(self.values(row))
+            if iid not in self._shown:
+                tree.insert("", index, iid=iid, values=values)
+                self._order.insert(index, iid)
+            else:
+                if self._shown[iid] != values:
+                    tree.item(iid, values=values)
+                if self._order[index] != iid:
+                    tree.move(iid, "", index)
+                    self._order.remove(iid)
+                    self._order.insert(index, iid)
+            self._shown[iid] = values
+
+        if tree.yview()[0] != top:
+            tree.yview_moveto(top)
+
+    def clear(self):
+        if self._order:
+            self.tree.delete(*self._order)
+        self._order, self._shown = [], {}
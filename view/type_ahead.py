@@ -0,0 +1,127 @@
+# view/type_ahead.py
+import re
+import tkinter as tk
+import unicodedata
+
+
+def _tokens(text):
+    # Close to FTS5's unicode61 tokenizer: case- and accent-folded runs of
+    # letters and digits.
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"[^\W_]+", text)
+
+
+def _terms(query):
+    """Each typed word as a phrase of tokens, like DBManager's fts_query."""
+    return [tokens for tokens in map(_tokens, query.split()) if tokens]
+
+
+def matches(terms, tokens):
+    """True if every term matches `tokens` the way `"term"*` does in FTS5."""
+    for phrase in terms:
+        *exact, prefix = phrase
+        n = len(exact)
+        if not any(
+            tokens[i:i + n] == exact and tokens[i + n].startswith(prefix)
+            for i in range(len(tokens) - n)
+        ):
+            return False
+    return True
+
+
+def narrows(old_terms, new_terms):
+    """True if every row matching new_terms also matches old_terms."""
+    return all(
+        any(
+            len(new) >= len(old) and new[:len(old) - 1] == old[:-1] and new[len(old) - 1].startswith(old[-1])
+            for new in new_terms
+        )
+        for old in old_terms
+    )
+
+
+class TypeAhead:
+    """
+    Search-as-you-type for a filter Entry.
+
+    Each edit restarts a short timer; when typing pauses, search(text) runs on
+    the executor and its pages are streamed to show(rows) as they arrive. An
+    edit cancels the query in flight. If the new text only narrows the last
+    complete result set (more letters, more words), those rows are filtered
+    locally with text_of(row) instead of querying again. Empty text calls
+    clear().
+    """
+
+    DELAY_MS = 250
+
+    def __init__(self, entry, executor, search, show, clear, text_of, limit, key, delay_ms=DELAY_MS):
+        self.entry = entry
+        self.executor = executor
+        self.search = search
+        self.show = show
+        self.clear = clear
+        self.text_of = text_of
+        self.limit = limit
+        self.key = key
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._cache = None  # (terms, rows) of the last search that was not cut off at limit
+        self._shown_text = None
+
+        self.var = tk.StringVar(value=entry.get())
+        entry.configure(textvariable=self.var)
+        self.var.trace_add("write", lambda *_: self._schedule())
+
+    def search_now(self):
+        """Run the current text immediately (Apply button / Return key)."""
+        self._cancel_timer()
+        self._run(force=True)
+
+    def reset(self):
+        """Forget cached results, e.g. after the underlying data changed."""
+        self._cache = None
+        self._shown_text = None
+
+    def _schedule(self):
+        self._cancel_timer()
+        self._after_id = self.entry.after(self.delay_ms, self._run)
+
+    def _cancel_timer(self):
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self, force=False):
+        self._after_id = None
+        text = self.var.get().strip()
+        if text == self._shown_text and not force:
+            return  # e.g. a trailing space
+        self._shown_text = text
+        terms = _terms(text)
+        if not terms:
+            self.executor.cancel(self.key)
+            self.clear()
+            return
+
+        if self._cache and not force and narrows(self._cache[0], terms):
+            self.executor.cancel(self.key)
+            rows = [row for row in self._cache[1] if matches(terms, _tokens(self.text_of(row)))]
+            self._cache = (terms, rows)
+            self.show(rows)
+            return
+
+        rows = []
+        self._cache = None
+
+        def _page(page):
+            rows.extend(page)
+            self.show(list(rows))
+
+        def _done(_):
+            if not rows:
+                self.show([])
+            if len(rows) < self.limit:
+                self._cache = (terms, rows)
+
+        self.executor.submit_iter(self.search, text, on_item=_page, on_done=_done, key=self.key)
@@ -1,13 +1,18 @@
 # view/vehicle_frame.py
 from view.base_frame import BaseFrame
 from tkinter import ttk, messagebox
-from model.db_manager import DBManager
-import requests
+from model.db_manager import DBManager, SEARCH_LIMIT
+from helpers import vin_offline
+from helpers.vin_decoder import normalize_vin
+from view.virtual_tree import VirtualTreeview, KeysetRowProvider, ListRowProvider
+from view.type_ahead import TypeAhead
 
 class VehicleFrame(BaseFrame):
     def __init__(self, master, controller):
         self.db = DBManager()
+        self._decoding = None
         super().__init__(master, controller)
+        self.watch("vehicles", "customers")
 
     def _go_back(self):
         from view.dashboard_frame import DashboardFrame
@@ -24,12 +29,27 @@ class VehicleFrame(BaseFrame):
         self.search_var.pack(side="left", padx=2)
         ttk.Button(filter_bar, text="Apply", command=self._filter_vehicles).pack(side="left", padx=2)
         ttk.Button(filter_bar, text="Clear", command=self._clear_filter).pack(side="left", padx=2)
-        self.tree = ttk.Treeview(self, columns=("Owner", "Make", "Model", "Year", "VIN", "Odometer (KM)"), show="headings")
+        self.type_ahead = TypeAhead(
+            self.search_var, self.controller.executor, self.db.iter_search_vehicles,
+            show=self._show_matches, clear=self._show_all_vehicles,
+            text_of=lambda v: " ".join(str(field) for field in v[1:6]),
+            limit=SEARCH_LIMIT, key="vehicles.search",
+        )
+        self.search_var.bind("<Return>", lambda e: self._filter_vehicles())
+        # Rows are (id, owner, make, model, year, vin, km); the id is not shown.
+        self.all_vehicles = KeysetRowProvider(
+            self.db.get_vehicles_page, self.db.count_vehicles, page_key=lambda v: (v[4], v[0]),
+            key_at=self.db.get_vehicle_key_at,
+        )
+        self.vlist = VirtualTreeview(
+            self, columns=("Owner", "Make", "Model", "Year", "VIN", "Odometer (KM)"),
+            provider=self.all_vehicles, values=lambda v: v[1:], on_select=self._on_select,
+        )
+        self.tree = self.vlist.tree
         for col in self.tree["columns"]:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
-        self.tree.pack(pady=5, expand=True, fill="both")
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.vlist.pack(pady=5, expand=True, fill="both")
         form = ttk.Frame(self)
         form.pack(pady=5)
         self.customer_var = ttk.Combobox(form, state="readonly")
@@ -68,10 +88,25 @@ class VehicleFrame(BaseFrame):
 
     def refresh_data(self):
         self._load_customers()
-        self.tree.delete(*self.tree.get_children())
-        for v in DBManager().get_all_vehicles():
-            self.tree.insert("", "end", iid=v[0], values=v[1:])
-            self._clear_form()
+        self.vlist.clear_selection()
+        self._show_all_vehicles()
+        self._clear_form()
+
+    def apply_changes(self, changes):
+        # Keeps the selection, a half-typed form and an active search.
+        if any(change.table == "customers" for change in changes):
+            self._load_customers()
+        if self.vlist.provider is self.all_vehicles:
+            self.vlist.refresh()
+        else:
+            self.type_ahead.search_now()
+
+    def _show_all_vehicles(self):
+        self.type_ahead.reset()
+        if self.vlist.provider is self.all_vehicles:
+            self.vlist.refresh()
+        else:
+            self.vlist.set_provider(self.all_vehicles)
 
     def _load_customers(self):
         self.customer_id_map = {}
@@ -92,13 +127,9 @@ class VehicleFrame(BaseFrame):
         return self.customer_id_map.get(self.customer_var.get(), None)
 
 
-    def _on_select(self, event):
-        selected = self.tree.focus()
-        if not selected:
-            return
-
-        self.selected_vehicle_id = int(selected)  # The hidden iid (vehicle ID)
-        data = self.tree.item(selected, "values")
+    def _on_select(self, row):
+        self.selected_vehicle_id = int(row[0])  # The hidden vehicle ID
+        data = ["" if value is None else value for value in row[1:]]
 
         # Treeview columns: Owner, Make, Model, Year, VIN, KM
         self.customer_var.set(data[0])  # Owner
@@ -147,18 +178,17 @@ class VehicleFrame(BaseFrame):
 
                 
             )
-            self.refresh_data()
             self._clear_form()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def _update_vehicle(self):
-        selected = self.tree.focus()
+        selected = self.vlist.selected_row()
         if not selected:
             messagebox.showerror("Error", "Select a vehicle to update first.")
             return
 
-        vehicle_id = int(selected)
+        vehicle_id = int(selected[0])
 
         customer_id = self._get_selected_customer_id()
         if customer_id is None:
@@ -175,77 +205,63 @@ class VehicleFrame(BaseFrame):
                 self.vin_entry.get(),
                 int("".join(filter(str.isdigit, self.odometer_entry.get())) or 0)
             )
-            self.refresh_data()
             self._clear_form()
         except Exception as e:
             messagebox.showerror("Update Failed", str(e))
 
 
-        try:
-            DBManager().update_vehicle(
-                vehicle_id,
-                customer_id,
-                self.make_entry.get(),
-                self.model_entry.get(),
-                self.year_entry.get(),
-                self.vin_entry.get(),
-                int("".join(filter(str.isdigit, self.odometer_entry.get())) or 0),
-            )
-            self.refresh_data()
-            self._clear_form()
-
-        except Exception as e:
-            messagebox.showerror("Update Failed", str(e))
-
 
     def _delete_vehicle(self):
-        selected = self.tree.focus()
+        selected = self.vlist.selected_row()
         if not selected:
             return
-        vehicle_id = int(selected)  # ✅ use the Treeview row ID
+        vehicle_id = int(selected[0])  # ✅ use the hidden vehicle ID
         DBManager().delete_vehicle(vehicle_id)
         self.refresh_data()
         self._clear_form()
 
     def _filter_vehicles(self):
-        keyword = self.search_var.get().lower()
-        self.tree.delete(*self.tree.get_children())
-        for v in DBManager().get_all_vehicles():
-            if any(keyword in str(field).lower() for field in v):
-                self.tree.insert("", "end", values=v)
+        self.type_ahead.search_now()
+
+    def _show_matches(self, vehicles):
+        self.vlist.set_provider(ListRowProvider(vehicles))
 
     def _clear_filter(self):
         self.search_var.delete(0, "end")
-        self.refresh_data()
+        self.type_ahead.search_now()
 
     def _decode_vin(self):
-        vin = self.vin_entry.get().strip()
+        vin = normalize_vin(self.vin_entry.get())
         if not vin or len(vin) < 11:
             messagebox.showerror("Invalid VIN", "Please enter a valid VIN (at least 11 characters).")
             return
-
-        # ✅ Try cache first
-        cached = self.db.get_cached_vin(vin)
-        if cached:
-            make, model, year = cached
-        else:
-            # 🚗 Fetch from API
-            try:
-                url = f"https://vpic.nhtsa.dot.gov/api/vehicles/decodevinvalues/{vin}?format=json"
-                response = requests.get(url, timeout=5)
-                response.raise_for_status()
-                results = response.json()["Results"][0]
-
-                make = results.get("Make", "").strip()
-                model = results.get("Model", "").strip()
-                year = results.get("ModelYear", "").strip()
-
-                if any([make, model, year]):
-                    self.db.cache_vin(vin, make, model, year)
-            except Exception as e:
-                self.vin_status.config(text="❌ Error", foreground="red")
-                messagebox.showerror("Decode Error", f"Could not decode VIN: {e}")
-                return
+        # Check digits are mandatory on North American VINs (WMI 1-5).
+        if vin[0] in "12345" and vin_offline.is_well_formed(vin) and not vin_offline.check_digit_ok(vin):
+            messagebox.showwarning("Check VIN", "The VIN's check digit (9th character) doesn't match; it may be mistyped.")
+
+        self.vin_status.config(text="⏳ Decoding...", foreground="gray")
+        # Decoded on a worker; only the last VIN asked for is shown.
+        self._decoding = vin
+        self.controller.vin_decoder.request(
+            [vin],
+            on_done=lambda results: self._vin_decoded(vin, results),
+            on_error=lambda e: self._vin_failed(vin, e),
+        )
+
+    def _vin_decoded(self, vin, results):
+        if vin == self._decoding:
+            self._show_decoded_vin(results.get(vin, ("", "", "", False)))
+
+    def _vin_failed(self, vin, e):
+        if vin == self._decoding:
+            self._show_vin_error(e)
+
+    def _show_vin_error(self, e):
+        self.vin_status.config(text="❌ Error", foreground="red")
+        messagebox.showerror("Decode Error", f"Could not decode VIN: {e}")
+
+    def _show_decoded_vin(self, result):
+        make, model, year, cached = result
 
         # Fill UI
         def _set_field(entry, value):
@@ -268,10 +284,10 @@ class VehicleFrame(BaseFrame):
 
 
     def open_history(self):
-        selected = self.tree.selection()
+        selected = self.vlist.selected_row()
         if not selected:
             messagebox.showwarning("Select Vehicle", "Please select a vehicle first.")
             return
-        vid = self.tree.item(selected[0])["values"][0]
+        vid = selected[0]
         from view.history_frame import HistoryFrame
         self.controller.show_frame(HistoryFrame, mode="vehicle", entity_id=vid)
\ No newline at end of file
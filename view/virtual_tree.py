@@ -0,0 +1,294 @@
+# view/virtual_tree.py
+from collections import OrderedDict
+from tkinter import ttk
+
+from model.db_manager import PAGE_SIZE
+
+
+class ListRowProvider:
+    """Row provider over an in-memory list (small or already-filtered sets)."""
+
+    def __init__(self, rows, key=None):
+        self._rows = list(rows)
+        self.key = key or (lambda row: row[0])
+
+    def count(self):
+        return len(self._rows)
+
+    def rows(self, start, stop):
+        return self._rows[start:stop]
+
+    def invalidate(self):
+        pass
+
+
+class KeysetRowProvider:
+    """
+    Row provider over a keyset-paged DBManager query.
+
+    get_page(after, limit) returns one page; page_key(row) gives the `after`
+    value for the page that follows `row`. Only the boundary keys of pages
+    seen so far and the last `max_pages` pages are kept in memory. key_at,
+    if given, returns page_key of the row at an offset (None past the end),
+    so a far jump seeks its page directly instead of reading every page on
+    the way.
+    """
+
+    def __init__(self, get_page, count, page_key=None, key=None, page_size=PAGE_SIZE, max_pages=8, key_at=None):
+        self.get_page = get_page
+        self._count_fn = count
+        self.page_key = page_key or (lambda row: row[0])
+        self.key = key or (lambda row: row[0])
+        self.key_at = key_at
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._after = {0: None}  # page number -> keyset value that starts it
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Forget the count and cached rows. Boundary keys are kept, so a list
+        scrolled deep re-reads only the pages on screen; _page() corrects
+        any it finds out of date.
+        """
+        self._count = None
+        self._pages = OrderedDict()
+
+    def count(self):
+        if self._count is None:
+            self._count = self._count_fn()
+        return self._count
+
+    def rows(self, start, stop):
+        stop = min(stop, self.count())
+        if start >= stop:
+            return []
+        first, last = start // self.page_size, (stop - 1) // self.page_size
+        rows = []
+        for n in range(first, last + 1):
+            page = self._page(n)
+            if page is None:
+                break
+            rows.extend(page)
+        offset = start - first * self.page_size
+        return rows[offset:offset + (stop - start)]
+
+    def _page(self, n):
+        if n in self._pages:
+            self._pages.move_to_end(n)
+            return self._pages[n]
+        if n not in self._after and not self._seek(n):
+            return None
+        page = self.get_page(self._after[n], self.page_size)
+        if len(page) < self.page_size:
+            # The table shrank since count() was taken; trust the data.
+            self._count = n * self.page_size + len(page)
+            self._forget_after(n)
+        else:
+            next_key = self.page_key(page[-1])
+            if self._after.get(n + 1, next_key) != next_key:
+                # Rows were added or removed within this page since the
+                # boundaries further on were learnt.
+                self._forget_after(n)
+            self._after[n + 1] = next_key
+        if not page:
+            return None
+        self._pages[n] = page
+        if len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    def _seek(self, n):
+        """Learn the boundary key of page n. False if it is past the end."""
+        known = max(k for k in self._after if k < n)
+        if self.key_at is not None and n - known > 1:
+            key = self.key_at(n * self.page_size - 1)
+            if key is None:
+                return False
+            self._after[n] = key
+            return True
+        # Close by: read forward from the nearest known boundary.
+        for m in range(known, n):
+            if self._page(m) is None or m + 1 not in self._after:
+                return False
+        return True
+
+    def _forget_after(self, n):
+        """Drop the boundaries and cached pages beyond page n."""
+        for k in [k for k in self._after if k > n]:
+            del self._after[k]
+        for k in [k for k in self._pages if k > n]:
+            del self._pages[k]
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    A Treeview that only ever holds the rows currently on screen.
+
+    Rows come from a provider (count() / rows(start, stop) / key(row)). A fixed
+    set of item slots is reused as the user scrolls, so a redraw costs the same
+    for 50 rows or 500k. Use selected_row() rather than tree.focus(): slots are
+    recycled, so an item id does not identify a row.
+    """
+
+    ROW_HEIGHT = 20  # until the first row has been drawn and can be measured
+
+    def __init__(self, master, columns, provider=None, values=None, on_select=None, **tree_kw):
+        super().__init__(master)
+        self.values = values or (lambda row: row)
+        self.provider = provider or ListRowProvider([])
+        self._on_select = on_select
+        self._top = 0
+        self._visible = tree_kw.get("height", 10)
+        self._slots = []
+        self._slot_rows = []
+        self._slot_values = []  # values last written to each slot
+        self._selected_key = None
+        self._selected_row = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", **tree_kw)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible))
+
+    # —— public API ——
+    def set_provider(self, provider):
+        """Show a new data set, scrolled to the top."""
+        self.provider = provider
+        self._top = 0
+        self._render()
+
+    def refresh(self):
+        """Re-read the current provider, keeping scroll position and selection."""
+        self.provider.invalidate()
+        self._render()
+
+    def selected_row(self):
+        return self._selected_row
+
+    def clear_selection(self):
+        self._selected_key = self._selected_row = None
+        self.tree.selection_remove(self.tree.selection())
+
+    # —— rendering ——
+    def _render(self):
+        total = self.provider.count()
+        self._top = max(0, min(self._top, total - self._visible))
+        rows = self.provider.rows(self._top, self._top + self._visible)
+        self._ensure_slots(len(rows))
+
+        selected_slot = None
+        for i, (slot, row) in enumerate(zip(self._slots, rows)):
+            values = tuple(self.values(row))
+            if self._slot_values[i] != values:
+                self.tree.item(slot, values=values)
+                self._slot_values[i] = values
+            if self._selected_key is not None and self.provider.key(row) == self._selected_key:
+                selected_slot = slot
+                self._selected_row = row
+        self._slot_rows = rows
+
+        if selected_slot:
+            if self.tree.selection() != (selected_slot,):
+                self.tree.selection_set(selected_slot)
+            self.tree.focus(selected_slot)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self._top / total, (self._top + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _ensure_slots(self, needed):
+        while len(self._slots) < needed:
+            self._slots.append(self.tree.insert("", "end"))
+            self._slot_values.append(None)
+        for i, slot in enumerate(self._slots):
+            if i < needed:
+                self.tree.move(slot, "", i)  # reattaches a detached slot
+            else:
+                self.tree.detach(slot)
+
+    def _measure_visible(self):
+        height = self.tree.winfo_height()
+        bbox = self.tree.bbox(self._slots[0]) if self._slots and self._slot_rows else ""
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        else:
+            header, row_height = self.ROW_HEIGHT, self.ROW_HEIGHT
+        return max(1, (height - header) // max(1, row_height))
+
+    # —— events ——
+    def _on_configure(self, event):
+        visible = self._measure_visible()
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        total = self.provider.count()
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self._top += int(args[1]) * step
+        self._render()
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas.
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self._scroll_by(-3 * notches)
+
+    def _scroll_by(self, rows):
+        self._top += rows
+        self._render()
+        return "break"
+
+    def _move_selection(self, delta):
+        total = self.provider.count()
+        if not total:
+            return "break"
+        current = self._selected_index()
+        index = max(0, min(total - 1, (self._top if current is None else current) + delta))
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._visible:
+            self._top = index - self._visible + 1
+        row = self.provider.rows(index, index + 1)
+        if row:
+            self._select(row[0])
+        self._render()
+        return "break"
+
+    def _selected_index(self):
+        for i, row in enumerate(self._slot_rows):
+            if self.provider.key(row) == self._selected_key:
+                return self._top + i
+        return None
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._slots:
+            return  # cleared because the row scrolled away; keep it selected
+        index = self._slots.index(selection[0])
+        if index < len(self._slot_rows):
+            self._select(self._slot_rows[index])
+
+    def _select(self, row):
+        key = self.provider.key(row)
+        changed = key != self._selected_key
+        self._selected_key, self._selected_row = key, row
+        # Re-selecting a row while scrolling is not a new user selection.
+        if changed and self._on_select:
+            self._on_select(row)
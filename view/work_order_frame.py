@@ -1,12 +1,15 @@
 # view/work_order_frame.py (final patch: restored missing mechanic hour methods)
 from tkinter import ttk, messagebox
 from view.base_frame import BaseFrame
-from model.db_manager import DBManager
+from model.db_manager import DBManager, SEARCH_LIMIT, WORK_ORDER_ROW_TABLES
+from view.virtual_tree import VirtualTreeview, KeysetRowProvider, ListRowProvider
+from view.type_ahead import TypeAhead
 
 class WorkOrderFrame(BaseFrame):
     def __init__(self, master, controller):
         self.db = DBManager()
         super().__init__(master, controller)
+        self.watch(*WORK_ORDER_ROW_TABLES)
 
     def setup_ui(self):
         # Top bar with navigation and actions
@@ -18,12 +21,19 @@ class WorkOrderFrame(BaseFrame):
 
         ttk.Label(self, text="Work Orders", font=("Segoe UI", 16)).pack(pady=5)
 
-        # Table display only
-        self.tree = ttk.Treeview(self, columns=("ID", "Vehicle", "Issue", "Notes", "Status"), show="headings")
+        # Table display only (rows are materialized only while on screen)
+        self.vlist = VirtualTreeview(
+            self, columns=("ID", "Vehicle", "Issue", "Notes", "Status", "Total"),
+            values=lambda order: order[:5] + (f"${order[6]:.2f}",),
+        )
+        self.tree = self.vlist.tree
         for col in self.tree["columns"]:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.vlist.pack(fill="both", expand=True, padx=10, pady=10)
+        self.all_orders = KeysetRowProvider(
+            self.db.get_work_orders_page, self.db.count_work_orders, key_at=self.db.get_work_order_key_at
+        )
 
         # Filter bar
         filter_frame = ttk.Frame(self)
@@ -33,6 +43,13 @@ class WorkOrderFrame(BaseFrame):
         self.filter_entry.pack(side="left")
         ttk.Button(filter_frame, text="Apply", command=self._apply_filter).pack(side="left", padx=5)
         ttk.Button(filter_frame, text="Clear", command=self._clear_filter).pack(side="left", padx=5)
+        # Filters as you type; search rows end with their indexed text.
+        self.type_ahead = TypeAhead(
+            self.filter_entry, self.controller.executor, self.db.iter_search_work_orders,
+            show=self._show_matches, clear=self.refresh_tree, text_of=lambda order: order[-1],
+            limit=SEARCH_LIMIT, key="work_orders.search",
+        )
+        self.filter_entry.bind("<Return>", lambda e: self._apply_filter())
 
         self.refresh_tree()
 
@@ -41,37 +58,41 @@ class WorkOrderFrame(BaseFrame):
         self.controller.show_frame(DashboardFrame)
 
     def _apply_filter(self):
-        keyword = self.filter_entry.get().strip().lower()
-        all_orders = self.db.get_all_work_orders()
-        filtered = [order for order in all_orders if keyword in order[1].lower()]
-        self._load_tree(filtered)
+        self.type_ahead.search_now()
+
+    def _show_matches(self, orders):
+        self.vlist.set_provider(ListRowProvider(orders))
 
     def _clear_filter(self):
         self.filter_entry.delete(0, "end")
-        self.refresh_tree()
+        self.type_ahead.search_now()
 
     def refresh_tree(self):
-        orders = self.db.get_all_work_orders()
-        self._load_tree(orders)
-
-    def _load_tree(self, orders):
-        self.tree.delete(*self.tree.get_children())
-        for order in orders:
-            self.tree.insert("", "end", values=order)
+        self.type_ahead.reset()
+        if self.vlist.provider is self.all_orders:
+            self.vlist.refresh()
+        else:
+            self.vlist.set_provider(self.all_orders)
+
+    def apply_changes(self, changes):
+        # Re-read the rows on screen; an active search is re-run, not dropped.
+        if self.vlist.provider is self.all_orders:
+            self.vlist.refresh()
+        else:
+            self.type_ahead.search_now()
 
     def _open_work_order_popup(self):
         from view.work_order_popup import open_work_order_popup
-        open_work_order_popup(self, self.db, self.refresh_tree)
+        open_work_order_popup(self, self.db)
 
     def _convert_to_in_progress(self):
-        selected = self.tree.focus()
-        if not selected:
+        values = self.vlist.selected_row()
+        if not values:
             messagebox.showinfo("Select Work Order", "Please select a work order to convert.")
             return
 
-        values = self.tree.item(selected, "values")
         work_order_id = int(values[0])
-        current_status = values[4].strip()
+        current_status = (values[4] or "").strip()
 
         if current_status == "In Progress":
             messagebox.showinfo("Already In Progress", "This work order is already in progress.")
@@ -79,7 +100,6 @@ class WorkOrderFrame(BaseFrame):
 
         self.db.update_work_order_status(work_order_id, "In Progress")
         messagebox.showinfo("Status Updated", "Work order marked as In Progress.")
-        self.refresh_tree()
 
     # -- Parts (already restored above) --
 
@@ -101,19 +121,12 @@ class WorkOrderFrame(BaseFrame):
             messagebox.showinfo("Select", "Select a log to update.")
             return
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE mechanic_hours SET mechanic = ?, hours = ?, date = ?
-                WHERE id = ?
-            """, (
+            self.db.update_mechanic_hours_entry(
+                self.selected_hour_id,
                 self.mech_name.get(),
                 float(self.mech_hours.get()),
-                self.mech_date.get(),
-                self.selected_hour_id
-            ))
-            conn.commit()
-            conn.close()
+                self.mech_date.get()
+            )
             self.refresh_data()
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 
-def open_work_order_popup(parent_frame, db, refresh_callback):
+def open_work_order_popup(parent_frame, db, refresh_callback=None):
     popup = tk.Toplevel()
     popup.title("Create Work Order")
     popup.geometry("1200x700")
@@ -94,13 +94,10 @@ def open_work_order_popup(parent_frame, db, refresh_callback):
         status = status_var.get()
         hourly_rate = 65.0
 
-        db.add_work_order(vehicle_id, issue_text, notes, status, hourly_rate)
-
-        conn = db.get_connection()
-        work_order_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-        conn.close()
+        work_order_id = db.add_work_order(vehicle_id, issue_text, notes, status, hourly_rate)
 
         popup.destroy()
-        refresh_callback()
+        if refresh_callback:
+            refresh_callback()
 
     tk.Button(popup, text="Submit", command=submit).grid(row=6, column=0, columnspan=4, padx=5, pady=10, sticky="ew")